@@ -28,3 +28,40 @@ CREATE TABLE IF NOT EXISTS events (
     timestamp TIMESTAMP DEFAULT NOW()
 );
 
+
+-- Contract browser: facet counts group by these columns, and the deployer address
+-- search is a substring match served by a trigram index
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS contracts_network_idx ON contracts (network);
+CREATE INDEX IF NOT EXISTS contracts_contract_name_idx ON contracts (contract_name);
+CREATE INDEX IF NOT EXISTS contracts_deployer_name_idx ON contracts (deployer_name);
+CREATE INDEX IF NOT EXISTS contracts_deployer_address_trgm_idx
+    ON contracts USING gin (deployer_address gin_trgm_ops);
+
+-- Notify the backend's contract caches of every change, with the row id.
+-- This file only runs on a fresh volume; it is idempotent, so apply it again to
+-- existing databases (see docs/python_backend.md, Contract Metadata Cache)
+CREATE OR REPLACE FUNCTION notify_contracts_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM pg_notify('contracts_changed', json_build_object('op', TG_OP)::text);
+        RETURN NULL;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('contracts_changed', json_build_object('op', TG_OP, 'id', OLD.id)::text);
+        RETURN OLD;
+    END IF;
+    PERFORM pg_notify('contracts_changed', json_build_object('op', TG_OP, 'id', NEW.id)::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS contracts_changed ON contracts;
+CREATE TRIGGER contracts_changed
+    AFTER INSERT OR UPDATE OR DELETE ON contracts
+    FOR EACH ROW EXECUTE FUNCTION notify_contracts_changed();
+
+DROP TRIGGER IF EXISTS contracts_truncated ON contracts;
+CREATE TRIGGER contracts_truncated
+    AFTER TRUNCATE ON contracts
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_contracts_changed();
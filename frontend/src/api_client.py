@@ -0,0 +1,219 @@
+"""
+Client for the FastAPI backend, shared by every page of the Streamlit UI.
+
+  • One pooled requests.Session per process, so connections are reused across reruns
+  • Idempotent GETs are retried with backoff on connection errors and 502/503/504
+  • Every call has a timeout
+  • Reference data (networks, users, explorer URLs, compiled contracts) is cached with
+    st.cache_data, and revalidated with If-None-Match once the cache expires
+  • fetch_parallel runs independent calls at the same time
+
+Errors are raised as ApiError, with the backend's `detail` message when there is one.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from urllib3.util.retry import Retry
+
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8040")
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 30)
+# Compiling, deploying and sending transactions wait for solc or the node
+LONG_TIMEOUT = (3.05, 120)
+
+REFERENCE_TTL = 300     # networks, users and explorer URLs only change on backend restart
+CONTRACTS_TTL = 15      # compiled and deployed contracts change on compile/deploy
+
+# Responses kept for revalidation: url -> (etag, body), least recently used first
+_ETAGS = OrderedDict()
+_ETAGS_MAX = 256        # filtered searches and pages each have their own URL
+_ETAGS_LOCK = threading.Lock()
+
+
+class ApiError(Exception):
+    """Raised when the backend cannot be reached or returns an error."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@st.cache_resource
+def get_session():
+    """Return the process-wide session, with a connection pool and retries."""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),   # never resend a transaction
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _check(response):
+    """Return the response body as JSON, or raise ApiError."""
+    if response.ok:
+        return response.json()
+    try:
+        detail = response.json().get("detail", response.text)
+    except ValueError:
+        detail = response.text
+    raise ApiError(str(detail), response.status_code)
+
+
+def request(method, path, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """Send a request to the backend and return the JSON body."""
+    try:
+        response = get_session().request(method, f"{BACKEND_URL}{path}", timeout=timeout,
+                                         **kwargs)
+    except requests.RequestException as e:
+        raise ApiError(f"Backend unreachable: {e}") from e
+    return _check(response)
+
+
+def get(path, params=None, timeout=DEFAULT_TIMEOUT):
+    """GET a path, reusing the last body when the backend answers 304 Not Modified."""
+    url = requests.Request("GET", f"{BACKEND_URL}{path}", params=params).prepare().url
+    with _ETAGS_LOCK:
+        cached = _ETAGS.get(url)
+        if cached:
+            _ETAGS.move_to_end(url)
+
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    try:
+        response = get_session().get(url, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        raise ApiError(f"Backend unreachable: {e}") from e
+
+    if response.status_code == 304 and cached:
+        return cached[1]
+    body = _check(response)
+    etag = response.headers.get("ETag")
+    if etag:
+        with _ETAGS_LOCK:
+            _ETAGS[url] = (etag, body)
+            _ETAGS.move_to_end(url)
+            while len(_ETAGS) > _ETAGS_MAX:
+                _ETAGS.popitem(last=False)
+    return body
+
+
+def post(path, timeout=LONG_TIMEOUT, **kwargs):
+    """POST to a path and return the JSON body."""
+    return request("POST", path, timeout=timeout, **kwargs)
+
+
+def put(path, timeout=LONG_TIMEOUT, **kwargs):
+    """PUT to a path and return the JSON body."""
+    return request("PUT", path, timeout=timeout, **kwargs)
+
+
+def fetch_parallel(calls):
+    """
+    Run independent calls at the same time.
+
+    Takes a dict of name -> zero-argument callable and returns a dict of
+    name -> result, where a failed call's result is its ApiError.
+    """
+    ctx = get_script_run_ctx()
+    results = {}
+    with ThreadPoolExecutor(
+            max_workers=len(calls) or 1,
+            # Lets cached functions and st.* calls know which session they run for
+            initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)) as pool:
+        futures = {name: pool.submit(call) for name, call in calls.items()}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except ApiError as e:
+                results[name] = e
+    return results
+
+
+# -------------------------------------------------------------------------------
+# Reference data, cached across reruns and sessions
+
+@st.cache_data(ttl=REFERENCE_TTL, show_spinner=False)
+def get_networks():
+    """Return the names of the configured networks."""
+    return get("/networks").get("networks", [])
+
+
+@st.cache_data(ttl=REFERENCE_TTL, show_spinner=False)
+def get_users():
+    """Return the names of the configured user accounts."""
+    return get("/users").get("users", [])
+
+
+@st.cache_data(ttl=REFERENCE_TTL, show_spinner=False)
+def get_explorer_url(network):
+    """Return the block explorer URL of a network."""
+    return get("/explorer", params={"network": network}).get("explorer_url")
+
+
+@st.cache_data(ttl=CONTRACTS_TTL, show_spinner=False)
+def get_compiled_contracts():
+    """Return the names of the compiled contracts."""
+    return [contract["name"] for contract in get("/contracts/compiled_contracts")]
+
+
+@st.cache_data(ttl=CONTRACTS_TTL, show_spinner=False)
+def get_deployed_contracts():
+    """Return the metadata of every deployed contract."""
+    return get("/contracts/metadata").get("contracts", [])
+
+
+@st.cache_data(ttl=CONTRACTS_TTL, show_spinner=False)
+def get_contract_facets(filters):
+    """Return the networks, contract names and deployers matching the filters, counted."""
+    return get("/contracts/facets", params=_filter_params(filters))
+
+
+@st.cache_data(ttl=CONTRACTS_TTL, show_spinner=False)
+def search_contracts(filters, limit=100, offset=0):
+    """Return a page of the deployed contracts matching the filters."""
+    params = {**_filter_params(filters), "limit": limit, "offset": offset}
+    return get("/contracts/metadata", params=params).get("contracts", [])
+
+
+def _filter_params(filters):
+    """Drop the filters that are not set."""
+    return {name: value for name, value in filters.items() if value}
+
+
+def clear_contract_caches():
+    """Forget cached contract lists after a compile or deploy."""
+    get_compiled_contracts.clear()
+    get_deployed_contracts.clear()
+    get_contract_facets.clear()
+    search_contracts.clear()
+
+
+# -------------------------------------------------------------------------------
+# Live contract state, fetched on every rerun
+
+def get_inbox_message(network, contract_address, contract_name):
+    """Return the message stored in an Inbox contract."""
+    params = {"network": network, "contract_address": contract_address,
+              "contract_name": contract_name}
+    return request("GET", "/inbox/message", params=params).get("message", "N/A")
+
+
+def get_inbox_counter(network, contract_address, contract_name):
+    """Return how many times an Inbox contract's message was updated."""
+    params = {"network": network, "contract_address": contract_address,
+              "contract_name": contract_name}
+    return request("GET", "/inbox/counter", params=params).get("count", 0)
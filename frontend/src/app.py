@@ -6,14 +6,15 @@ Provides pages to:
   • Deploy compiled contracts
   • View and interact with deployed contracts
 
-Talks to the FastAPI backend via BACKEND_URL.
+Talks to the FastAPI backend via BACKEND_URL, through api_client.py.
 Uses helpers in utils.py for table processing and contract display.
 """
 
-import os
 import streamlit as st
-import requests
-from utils import process_dataframe, filter_contracts, display_contract
+import api_client
+from api_client import ApiError
+from utils import process_dataframe, filter_contracts, display_contract, \
+    display_contracts_table
 
 
 st.set_page_config(page_title="Smart Contract Manager", layout="wide")
@@ -22,9 +23,6 @@ st.sidebar.title("Navigation")
 page = st.sidebar.radio("Go to", ["Compile", "Deploy", "Interact"])
 # st.sidebar.page_link("pages/inbox_interaction.py", label="Inbox Contract Interaction")
 
-# Get the backend URL from the environment variable
-backend_url = os.getenv("BACKEND_URL", "http://localhost:8040")
-
 # Initialise session states
 if 'selected_contract' not in st.session_state:
     st.session_state.selected_contract = None
@@ -45,101 +43,96 @@ if page == "Compile":
             with st.spinner("Compiling....", show_time=True):
 
                 files = {"file": (uploaded_file.name, uploaded_file, "text/plain")}
-                response = requests.post(f"{backend_url}/contracts/compile", files=files, timeout=100)
-
-                if response.status_code == 200:
-                    # Parse the response JSON
-                    result = response.json()
+                try:
+                    result = api_client.post("/contracts/compile", files=files)
+                except ApiError as e:
+                    st.error(f"Compilation failed: {e}")
+                else:
                     success = result.get("success", False)
                     message = result.get("message", "No message provided")
                     filename = result.get("filename", "N/A")
 
                     if success:
+                        api_client.clear_contract_caches()
                         st.success(f"Compilation Successful! {message}")
                         st.write(f"Compiled File: `{filename}`")
                     else:
                         st.error(f"Compilation failed: {message}")
-                else:
-                    st.error(f"Compilation failed: {response.text}")
 
 
 elif page == "Deploy":
     st.header("Deploy Smart Contract")
 
-    response = requests.get(f"{backend_url}/networks", timeout=100)
-    if response.status_code == 200:
-        networks = response.json().get("networks")
-        selected_network = st.selectbox("Select network to deploy to", networks)
-
-        # Get the list of compiled contracts
-        response = requests.get(f"{backend_url}/contracts/compiled_contracts", timeout=100)
-        if response.status_code == 200:
-            compiled_contracts = response.json()
-            contract_names = [contract['name'] for contract in compiled_contracts]
-            selected_contract = st.selectbox("Select Contract to Deploy", contract_names)
+    # Independent reference data, fetched together (and cached between reruns)
+    results = api_client.fetch_parallel({
+        "networks": api_client.get_networks,
+        "compiled": api_client.get_compiled_contracts,
+        "users": api_client.get_users,
+    })
 
-            # Need to handle contracts with constructor arguments
-            constructor_args = st.text_input("Constructor Arguments (comma-separated)").split(',')
+    if isinstance(results["networks"], ApiError):
+        st.error("Failed to get available networks")
+    elif isinstance(results["compiled"], ApiError):
+        st.error("Failed to fetch compiled contracts.")
+    else:
+        selected_network = st.selectbox("Select network to deploy to", results["networks"])
+        selected_contract = st.selectbox("Select Contract to Deploy", results["compiled"])
 
-            response = requests.get(f"{backend_url}/users", timeout=100)
-            if response.status_code == 200:
-                users = response.json().get("users")
-                user = st.selectbox("Select user account to deploy as", users)
+        # Need to handle contracts with constructor arguments
+        constructor_args = st.text_input("Constructor Arguments (comma-separated)").split(',')
 
+        users = results["users"] if not isinstance(results["users"], ApiError) else []
+        user = st.selectbox("Select user account to deploy as", users)
 
-            if st.button("Deploy"):
-                with st.spinner("Deploying..."):
-                    response = requests.post(
-                        f"{backend_url}/contracts/deploy",
+        if st.button("Deploy"):
+            with st.spinner("Deploying..."):
+                try:
+                    result = api_client.post(
+                        "/contracts/deploy",
                         json={"network_name": selected_network,
                               "contract_name": selected_contract,
                               "user": user,
                               "constructor_args": constructor_args},
-                              timeout=100
-                              )
-                    # st.write(response.json())
-
-                    if response.status_code == 200:
-                        st.success("Deployment Successful!")
-                        st.json(response.json())
-                    else:
-                        st.error(f"Deployment failed: {response.text}")
-        else:
-            st.error("Failed to fetch compiled contracts.")
-    else:
-        st.error("Failed to get available networks")
+                    )
+                except ApiError as e:
+                    st.error(f"Deployment failed: {e}")
+                else:
+                    api_client.clear_contract_caches()
+                    st.success("Deployment Successful!")
+                    st.json(result)
 
 
 
 elif page == "Interact":
     st.header("Interact with Smart Contract")
 
-
-    response = requests.get(f"{backend_url}/contracts/metadata", timeout=100)
-    if response.status_code == 200:
-
-        contracts = response.json().get("contracts", [])
-
+    try:
+        contracts = api_client.get_deployed_contracts()
+    except ApiError as e:
+        st.error(f"Error: {e}")
+    else:
         # Tabs for viewing full data and filtering
         full_tab, filter_tab = st.tabs(["Full Table", "Filter"])
 
         # FULL TABLE: Show all contracts
         with full_tab:
-            df = process_dataframe(contracts)
-            st.markdown(df.to_markdown(index=False), unsafe_allow_html=True)
+            display_contracts_table(process_dataframe(contracts))
 
         # FILTER TAB: Allow filtering
         with filter_tab:
-            filtered_contracts = filter_contracts(contracts)
-
-            st.write(f"**Filtered Results: {len(filtered_contracts)} contracts found**")
+            try:
+                filtered_contracts, total = filter_contracts()
+            except ApiError as e:
+                st.error(f"Error: {e}")
+                filtered_contracts, total = [], 0
+
+            st.write(f"**Filtered Results: {total} contracts found**")
+            if total > len(filtered_contracts):
+                st.caption(f"Showing the first {len(filtered_contracts)}; "
+                           "narrow the filters to see the others.")
             for contract in filtered_contracts:
                 display_contract(contract)
 
         # if st.button("switch page"):
 
         #     st.switch_page("pages/inbox_interaction.py")
-
-    else:
-        error_message = response.json().get("detail", "Failed to fetch deployed contracts")
-        st.error(f"Error: {error_message}")
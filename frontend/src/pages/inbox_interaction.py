@@ -1,10 +1,8 @@
-import os
-import requests
 import streamlit as st
+import api_client
+from api_client import ApiError
 from utils import make_tx_hash_clickable
 
-# Get the backend URL from the environment variable
-backend_url = os.getenv("BACKEND_URL", "http://localhost:8040")
 st.title("Inbox Smart Contract Interaction")
 
 
@@ -17,8 +15,6 @@ if 'selected_contract' not in st.session_state:
 message = "N/A"
 counter = 0
 
-import streamlit as st
-
 
 # -------------------------------------------------------------------------------
 # Source Information
@@ -29,27 +25,24 @@ if st.session_state.selected_contract is not None:
     contract_name = st.session_state.selected_contract.get('contract_name')
     deployer_name = st.session_state.selected_contract.get("deployer_name")
 
-    # Fetch stored message
-    response = requests.get(f"{backend_url}/inbox/message", \
-                            params={"network": network, \
-                                    "contract_address": contract_address, \
-                                    "contract_name": contract_name})
-
-    if response.status_code == 200:
-        message = response.json().get("message", "N/A")
+    # Fetch the stored message, the counter value and the users at the same time
+    results = api_client.fetch_parallel({
+        "message": lambda: api_client.get_inbox_message(network, contract_address,
+                                                        contract_name),
+        "counter": lambda: api_client.get_inbox_counter(network, contract_address,
+                                                        contract_name),
+        "users": api_client.get_users,
+    })
+
+    if isinstance(results["message"], ApiError):
+        st.error(f"Get message failed: {results['message']}")
     else:
-        st.error(f"Get message failed: {response.text}")
+        message = results["message"]
 
-    # Fetch counter value
-    response = requests.get(f"{backend_url}/inbox/counter", \
-                            params={"network": network, \
-                                    "contract_address": contract_address, \
-                                    "contract_name": contract_name})
-
-    if response.status_code == 200:
-        counter = response.json().get("count", 0)
+    if isinstance(results["counter"], ApiError):
+        st.error(f"Get counter failed: {results['counter']}")
     else:
-        st.error(f"Get counter failed: {response.text}")
+        counter = results["counter"]
 
 
     # -------------------------------------------------------------------------------
@@ -84,31 +77,30 @@ if st.session_state.selected_contract is not None:
             st.subheader("Update message")
             new_message = st.text_input("Enter a new message:")
 
-            response = requests.get(f"{backend_url}/users")
-            if response.status_code != 200:
+            if isinstance(results["users"], ApiError):
                 st.error("Unable to load users from backend. Cannot send transactions.")
                 st.stop()
 
-            users = response.json().get("users", [])
+            users = results["users"]
             user = st.selectbox("Select user account", users)
 
             message_submit = st.form_submit_button('Update Message')
             if message_submit:
                 if new_message:
-                    response = requests.put(f"{backend_url}/inbox/update", \
-                                json={"message": new_message, \
-                                    "network": network, \
-                                    "contract_name": contract_name, \
-                                    "contract_address": contract_address, \
-                                    "user": user}, timeout=120)
-
-                    st.write("status:", response.status_code)
-                    st.write("response:", response.json())
+                    try:
+                        result = api_client.put("/inbox/update",
+                                                json={"message": new_message,
+                                                      "network": network,
+                                                      "contract_name": contract_name,
+                                                      "contract_address": contract_address,
+                                                      "user": user})
+                    except ApiError as e:
+                        st.error(f"Update failed: {e}")
+                    else:
+                        st.write("response:", result)
 
-                    if response.status_code == 200:
                         # expect: {"success": True, "tx_hash": tx_hash}
-                        tx_hash = response.json().get("tx_hash", "N/A")
-                        print(f"transaction hash = {tx_hash}")
+                        tx_hash = result.get("tx_hash", "N/A")
                         st.success("Message updated successfully!")
 
                         data = {}
@@ -116,21 +108,15 @@ if st.session_state.selected_contract is not None:
                         data["deployment_tx_hash"] = tx_hash
 
                         # Fetch the explorer URL for the network
-                        explorer_response = requests.get(f"{backend_url}/explorer", params={"network": network})
-
-                        if explorer_response.status_code == 200:
-                            explorer_url = explorer_response.json().get("explorer_url", None)
-                            data["explorer_url"] = explorer_url
-                        else:
-                            st.error(f"Failed to fetch explorer URL: {explorer_response.text}")
+                        try:
+                            data["explorer_url"] = api_client.get_explorer_url(network)
+                        except ApiError as e:
+                            st.error(f"Failed to fetch explorer URL: {e}")
                             data["explorer_url"] = None
 
                         # Display the clickable transaction hash
                         st.write(f"**View transaction on {network}:** {make_tx_hash_clickable(data)}")
 
-                    else:
-                        st.error(f"Update failed: {response.text}")
-
     # -------------------------------------------------------------------------------
     # Math function interaction
 
@@ -142,20 +128,19 @@ if st.session_state.selected_contract is not None:
 
             submit = st.form_submit_button('Calculate')
             if submit:
-                response = requests.post(f"{backend_url}/inbox/maths", \
-                                json={"a": a, "b": b, \
-                                    "network": network, \
-                                    "contract_name": contract_name,
-                                    "contract_address": contract_address})
-
-                if response.status_code == 200:
-                    result = response.json()
+                try:
+                    result = api_client.post("/inbox/maths",
+                                             json={"a": a, "b": b,
+                                                   "network": network,
+                                                   "contract_name": contract_name,
+                                                   "contract_address": contract_address},
+                                             timeout=api_client.DEFAULT_TIMEOUT)
                     sum_ = result.get("sum")
                     diff = result.get("diff")
                     product = result.get("product")
                     is_zero = result.get("is_zero")
-                else:
-                    st.error(f"Math operation failed: {response.text}")
+                except ApiError as e:
+                    st.error(f"Math operation failed: {e}")
                     sum_, diff, product, is_zero = None, None, None, None
 
                 # Display results
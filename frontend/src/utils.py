@@ -1,6 +1,39 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
 from datetime import datetime
+import api_client
+
+# Column names shown in the contracts table
+COLUMN_NAMES = {
+    "id": "ID",
+    "contract_name": "Contract Name",
+    "contract_address": "Contract Address",
+    "deployer_name": "Deployer",
+    "deployer_address": "Deployer Address",
+    "network": "Network",
+    "deployment_tx_hash": "Tx Hash",
+    "deployment_timestamp": "Deployed At",
+}
+
+# Explorer without per-address pages; its links point at the explorer itself
+ADDRESSLESS_EXPLORER_NETWORK = "wildjos_vtn"
+
+# Link columns display the hex value at the end of the URL (after /address/, /tx/ or #)
+HEX_SUFFIX = r"(0x[0-9a-fA-F]+)$"
+
+PAGE_SIZES = [50, 100, 500, 1000]
+
+# Contracts listed at most in the Filter tab
+FILTER_PAGE_SIZE = 100
+
+# Session state keys of the Filter tab widgets, by filter
+FILTER_KEYS = {
+    "network": "filter_network",
+    "contract_name": "filter_contract_name",
+    "deployer_name": "filter_deployer_name",
+    "deployer_address": "filter_deployer_address",
+}
 
 # Helper function to shorten addresses and hashes
 def shorten(value, length=15):
@@ -13,38 +46,37 @@ def make_clickable_link(base_url, path, value):
 
 
 def make_contract_address_clickable(data):
-    """Creates a clickable link for contract addresses, supporting both dict and DataFrame row inputs."""
-    network = data["Network"].lower() if isinstance(data, pd.Series) else data.get("network", "").lower()
-    contract_address = data["Contract Address"] if isinstance(data, pd.Series) else data.get("contract_address", "")
-    explorer_url = data["Explorer URL"] if isinstance(data, pd.Series) else data.get("explorer_url", "")
+    """Creates a clickable link for a contract's address."""
+    network = data.get("network", "").lower()
+    contract_address = data.get("contract_address", "")
+    explorer_url = data.get("explorer_url", "")
 
     if not contract_address or not explorer_url:
         return contract_address  # Return as-is if missing data
 
-    if network == "wildjos_vtn":
+    if network == ADDRESSLESS_EXPLORER_NETWORK:
         return f"[{shorten(contract_address)}]({explorer_url})"
     return f"[{shorten(contract_address)}]({explorer_url}/address/{contract_address})"
 
 
 def make_deployer_address_clickable(data):
-    """Creates a clickable link for deployer addresses, supporting both dict and DataFrame row inputs."""
-    network = data["Network"].lower() if isinstance(data, pd.Series) else data.get("network", "").lower()
-    deployer_address = data["Deployer Address"] if isinstance(data, pd.Series) else data.get("deployer_address", "")
-    explorer_url = data["Explorer URL"] if isinstance(data, pd.Series) else data.get("explorer_url", "")
+    """Creates a clickable link for a contract's deployer address."""
+    network = data.get("network", "").lower()
+    deployer_address = data.get("deployer_address", "")
+    explorer_url = data.get("explorer_url", "")
 
     if not deployer_address or not explorer_url:
         return deployer_address
 
-    if network == "wildjos_vtn":
+    if network == ADDRESSLESS_EXPLORER_NETWORK:
         return f"[{shorten(deployer_address)}]({explorer_url})"
     return f"[{shorten(deployer_address)}]({explorer_url}/address/{deployer_address})"
 
 
 def make_tx_hash_clickable(data):
-    """Creates a clickable link for transaction hashes, supporting both dict and DataFrame row inputs."""
-    network = data["Network"].lower() if isinstance(data, pd.Series) else data.get("network", "").lower()
-    tx_hash = data["Tx Hash"] if isinstance(data, pd.Series) else data.get("deployment_tx_hash", "")
-    explorer_url = data["Explorer URL"] if isinstance(data, pd.Series) else data.get("explorer_url", "")
+    """Creates a clickable link for a transaction hash."""
+    tx_hash = data.get("deployment_tx_hash", "")
+    explorer_url = data.get("explorer_url", "")
 
     if not tx_hash or not explorer_url:
         return tx_hash
@@ -55,45 +87,47 @@ def make_tx_hash_clickable(data):
     return f"[{shorten(tx_hash)}]({explorer_url}/tx/{tx_hash})"
 
 
-def format_timestamp(row):
-    """Formats deployment timestamp safely."""
-    deployment_timestamp = row.get("Deployed At", "")
+def facet_selectbox(label, facet, key):
+    """
+    Selectbox over a facet's values, labelled with their counts.
 
-    if not deployment_timestamp:
-        return "Unknown"  # Return a placeholder if missing
+    The current selection stays an option (with a count of 0) when the other filters
+    leave it no contracts, since Streamlit rejects a value missing from the options.
+    """
+    counts = {item["value"]: item["count"] for item in facet}
+    selected = st.session_state.get(key)
+    if selected not in (None, "All") and selected not in counts:
+        counts[selected] = 0
+    st.selectbox(label, ["All"] + list(counts), key=key,
+                 format_func=lambda v: v if v == "All" else f"{v} ({counts.get(v, 0)})")
 
-    try:
-        return datetime.fromisoformat(deployment_timestamp).strftime("%Y-%m-%d %H:%M:%S")
-    except ValueError:
-        return "Invalid Date"  # Handle incorrect formats gracefully
 
+def filter_contracts(page_size=FILTER_PAGE_SIZE):
+    """
+    Applies user-selected filters for network, deployer, and contract name.
 
-def filter_contracts(contracts):
-    """Applies user-selected filters for network, deployer, and contract name."""
-    network_list = list(set(c["network"] for c in contracts))
-    selected_network = st.selectbox("Filter by Network:", ["All"] + network_list)
+    The choices and their counts come from the backend's /contracts/facets, and the
+    matching contracts from a filtered /contracts/metadata query, so nothing is
+    filtered client-side.
 
-    if selected_network != "All":
-        contracts = [c for c in contracts if c["network"] == selected_network]
+    Returns the first `page_size` matching contracts and the total number matching.
+    """
+    # Widget values are already updated when the rerun they trigger starts
+    filters = {name: st.session_state.get(key) for name, key in FILTER_KEYS.items()}
+    filters = {name: None if value in ("All", "") else value
+               for name, value in filters.items()}
 
-    # Filter by contract name
-    contract_name_list = list(set(c["contract_name"] for c in contracts))
-    selected_contract_name = st.selectbox("Filter by Contract Name:", ["All"] + contract_name_list)
-    if selected_contract_name != "All":
-        contracts = [c for c in contracts if c["contract_name"] == selected_contract_name]
-
-    # Filter by deployer
-    deployer_list = list(set(c["deployer_name"] for c in contracts))
-    selected_deployer = st.selectbox("Filter by Deployer:", ["All"] + deployer_list)
-    if selected_deployer != "All":
-        contracts = [c for c in contracts if c["deployer_name"] == selected_deployer]
+    facets = api_client.get_contract_facets(filters)
+    facet_selectbox("Filter by Network:", facets["network"], FILTER_KEYS["network"])
+    facet_selectbox("Filter by Contract Name:", facets["contract_name"],
+                    FILTER_KEYS["contract_name"])
+    facet_selectbox("Filter by Deployer:", facets["deployer_name"],
+                    FILTER_KEYS["deployer_name"])
 
     # Search query for deployer address
-    search_query = st.text_input("Search by Deployer Address:")
-    if search_query:
-        contracts = [c for c in contracts if search_query.lower() in c["deployer_address"].lower()]
+    st.text_input("Search by Deployer Address:", key=FILTER_KEYS["deployer_address"])
 
-    return contracts
+    return api_client.search_contracts(filters, limit=page_size), facets["total"]
 
 def display_contract(contract):
     """Displays contract information in a collapsible Streamlit expander."""
@@ -111,29 +145,72 @@ def display_contract(contract):
             st.switch_page("pages/inbox_interaction.py")
 
 
+def explorer_links(df, column, path, addressless=False):
+    """
+    Builds explorer URLs for a whole column at once.
+
+    Values without an explorer URL are kept as they are. With `addressless`, networks
+    whose explorer has no per-address pages link to the explorer itself, with the value
+    as a fragment so the link column can still display it.
+    """
+    values = df[column].fillna("").astype(str)
+    explorer = df["explorer_url"].fillna("").astype(str)
+    links = explorer + f"/{path}/" + values
+
+    if addressless:
+        network = df["network"].fillna("").astype(str).str.lower()
+        links = pd.Series(np.where(network == ADDRESSLESS_EXPLORER_NETWORK,
+                                   explorer + "#" + values, links), index=df.index)
+
+    return values.where((values == "") | (explorer == ""), links)
+
+
 def process_dataframe(contracts):
-    """Converts contract data into a formatted DataFrame with clickable links."""
+    """Converts contract data into a DataFrame with explorer URLs, using column operations."""
     df = pd.DataFrame(contracts)
-    
-    df.rename(columns={
-        "id": "ID",
-        "contract_name": "Contract Name",
-        "contract_address": "Contract Address",
-        "deployer_name": "Deployer",
-        "deployer_address": "Deployer Address",
-        "network": "Network",
-        "deployment_tx_hash": "Tx Hash",
-        "deployment_timestamp": "Deployed At",
-        "explorer_url": "Explorer URL"
-    }, inplace=True)
 
     if not df.empty:
-        df["Contract Address"] = df.apply(make_contract_address_clickable, axis=1)
-        df["Deployer Address"] = df.apply(make_deployer_address_clickable, axis=1)
-        df["Tx Hash"] = df.apply(make_tx_hash_clickable, axis=1)
-        df["Deployed At"] = df.apply(format_timestamp, axis=1)
-        
+        if "explorer_url" not in df:
+            df["explorer_url"] = None
+
+        # Hashes without the 0x prefix get it in their links
+        tx_hash = df["deployment_tx_hash"].fillna("").astype(str)
+        has_link = (tx_hash != "") & df["explorer_url"].notna() & (df["explorer_url"] != "")
+        df["deployment_tx_hash"] = tx_hash.where(
+            ~has_link | tx_hash.str.startswith("0x"), "0x" + tx_hash)
+
+        df["deployment_tx_hash"] = explorer_links(df, "deployment_tx_hash", "tx")
+        df["contract_address"] = explorer_links(df, "contract_address", "address",
+                                                addressless=True)
+        df["deployer_address"] = explorer_links(df, "deployer_address", "address",
+                                                addressless=True)
+        df["deployment_timestamp"] = pd.to_datetime(df["deployment_timestamp"],
+                                                    errors="coerce", format="ISO8601")
+
         # Drop 'Explorer URL' column after use
-        df.drop(columns=["Explorer URL"], inplace=True, errors="ignore")
+        df.drop(columns=["explorer_url"], inplace=True)
 
+    df.rename(columns=COLUMN_NAMES, inplace=True)
     return df
+
+
+def display_contracts_table(df):
+    """Shows the contracts table one page at a time, with clickable explorer links."""
+    page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+    pages = max(1, -(-len(df) // page_size))
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+
+    start = (page - 1) * page_size
+    st.dataframe(
+        df.iloc[start:start + page_size],
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Contract Address": st.column_config.LinkColumn(display_text=HEX_SUFFIX),
+            "Deployer Address": st.column_config.LinkColumn(display_text=HEX_SUFFIX),
+            "Tx Hash": st.column_config.LinkColumn(display_text=HEX_SUFFIX),
+            "Deployed At": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm:ss"),
+        },
+    )
+    st.caption(f"Rows {min(start + 1, len(df))}-{min(start + page_size, len(df))} "
+               f"of {len(df)}")
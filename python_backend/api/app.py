@@ -1,23 +1,122 @@
 """
 FastAPI application setup for the WildWeb3 backend.
-Registers routes, loads configuration, and performs startup checks.
+Registers routes, loads configuration, and warms up shared state.
+
+Heavy dependencies (web3, eth_account, solcx, psycopg2) are imported lazily, so
+creating the app is fast. The warm-up that loads them, derives the keyring and indexes
+the compiled artifacts runs in a background thread once the server has started;
+`/health/ready` reports 503 until it has finished and the database is reachable.
 """
 
-from fastapi import FastAPI, HTTPException
-from services.contract_store import check_tables
+import os
+import threading
+import time
+
+from fastapi import FastAPI, HTTPException, Request
+from services.account_keyring import init_keyring
+from services.abi_codec import get_abi_index
+from services.contract_cache import start_contract_cache, stop_contract_cache
+from core.constants import ensure_storage_dirs
+from core.lazy_import import load
+from core.ws_subscriber import start_block_subscribers, stop_block_subscribers
+from core.config import load_config
 from core.logger_config import LOGGER
+from core.tracing import KIND_SERVER, SpanContext, configure_tracing, get_tracer, start_span
 
+from api.http_cache import config_response, config_version
+from api.serialization import FastJSONResponse, add_compression
 from api.routes_compile import router as compile_router
 from api.routes_deploy import router as deploy_router
 from api.routes_metadata import router as metadata_router
 from api.routes_inbox import router as inbox_router
+from api.routes_contracts import router as contracts_router
+from api.routes_admin import profile_requests, router as admin_router
+from api.routes_health import router as health_router
+from api.routes_metrics import record_request_metrics, route_template, \
+    router as metrics_router
+
+# Names the configuration file for app factories started in fresh worker processes
+CONFIG_ENV_VAR = "WILDWEB3_CONFIG"
+
+# Packages imported by the warm-up so the first requests do not pay for them
+WARM_UP_MODULES = ("web3", "eth_account")
+
+
+def warm_up(app: FastAPI) -> None:
+    """
+    Build the shared state that is too slow for import time.
+
+    Creates the storage directories, derives all configured accounts, indexes the
+    compiled artifacts and loads the lazily imported packages. Sets
+    `app.state.warmed_up` when done, even after a failure, which is logged. A configured
+    address that does not match its private key is kept in `app.state.keyring_error`,
+    which keeps `/health/ready` failing.
+
+    Args:
+        app (FastAPI): The app to warm up.
+    """
+    start = time.perf_counter()
+    try:
+        ensure_storage_dirs()
 
+        # Derive all configured accounts once, shared by every service
+        try:
+            app.state.keyring = init_keyring(app.state.config)
+        except ValueError as e:
+            app.state.keyring_error = str(e)
+            raise
 
-def create_app(config: dict) -> FastAPI:
-    """Create and configure the FastAPI application."""
+        try:
+            get_abi_index().refresh()
+        except OSError as e:
+            LOGGER.warning("Could not index compiled artifacts: %s", e)
+
+        for name in WARM_UP_MODULES:
+            load(name)
+    except Exception as e: # pylint: disable=broad-exception-caught
+        LOGGER.error("Warm-up failed: %s", e, exc_info=True)
+    finally:
+        app.state.warmed_up.set()
+        LOGGER.info("Warm-up finished in %.2fs", time.perf_counter() - start)
+
+
+async def trace_requests(request: Request, call_next):
+    """
+    HTTP middleware running every request in a server span.
+
+    A W3C `traceparent` request header continues the caller's trace, and the response
+    carries the `traceparent` of the request's span.
+    """
+    parent = SpanContext.from_traceparent(request.headers.get("traceparent"))
+    attributes = {"http.method": request.method, "http.target": request.url.path}
+    with start_span(f"{request.method} {request.url.path}", KIND_SERVER, attributes,
+                    parent=parent) as span:
+        response = await call_next(request)
+        if span.is_recording:
+            span.name = f"{request.method} {route_template(request)}"
+            span.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.status = "error"
+            response.headers["traceparent"] = span.context.to_traceparent()
+        return response
+
+
+def create_app(config: dict, preload: bool = False) -> FastAPI:
+    """
+    Create and configure the FastAPI application.
+
+    Args:
+        config (dict): The configuration dictionary.
+        preload (bool): Warm up now rather than in the background after startup, so
+            that workers forked from this process inherit the shared state.
+
+    Returns:
+        FastAPI: The application.
+    """
     app = FastAPI(
         title="WildWeb3",
         description="Web3 Playground",
+        default_response_class=FastJSONResponse,
         openapi_tags=[
             {
                 "name": "WildWeb3 REST API",
@@ -28,20 +127,48 @@ def create_app(config: dict) -> FastAPI:
 
     @app.on_event("startup")
     async def on_startup():
-        if not check_tables():
-            raise HTTPException(
-                status_code=500,
-                detail="Table 'contracts' does not exist in the database",
-            )
+        # The database and nodes are checked by /health/ready instead of blocking here
+        if not app.state.warmed_up.is_set():
+            threading.Thread(target=warm_up, args=(app,), name="warm-up", daemon=True).start()
+        # Stream new blocks for networks with a WebSocket endpoint
+        start_block_subscribers(config)
+        # Each worker follows the contracts table for /contracts/metadata
+        start_contract_cache(config)
+
+    @app.on_event("shutdown")
+    async def on_shutdown():
+        stop_block_subscribers()
+        stop_contract_cache()
+        get_tracer().shutdown()
 
     # Store config in app state
     app.state.config = config
+    app.state.config_version = config_version(config)
+    app.state.config_loaded_at = time.time()
+    configure_tracing(config)
+    app.state.keyring = None
+    app.state.keyring_error = None
+    app.state.warmed_up = threading.Event()
+
+    if preload:
+        warm_up(app)
+        # Workers must not start signing with a key that does not match its address
+        if app.state.keyring_error:
+            raise RuntimeError(app.state.keyring_error)
 
     # Register routes
     app.include_router(compile_router, prefix="/contracts", tags=["Compile"])
     app.include_router(deploy_router, prefix="/contracts", tags=["Deploy"])
     app.include_router(metadata_router, prefix="/contracts", tags=["Metadata"])
     app.include_router(inbox_router, prefix="/inbox", tags=["Inbox"])
+    app.include_router(contracts_router, prefix="/contracts", tags=["Contracts"])
+    app.include_router(health_router, prefix="/health", tags=["Health"])
+    app.include_router(metrics_router, tags=["Metrics"])
+    app.include_router(admin_router, prefix="/admin", tags=["Admin"])
+    app.middleware("http")(profile_requests)
+    app.middleware("http")(record_request_metrics)
+    app.middleware("http")(trace_requests)
+    add_compression(app, config)
 
     @app.get("/")
     def read_root():
@@ -52,16 +179,16 @@ def create_app(config: dict) -> FastAPI:
         }
 
     @app.get("/networks")
-    def get_available_networks():
+    def get_available_networks(request: Request):
         try:
             networks = list(config.get("networks", {}).keys())
-            return {"networks": networks}
+            return config_response(request, lambda: {"networks": networks})
         except Exception as e:
             LOGGER.error("Failed to fetch networks: %s", e, exc_info=True)
             raise HTTPException(status_code=500, detail="Failed to retrieve networks") from e
 
     @app.get("/explorer")
-    def get_explorer(network: str):
+    def get_explorer(request: Request, network: str):
         try:
             networks = config.get("networks", {})
 
@@ -75,7 +202,7 @@ def create_app(config: dict) -> FastAPI:
                     detail=f"No explorer URL configured for network '{network}'",
                 )
 
-            return {"explorer_url": explorer_url}
+            return config_response(request, lambda: {"explorer_url": explorer_url}, network)
 
         except HTTPException:
             raise
@@ -88,12 +215,22 @@ def create_app(config: dict) -> FastAPI:
             raise HTTPException(status_code=500, detail="Unexpected error") from e
 
     @app.get("/users")
-    def get_available_users():
+    def get_available_users(request: Request):
         try:
             users = list(config.get("accounts", {}).keys())
-            return {"users": users}
+            return config_response(request, lambda: {"users": users})
         except Exception as e:
             LOGGER.error("Failed to fetch users: %s", e, exc_info=True)
             raise HTTPException(status_code=500, detail="Failed to retrieve users") from e
 
     return app
+
+
+def create_app_from_env() -> FastAPI:
+    """
+    App factory for worker processes started without a preloaded app.
+
+    Returns:
+        FastAPI: The app built from the configuration file named by WILDWEB3_CONFIG.
+    """
+    return create_app(load_config(os.environ.get(CONFIG_ENV_VAR, "../data/config.toml")))
@@ -0,0 +1,126 @@
+"""
+Conditional GET support for endpoints whose responses rarely change.
+
+A route passes the values its response is derived from (the configuration version,
+the artifact index version, the highest contract id) to `cached_json`, which turns them
+into an ETag. When the client already holds that version (`If-None-Match`, or
+`If-Modified-Since` against `Last-Modified`), a bodiless 304 is returned and the body is
+never built, which skips the database query or directory listing behind it.
+"""
+
+import hashlib
+import json
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Iterable, Optional
+
+from fastapi import Request, Response
+from api.serialization import negotiated_response, wants_msgpack
+
+# Configuration only changes on restart, so clients may reuse it for a while
+CONFIG_CACHE_CONTROL = "public, max-age=300"
+# Data that changes on compile or deploy is revalidated on every use
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def config_version(config: dict) -> str:
+    """
+    Return a digest of the configuration, for the ETags of responses derived from it.
+
+    Args:
+        config (dict): The configuration dictionary.
+
+    Returns:
+        str: A short hex digest, stable for the same configuration.
+    """
+    text = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def make_etag(parts: Iterable[Any]) -> str:
+    """
+    Return a strong ETag for the values a response is derived from.
+
+    Args:
+        parts (Iterable[Any]): The values; any change to one of them changes the ETag.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    text = json.dumps(list(parts), default=str)
+    return f'"{hashlib.sha1(text.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[float]) -> bool:
+    """
+    Return True if the client already holds the current version of the response.
+
+    `If-None-Match` takes precedence over `If-Modified-Since`, as in RFC 9110.
+
+    Args:
+        request (Request): The incoming request.
+        etag (str): The current ETag.
+        last_modified (Optional[float]): When the data last changed, as a Unix time.
+
+    Returns:
+        bool: True if a 304 should be returned.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison: a W/ prefix added by a proxy still matches
+        return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have a resolution of one second
+        return int(last_modified) <= since
+    return False
+
+
+def cached_json(request: Request, parts: Iterable[Any], build: Callable[[], Any],
+                cache_control: str = REVALIDATE_CACHE_CONTROL,
+                last_modified: Optional[float] = None) -> Response:
+    """
+    Return a JSON or MessagePack response with validators, or a 304 if the client is
+    up to date.
+
+    Args:
+        request (Request): The incoming request.
+        parts (Iterable[Any]): The values the response is derived from.
+        build (Callable[[], Any]): Builds the body; only called when it is sent.
+        cache_control (str): The Cache-Control header.
+        last_modified (Optional[float]): When the data last changed, as a Unix time.
+
+    Returns:
+        Response: A 200 response or an empty 304 response.
+    """
+    # Each representation has its own ETag
+    etag = make_etag([*parts, "msgpack" if wants_msgpack(request) else "json"])
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept"}
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return negotiated_response(request, build(), headers)
+
+
+def config_response(request: Request, build: Callable[[], Any], *parts: Any) -> Response:
+    """
+    Return a cacheable response derived from the configuration only.
+
+    Args:
+        request (Request): The incoming request; its app holds the configuration version.
+        build (Callable[[], Any]): Builds the body.
+        *parts (Any): Request inputs the body also depends on, such as query parameters.
+
+    Returns:
+        Response: A 200 response or an empty 304 response.
+    """
+    state = request.app.state
+    return cached_json(request, (state.config_version, *parts), build,
+                       CONFIG_CACHE_CONTROL, state.config_loaded_at)
@@ -0,0 +1,159 @@
+"""
+Admin routes and middleware for on-demand profiling.
+
+With `[profiling] enabled = true`, a request carrying an `X-Profile: 1` header or a
+`profile=1` query parameter, or picked by `sample_ratio`, is profiled by sampling the
+stacks of the worker threads while it runs. The collapsed-stack profile is stored and
+its id is returned in the `X-Profile-Id` response header. The admin routes list and
+return stored profiles, and start or stop continuous sampling of the whole process.
+They require `admin_token` in the `X-Admin-Token` header.
+
+Profiles and the continuous sampler belong to one process. With several workers, an
+admin request is answered by whichever worker accepts it, so responses name its `pid`.
+"""
+
+import hmac
+import os
+import random
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from core.logger_config import LOGGER
+from core.profiler import ProfileStore, StackSampler, get_continuous, start_continuous, \
+    stop_continuous, to_collapsed
+
+router = APIRouter()
+
+_PROFILE_STORE: Optional[ProfileStore] = None
+
+
+def get_profile_store(config: dict) -> ProfileStore:
+    """
+    Return the profile store of the process, created from the `[profiling]` section.
+
+    Args:
+        config (dict): The configuration dictionary.
+
+    Returns:
+        ProfileStore: The shared store.
+    """
+    global _PROFILE_STORE  # pylint: disable=global-statement
+    if _PROFILE_STORE is None:
+        settings = config.get("profiling", {})
+        _PROFILE_STORE = ProfileStore(settings.get("max_profiles", 50),
+                                      settings.get("output_dir"))
+    return _PROFILE_STORE
+
+
+def wants_profile(request: Request, settings: dict) -> bool:
+    """Return True if the request asks to be profiled or is picked by the sample ratio."""
+    if request.headers.get("x-profile") == "1" or request.query_params.get("profile") == "1":
+        return True
+    ratio = settings.get("sample_ratio", 0.0)
+    return ratio > 0 and random.random() < ratio
+
+
+async def profile_requests(request: Request, call_next):
+    """
+    HTTP middleware profiling the requests that ask for it.
+
+    Only one request is profiled at a time; others asking meanwhile run unprofiled.
+    """
+    settings = request.app.state.config.get("profiling", {})
+    if not settings.get("enabled", False) or not wants_profile(request, settings):
+        return await call_next(request)
+
+    store = get_profile_store(request.app.state.config)
+    if not store.try_begin():
+        return await call_next(request)
+
+    sampler = StackSampler(settings.get("interval_ms", 5) / 1000)
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        response = await call_next(request)
+    finally:
+        # Stopping joins the sampler thread, which must not block the event loop
+        counts = await run_in_threadpool(sampler.stop)
+        store.end()
+
+    profile = store.add(request.method, request.url.path,
+                        (time.perf_counter() - start) * 1000, counts)
+    LOGGER.info("Profiled %s %s: %s (%d samples)", request.method, request.url.path,
+                profile.profile_id, sampler.samples)
+    response.headers["X-Profile-Id"] = profile.profile_id
+    return response
+
+
+def require_admin(request: Request) -> None:
+    """
+    Dependency restricting the admin routes.
+
+    Raises:
+        HTTPException: 404 if profiling is disabled, 403 if no `admin_token` is
+            configured or the `X-Admin-Token` header does not match it.
+    """
+    settings = request.app.state.config.get("profiling", {})
+    if not settings.get("enabled", False):
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    token = settings.get("admin_token") or ""
+    # An unresolved "${VAR}" placeholder means the variable is not set
+    if not token or token.startswith("${"):
+        raise HTTPException(status_code=403, detail="Set [profiling] admin_token to use "
+                                                    "the admin routes")
+    given = request.headers.get("x-admin-token", "")
+    if not hmac.compare_digest(given.encode(), token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get("/profiles", dependencies=[Depends(require_admin)])
+def list_profiles(request: Request):
+    """List the stored request profiles, newest first."""
+    return {"pid": os.getpid(), "profiles": get_profile_store(request.app.state.config).list()}
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse,
+            dependencies=[Depends(require_admin)])
+def get_profile(request: Request, profile_id: str):
+    """Return a request profile in the collapsed-stack format."""
+    profile = get_profile_store(request.app.state.config).get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' not found")
+    return PlainTextResponse(to_collapsed(profile.counts))
+
+
+@router.post("/profiling/start", dependencies=[Depends(require_admin)])
+def start_profiling(interval_ms: float = 10, include_idle: bool = False):
+    """Start sampling every thread of the process until stopped."""
+    if not 1 <= interval_ms <= 1000:
+        raise HTTPException(status_code=400, detail="interval_ms must be between 1 and 1000")
+    sampler = start_continuous(interval_ms / 1000, include_idle)
+    return {"pid": os.getpid(), "running": True, "interval_ms": sampler.interval * 1000,
+            "started_at": sampler.started_at}
+
+
+@router.get("/profiling", response_class=PlainTextResponse,
+            dependencies=[Depends(require_admin)])
+def read_profiling(reset: bool = False):
+    """
+    Return the stacks sampled so far by the continuous sampler, without stopping it.
+
+    With `reset=true`, the counts start again from zero afterwards.
+    """
+    sampler = get_continuous()
+    if sampler is None:
+        raise HTTPException(status_code=404, detail="Continuous profiling is not running")
+    return PlainTextResponse(to_collapsed(sampler.snapshot(reset)))
+
+
+@router.post("/profiling/stop", response_class=PlainTextResponse,
+             dependencies=[Depends(require_admin)])
+def stop_profiling():
+    """Stop the continuous sampler and return its stacks in the collapsed-stack format."""
+    counts = stop_continuous()
+    if counts is None:
+        raise HTTPException(status_code=404, detail="Continuous profiling is not running")
+    return PlainTextResponse(to_collapsed(counts))
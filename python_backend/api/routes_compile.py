@@ -4,10 +4,12 @@ Routes for uploading and compiling Solidity contracts.
 
 import os
 import uuid
-from fastapi import APIRouter, UploadFile, File
+from fastapi import APIRouter, Request, UploadFile, File
+from services.abi_codec import get_abi_index
 from services.compile_solidity import compile_solidity as compile_solidity_function
-from core.constants import UPLOADS_PATH
+from core.constants import UPLOADS_PATH, ensure_storage_dirs
 from core.logger_config import LOGGER
+from api.http_cache import cached_json
 
 router = APIRouter()
 
@@ -20,6 +22,7 @@ async def compile_solidity(file: UploadFile = File(...)):
         file_location = os.path.join(UPLOADS_PATH, unique_filename)
 
         # Save uploaded file
+        ensure_storage_dirs()
         with open(file_location, "wb") as f:
             f.write(await file.read())
 
@@ -53,15 +56,10 @@ async def compile_solidity(file: UploadFile = File(...)):
 
 
 @router.get("/compiled_contracts")
-def get_compiled_contracts():
+def get_compiled_contracts(request: Request):
     """Return a list of compiled contracts in the build directory."""
-    build_dir = "build"
-    compiled_contracts = []
-
-    if os.path.exists(build_dir):
-        for filename in os.listdir(build_dir):
-            if filename.endswith("ABI.json"):
-                name = filename.replace("ABI.json", "")
-                compiled_contracts.append({"name": name})
-
-    return compiled_contracts
+    # The artifact names and modification times are the version of the list
+    artifacts = get_abi_index().artifacts()
+    return cached_json(request, sorted(artifacts.items()),
+                       lambda: [{"name": name} for name in sorted(artifacts)],
+                       last_modified=max(artifacts.values(), default=None))
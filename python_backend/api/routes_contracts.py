@@ -0,0 +1,146 @@
+"""
+routes_contracts.py
+
+Generic contract routes: call any read-only function or send a transaction to any
+function of a compiled contract by name, and batch many reads into one request.
+"""
+
+from typing import Any, List, Optional
+from eth_abi.exceptions import DecodingError, EncodingError
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, Field
+from services.contract_calls import batch_call, call_function, transact_function
+from services.ethereum_account import EthereumAccount
+from core.config import get_updated_config, InvalidNetworkException
+from core.lazy_import import lazy_import
+from core.logger_config import LOGGER
+from core.rpc_guard import RPCUnavailableError
+from core.web3_connector import get_web3_connector
+
+# Only needed to recognise reverts, which web3 has loaded by then
+web3 = lazy_import("web3")
+
+router = APIRouter()
+
+
+def input_errors() -> tuple:
+    """Return the errors raised when arguments do not match the ABI (422)."""
+    return web3.exceptions.Web3ValidationError, EncodingError
+
+
+def output_errors() -> tuple:
+    """Return the errors raised when return data does not match the ABI (400)."""
+    return web3.exceptions.BadFunctionCallOutput, DecodingError
+
+
+class CallRequest(BaseModel):
+    """Payload for calling a read-only contract function."""
+    contract_name: str
+    function: str
+    args: List[Any] = Field(default_factory=list)
+    block: str = "latest"
+
+
+class TransactRequest(BaseModel):
+    """Payload for sending a transaction to a contract function."""
+    contract_name: str
+    function: str
+    user: str
+    args: List[Any] = Field(default_factory=list)
+    value: int = Field(default=0, ge=0)
+    gas: Optional[int] = Field(default=None, gt=0)
+
+
+class BatchCallItem(BaseModel):
+    """A single read within a batch call."""
+    contract_address: str
+    contract_name: str
+    function: str
+    args: List[Any] = Field(default_factory=list)
+
+
+class BatchCallRequest(BaseModel):
+    """Payload for running many reads on one network in one JSON-RPC batch."""
+    network: str
+    calls: List[BatchCallItem]
+    block: str = "latest"
+
+
+@router.post("/call/batch")
+def call_batch(request: Request, data: BatchCallRequest):
+    """Run many read-only calls, across any contracts, in one round trip."""
+    try:
+        updated_config = get_updated_config(request.app.state.config, data.network)
+        w3 = get_web3_connector(updated_config["network"]).get_web3()
+
+        results = batch_call(w3, [call.model_dump() for call in data.calls], data.block)
+        return {
+            "success": all(result["error"] is None for result in results),
+            "results": results,
+        }
+
+    except InvalidNetworkException as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except input_errors() as e:
+        raise HTTPException(status_code=422, detail=f"Invalid arguments: {e}") from e
+    except output_errors() as e:
+        raise HTTPException(status_code=400, detail=f"Could not decode the result: {e}") from e
+    except RPCUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    except Exception as e:
+        LOGGER.error("Batch call failed: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@router.post("/{network}/{address}/call")
+def call_contract(request: Request, network: str, address: str, data: CallRequest):
+    """Call a read-only function of a contract."""
+    try:
+        updated_config = get_updated_config(request.app.state.config, network)
+        w3 = get_web3_connector(updated_config["network"]).get_web3()
+
+        result = call_function(w3, network, address, data.contract_name,
+                               data.function, data.args, data.block)
+        return {"result": result}
+
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404,
+                            detail=f"Contract '{data.contract_name}' is not compiled") from e
+    except (InvalidNetworkException, ValueError, web3.exceptions.ContractLogicError) as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except input_errors() as e:
+        raise HTTPException(status_code=422, detail=f"Invalid arguments: {e}") from e
+    except output_errors() as e:
+        raise HTTPException(status_code=400, detail=f"Could not decode the result: {e}") from e
+    except RPCUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    except Exception as e:
+        LOGGER.error("Contract call failed: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@router.post("/{network}/{address}/transact")
+def transact_contract(request: Request, network: str, address: str, data: TransactRequest):
+    """Send a transaction calling a function of a contract."""
+    try:
+        updated_config = get_updated_config(request.app.state.config, network)
+        eth_account = EthereumAccount(data.user, updated_config)
+
+        tx_hash = transact_function(eth_account, address, data.contract_name, data.function,
+                                    data.args, data.value, data.gas)
+        return {"success": True, "tx_hash": tx_hash}
+
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404,
+                            detail=f"Contract '{data.contract_name}' is not compiled") from e
+    except (InvalidNetworkException, ValueError, web3.exceptions.ContractLogicError) as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except input_errors() as e:
+        raise HTTPException(status_code=422, detail=f"Invalid arguments: {e}") from e
+    except output_errors() as e:
+        raise HTTPException(status_code=400, detail=f"Could not decode the result: {e}") from e
+    except RPCUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    except Exception as e:
+        LOGGER.error("Contract transaction failed: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e)) from e
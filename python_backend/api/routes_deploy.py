@@ -2,11 +2,13 @@
 Deployment routes for compiling and deploying smart contracts.
 """
 
+from typing import List
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
-from services.deploy_contract import ContractDeployer
+from services.deploy_contract import ContractDeployer, BatchContractDeployer
 from core.logger_config import LOGGER
 from core.config import get_updated_config, InvalidNetworkException
+from core.rpc_guard import RPCUnavailableError
 
 router = APIRouter()
 
@@ -42,9 +44,60 @@ def deploy_contract(req: Request, data: DeployRequest):
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
+    except RPCUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+
     except Exception as e:
         LOGGER.error("Deployment failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"An unexpected error occurred: {e}"
         ) from e
+
+
+class BatchDeployItem(BaseModel):
+    """A contract to deploy within a batch, optionally several times."""
+    contract_name: str
+    constructor_args: list = Field(default_factory=list)
+    count: int = Field(default=1, ge=1)
+
+
+class BatchDeployRequest(BaseModel):
+    """Payload for deploying several smart contracts from one account."""
+    network_name: str
+    user: str
+    items: List[BatchDeployItem]
+
+
+@router.post("/deploy/batch")
+def deploy_contracts_batch(req: Request, data: BatchDeployRequest):
+    """Deploy several contracts to the selected network in one batch."""
+    try:
+        config = req.app.state.config
+        updated_config = get_updated_config(config, data.network_name)
+
+        items = [
+            {"contract_name": item.contract_name, "constructor_args": item.constructor_args}
+            for item in data.items
+            for _ in range(item.count)
+        ]
+
+        deployer = BatchContractDeployer(user=data.user, items=items, config=updated_config)
+        results = deployer.deploy()
+        return {"results": results}
+
+    except InvalidNetworkException as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    except RPCUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+
+    except Exception as e:
+        LOGGER.error("Batch deployment failed: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"An unexpected error occurred: {e}"
+        ) from e
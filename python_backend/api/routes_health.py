@@ -0,0 +1,89 @@
+"""
+Routes for liveness and readiness probes.
+
+`/health/live` only says the process is serving requests. `/health/ready` says it
+should receive traffic: the startup warm-up has finished, every configured account
+address matches its private key, and the database is reachable. The state of each
+network's RPC circuit breaker is reported alongside, but does not affect readiness,
+as one unavailable chain should not take the whole API out of rotation.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from services.contract_store import check_tables
+from core.logger_config import LOGGER
+from core.rpc_guard import get_rpc_guards
+
+# How long a database check result is reused, so frequent probes do not load Postgres
+DB_CHECK_TTL_SECONDS = 5.0
+
+router = APIRouter()
+
+
+class CachedCheck:
+    """
+    Runs a health check at most once per TTL and shares the result.
+    """
+
+    def __init__(self, check: Callable[[], bool], ttl: float = DB_CHECK_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise the CachedCheck.
+
+        Args:
+            check (Callable[[], bool]): The check; an exception counts as a failure.
+            ttl (float): Seconds a result is reused.
+            clock (Callable[[], float]): Monotonic clock, replaceable in tests.
+        """
+        self.check = check
+        self.ttl = ttl
+        self.result: Optional[bool] = None
+        self.checked_at = 0.0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+
+    def __call__(self) -> bool:
+        """Return the cached result, running the check again once it is stale."""
+        with self._lock:
+            if self.result is None or self._clock() - self.checked_at >= self.ttl:
+                try:
+                    self.result = bool(self.check())
+                except Exception as e: # pylint: disable=broad-exception-caught
+                    LOGGER.warning("Health check failed: %s", e)
+                    self.result = False
+                self.checked_at = self._clock()
+            return self.result
+
+
+DATABASE_CHECK = CachedCheck(check_tables)
+
+
+@router.get("/live")
+def live():
+    """Report that the process is up."""
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+def ready(request: Request):
+    """Report whether the API is ready to serve traffic."""
+    warmed_up = request.app.state.warmed_up.is_set()
+    keyring_error = getattr(request.app.state, "keyring_error", None)
+    database = DATABASE_CHECK()
+    networks = {name: guard.breaker.state for name, guard in get_rpc_guards().items()}
+
+    is_ready = warmed_up and keyring_error is None and database
+    content = {
+        "status": "ready" if is_ready else "not_ready",
+        "checks": {"warm_up": warmed_up, "keyring": keyring_error is None,
+                   "database": database},
+        "networks": networks,
+    }
+    if keyring_error:
+        content["errors"] = {"keyring": keyring_error}
+    return JSONResponse(status_code=200 if is_ready else 503, content=content)
@@ -2,13 +2,21 @@
 routes_inbox.py
 
 Inbox contract routes for retrieving messages and counters,
-updating a message, and performing basic math operations.
+updating a message, performing basic math operations, and streaming
+contract state and transaction status to clients.
 """
 
+import asyncio
+import json
+from typing import List
 from fastapi import APIRouter, Request, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from services.inbox_contract import InboxContract
+from services.contract_watcher import get_contract_watcher
+from services.ethereum_account import EthereumAccount
+from services.inbox_contract import InboxContract, bulk_update_messages, read_inbox_state
 from core.config import get_updated_config, InvalidNetworkException
+from core.rpc_guard import RPCUnavailableError
 
 router = APIRouter()
 
@@ -36,6 +44,8 @@ def get_message(
 
     except InvalidNetworkException as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
+    except RPCUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
@@ -61,10 +71,64 @@ def get_counter(
 
         return {"count": contract.get_counter()}
 
+    except RPCUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@router.get("/stream")
+async def stream_contract(
+    request: Request,
+    network: str,
+    contract_address: str,
+    contract_name: str,
+):
+    """
+    Stream message/counter changes and transaction status as Server-Sent Events.
+
+    Emits `state` events with `{"message", "count"}`, `tx` events with the status
+    ("pending", "replaced", "mined" or "failed") and decoded `call` of transactions sent
+    to the contract, and `log` events with the contract's logs and their `decoded` form.
+    """
+    try:
+        config = request.app.state.config
+        updated_config = get_updated_config(config, network)
+        settings = config.get("streaming", {})
+
+        watcher = get_contract_watcher(
+            network, contract_address,
+            read_inbox_state(updated_config, contract_address, contract_name),
+            poll_interval=settings.get("poll_interval_seconds", 5.0),
+        )
+    except InvalidNetworkException as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    heartbeat = settings.get("heartbeat_seconds", 15.0)
+
+    async def events():
+        queue = watcher.subscribe()
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {message['event']}\ndata: {json.dumps(message['data'])}\n\n"
+        finally:
+            watcher.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 class UpdateMessageRequest(BaseModel):
     """Payload for updating a message on a contract."""
     message: str
@@ -91,6 +155,47 @@ def update_message(request: Request, update_data: UpdateMessageRequest):
         tx_hash = contract.update_message(update_data.message)
         return {"success": True, "tx_hash": tx_hash}
 
+    except RPCUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+class MessageUpdate(BaseModel):
+    """A single message update within a bulk update."""
+    message: str
+    contract_name: str
+    contract_address: str
+
+
+class BulkUpdateMessageRequest(BaseModel):
+    """Payload for updating messages on several contracts as one user."""
+    network: str
+    user: str
+    updates: List[MessageUpdate]
+
+
+@router.put("/update/bulk")
+def bulk_update_message(request: Request, bulk_data: BulkUpdateMessageRequest):
+    """Update stored messages on many contracts with one batched broadcast."""
+    try:
+        config = request.app.state.config
+        updated_config = get_updated_config(config, bulk_data.network)
+
+        eth_account = EthereumAccount(bulk_data.user, updated_config)
+        results = bulk_update_messages(
+            eth_account, [update.model_dump() for update in bulk_data.updates]
+        )
+
+        return {
+            "success": all(result["error"] is None for result in results),
+            "results": results,
+        }
+
+    except InvalidNetworkException as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except RPCUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
@@ -120,5 +225,7 @@ def do_maths(request: Request, math_data: MathRequest):
 
         return contract.do_math(math_data.a, math_data.b)
 
+    except RPCUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
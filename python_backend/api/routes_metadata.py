@@ -2,37 +2,72 @@
 Routes for returning metadata about deployed contracts.
 """
 
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, Request
-from services.contract_store import get_contracts
-from api.models import Contract
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from services.contract_cache import enrich_contract, get_contract_cache
+from services.contract_store import get_contract_facets, get_contracts, get_contracts_version
+from api.http_cache import cached_json
 
 router = APIRouter()
 
+# Largest page of contracts returned by one request
+MAX_PAGE_SIZE = 1000
+
+
+def build_metadata(networks: dict, filters: Optional[dict] = None,
+                   limit: Optional[int] = None, offset: int = 0) -> dict:
+    """Read the deployed contracts matching the filters and add their explorer URLs."""
+    return {"contracts": [enrich_contract(row, networks)
+                          for row in get_contracts(filters, limit, offset)]}
+
+
+def filter_params(network: Optional[str] = None, contract_name: Optional[str] = None,
+                  deployer_name: Optional[str] = None,
+                  deployer_address: Optional[str] = None) -> dict:
+    """Query parameters selecting contracts, shared by the metadata and facet routes."""
+    return {"network": network, "contract_name": contract_name,
+            "deployer_name": deployer_name, "deployer_address": deployer_address}
+
 
 @router.get("/metadata")
-def list_contracts(req: Request):
-    """Return metadata for all deployed contracts."""
+def list_contracts(req: Request, filters: dict = Depends(filter_params),
+                   limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+                   offset: int = Query(0, ge=0)):
+    """
+    Return metadata for the deployed contracts, all of them unless filtered or paged.
+
+    The ETag is derived from the highest contract id, the configuration (which holds
+    the explorer URLs) and the query, so an unchanged table is answered with a 304
+    without reading the rows. The unfiltered list is served from the contract cache
+    when it is live.
+    """
     try:
-        config = req.app.state.config
-        networks = config.get("networks", {})
+        networks = req.app.state.config.get("networks", {})
+        query = (filters, limit, offset)
+        cache = get_contract_cache()
+        if cache is not None and limit is None and offset == 0 and not any(filters.values()):
+            return cached_json(req, (req.app.state.config_version, *cache.version(), *query),
+                               cache.metadata)
 
-        raw_contracts = get_contracts()
-        processed = []
+        version = get_contracts_version()
+        return cached_json(req, (req.app.state.config_version, *version, *query),
+                           lambda: build_metadata(networks, filters, limit, offset))
 
-        for c in raw_contracts:
-            # Format timestamp
-            ts = c.get("deployment_timestamp")
-            if isinstance(ts, datetime):
-                c["deployment_timestamp"] = ts.isoformat()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
 
-            # Add explorer URL if available
-            network = c.get("network")
-            c["explorer_url"] = networks.get(network, {}).get("explorer")
 
-            processed.append(Contract(**c))
+@router.get("/facets")
+def contract_facets(req: Request, filters: dict = Depends(filter_params)):
+    """
+    Return the distinct networks, contract names and deployers with their counts.
 
-        return {"contracts": [p.model_dump(mode="json") for p in processed]}
+    Each facet is counted with the other filters applied, and `total` is the number of
+    contracts matching all of them.
+    """
+    try:
+        version = get_contracts_version()
+        return cached_json(req, (*version, filters), lambda: get_contract_facets(filters))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
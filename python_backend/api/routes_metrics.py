@@ -0,0 +1,69 @@
+"""
+Route exposing the metrics of the process in the Prometheus text format.
+"""
+
+import time
+
+from anyio import to_thread
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from core.metrics import HTTP_REQUESTS, HTTP_REQUEST_SECONDS, REGISTRY, THREADPOOL_THREADS
+
+router = APIRouter()
+
+
+def collect_threadpool() -> None:
+    """Record how many threads of the pool running synchronous routes are in use."""
+    limiter = to_thread.current_default_thread_limiter()
+    THREADPOOL_THREADS.set(limiter.borrowed_tokens, state="busy")
+    THREADPOOL_THREADS.set(limiter.total_tokens, state="limit")
+
+
+REGISTRY.add_collector(collect_threadpool)
+
+
+def route_template(request: Request) -> str:
+    """
+    Return the path template of the route that matched a request.
+
+    Args:
+        request (Request): The request, after routing.
+
+    Returns:
+        str: The template, e.g. `/inbox/{network}`, or "unmatched" when no route matched.
+    """
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    # FastAPI versions that resolve included routers lazily keep the prefixed route here
+    route = request.scope.get("fastapi", {}).get("effective_route_context", route)
+    # path_format drops parameter converters, e.g. `{path:path}` becomes `{path}`
+    return getattr(route, "path_format", route.path)
+
+
+async def record_request_metrics(request: Request, call_next):
+    """
+    HTTP middleware recording the latency and status code of every request.
+
+    Requests are labelled with the route template (e.g. `/inbox/{network}`) rather than
+    the path, so that addresses and hashes do not create a series each.
+    """
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        path = route_template(request)
+        HTTP_REQUESTS.inc(method=request.method, route=path, status=str(status))
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start,
+                                     method=request.method, route=path)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Return all metrics in the Prometheus text format."""
+    # Runs on the event loop, where the threadpool limiter can be read
+    return PlainTextResponse(REGISTRY.render(),
+                             media_type="text/plain; version=0.0.4; charset=utf-8")
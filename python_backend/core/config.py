@@ -11,13 +11,13 @@ Attributes:
 
 import os
 import re
-from typing import Any, MutableMapping, Dict, Union
+from typing import Any, MutableMapping, Dict, List, Union
 from urllib.parse import urlparse, urlunparse
 
 import toml
 from dotenv import load_dotenv
 
-from core.logger_config import LOGGER, set_logger_level
+from core.logger_config import LOGGER, configure_logging
 
 ConfigType = MutableMapping[str, Any]
 
@@ -25,19 +25,24 @@ ConfigType = MutableMapping[str, Any]
 load_dotenv()
 
 
-def resolve_env_variables(data: Union[Dict[str, Any], str]) -> Union[Dict[str, Any], str]:
+def resolve_env_variables(data: Union[Dict[str, Any], List[Any], str]) \
+        -> Union[Dict[str, Any], List[Any], str]:
     """
     Recursively replace placeholders with actual environment variables.
 
     Args:
-        data (Union[Dict[str, Any], str]): The data to resolve environment variables in.
+        data (Union[Dict[str, Any], List[Any], str]): The data to resolve environment
+            variables in.
 
     Returns:
-        Union[Dict[str, Any], str]: The data with resolved environment variables.
+        Union[Dict[str, Any], List[Any], str]: The data with resolved environment variables.
     """
     if isinstance(data, dict):
         return {k: resolve_env_variables(v) for k, v in data.items()}
 
+    if isinstance(data, list):
+        return [resolve_env_variables(v) for v in data]
+
     # Only process strings
     if isinstance(data, str):
         pattern = re.compile(r'\$\{([^}]+)\}')
@@ -87,7 +92,6 @@ def print_resolved_vars(config: ConfigType) -> None:
     Returns:
         None
     """
-    LOGGER.info("config = %s", config)
     # Extract accounts dictionary with address-private key pairs
     accounts = config.get("accounts", {})
 
@@ -102,12 +106,21 @@ def print_resolved_vars(config: ConfigType) -> None:
 
             # Handle node URL
             node_url = network_details.get("url", "")
+            endpoints = network_details.get("endpoints", [])
             if node_url:
                 obscured_url = obscure_api_key(node_url)
                 LOGGER.info("Node URL: %s  (api-key hidden)", obscured_url)
-            else:
+            elif not endpoints:
                 LOGGER.info("Node URL not found for %s", network_name)
 
+            for endpoint in endpoints:
+                LOGGER.info("Node URL: %s (weight %s)  (api-key hidden)",
+                            obscure_api_key(endpoint.get("url", "")), endpoint.get("weight", 1))
+
+            ws_url = network_details.get("ws_url", "")
+            if ws_url:
+                LOGGER.info("WebSocket URL: %s  (api-key hidden)", obscure_api_key(ws_url))
+
             # Handle explorer URL
             explorer_url = network_details.get("explorer", "")
             if explorer_url:
@@ -130,7 +143,7 @@ def load_config(filename: str) -> ConfigType:
     try:
         with open(filename, "r", encoding='utf-8') as f:
             config = toml.load(f)
-            set_logger_level(config)
+            configure_logging(config)
             config = resolve_env_variables(config)
             print_resolved_vars(config)
         return config
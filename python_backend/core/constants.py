@@ -1,5 +1,5 @@
 """
-This module defines constants and ensures the necessary directories exist.
+This module defines constants and creates the necessary directories on request.
 
 Constants:
     STORAGE_PATH (str): Base storage path inside the container.
@@ -16,6 +16,17 @@ STORAGE_PATH = "/app"
 BUILD_PATH = os.path.join(STORAGE_PATH, "build")       # Stores compiled ABI/BIN files
 UPLOADS_PATH = os.path.join(STORAGE_PATH, "uploads")   # Stores uploaded Solidity files
 
-# Ensure the directories exist when the app starts
-os.makedirs(BUILD_PATH, exist_ok=True)
-os.makedirs(UPLOADS_PATH, exist_ok=True)
+
+
+def ensure_storage_dirs() -> None:
+    """
+    Create the build and uploads directories if they do not exist.
+
+    Called at startup and before writing files rather than at import time, so importing
+    the backend (for tests or tooling) has no side effects on the filesystem.
+
+    Raises:
+        OSError: If a directory cannot be created.
+    """
+    os.makedirs(BUILD_PATH, exist_ok=True)
+    os.makedirs(UPLOADS_PATH, exist_ok=True)
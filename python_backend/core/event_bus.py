@@ -0,0 +1,83 @@
+'''
+event_bus.py
+
+This module provides a small in-process publish/subscribe bus. Producers such as the
+WebSocket block subscriber publish events on a topic (e.g. `("new_head", "sepolia")`)
+and caches, receipt watchers and push endpoints subscribe to react without polling.
+'''
+import threading
+from typing import Any, Callable, Dict, Hashable, List
+
+from core.logger_config import LOGGER
+
+Callback = Callable[[Any], None]
+
+
+class EventBus:
+    """
+    Thread-safe topic-based publish/subscribe bus.
+
+    Callbacks run synchronously in the publisher's thread, so they must be quick;
+    asyncio consumers should hand events over with `loop.call_soon_threadsafe`.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[Hashable, List[Callback]] = {}
+        self._lock = threading.Lock()
+
+
+    def subscribe(self, topic: Hashable, callback: Callback) -> Callable[[], None]:
+        """
+        Register a callback for a topic.
+
+        Args:
+            topic (Hashable): The topic to listen to.
+            callback (Callback): Called with each published event.
+
+        Returns:
+            Callable[[], None]: A function that removes the subscription.
+        """
+        with self._lock:
+            self._subscribers.setdefault(topic, []).append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                callbacks = self._subscribers.get(topic, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                if not callbacks:
+                    self._subscribers.pop(topic, None)
+
+        return unsubscribe
+
+
+    def publish(self, topic: Hashable, event: Any) -> int:
+        """
+        Deliver an event to every subscriber of a topic.
+
+        Args:
+            topic (Hashable): The topic to publish on.
+            event (Any): The event payload.
+
+        Returns:
+            int: The number of subscribers the event was delivered to.
+        """
+        with self._lock:
+            callbacks = list(self._subscribers.get(topic, []))
+
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                LOGGER.error("Event bus subscriber failed for %s: %s", topic, e, exc_info=True)
+        return len(callbacks)
+
+
+    def has_subscribers(self, topic: Hashable) -> bool:
+        """Return True if anything listens to a topic."""
+        with self._lock:
+            return bool(self._subscribers.get(topic))
+
+
+# Shared bus for the whole backend
+EVENT_BUS = EventBus()
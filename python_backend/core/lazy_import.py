@@ -0,0 +1,80 @@
+'''
+lazy_import.py
+
+This module defers the import of heavy third-party packages (web3, eth_account, solcx,
+psycopg2) until one of their attributes is first used. Importing the API then only
+pays for FastAPI and the modules it really needs, which keeps cold starts and worker
+spawns fast; the cost moves to the first request that uses a package, or to the
+warm-up run in the background at startup.
+'''
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+
+_LOCK = threading.Lock()
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return a module whose code only runs when one of its attributes is accessed.
+
+    Already imported modules are returned as they are. Submodules of a lazy package
+    (for example `web3.exceptions`) are available as attributes once the package
+    itself has loaded, as long as the package imports them.
+
+    Args:
+        name (str): The absolute module name.
+
+    Returns:
+        ModuleType: The module, loaded or pending.
+
+    Raises:
+        ModuleNotFoundError: If the module cannot be found.
+    """
+    with _LOCK:
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+
+        spec = importlib.util.find_spec(name)
+        if spec is None:
+            raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+        loader = importlib.util.LazyLoader(spec.loader)
+        spec.loader = loader
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        loader.exec_module(module)
+        return module
+
+
+def load(name: str) -> ModuleType:
+    """
+    Import a module now, running its code if it is still pending behind a lazy import.
+
+    Args:
+        name (str): The absolute module name.
+
+    Returns:
+        ModuleType: The loaded module.
+    """
+    module = lazy_import(name)
+    # Any attribute access makes a lazy module run its code
+    getattr(module, "__dict__")
+    return module
+
+
+def is_loaded(name: str) -> bool:
+    """
+    Check whether a module has been imported and its code has run.
+
+    Args:
+        name (str): The absolute module name.
+
+    Returns:
+        bool: False if the module is missing or still pending behind a lazy import.
+    """
+    module = sys.modules.get(name)
+    pending = importlib.util._LazyModule # pylint: disable=protected-access
+    return module is not None and not isinstance(module, pending)
@@ -1,36 +1,251 @@
 """
 Logger configuration module.
 
-This module provides functionality to set up and configure a global logger
-based on the configuration settings provided in a dictionary. The logger
-level is set according to the 'log_level' specified in the configuration.
+This module sets up the logging pipeline of the process from the configuration
+dictionary. Records are put on a bounded queue by the thread that logs them and written
+by a background listener thread, so a slow terminal or log collector never adds to
+request latency. Before a record is queued:
+
+- per-module levels from `[logging.modules]` are applied on top of `log_level`;
+- repetitive INFO and DEBUG messages are rate limited per call site, keeping a sampled
+  fraction of the excess and noting how many were suppressed.
+
+Records are written as text or, with `[logging] format = "json"`, one JSON object per
+line.
 
 Attributes:
     LOGGER (logging.Logger): The global logger instance.
 """
 
+import atexit
+import json
 import logging
-from typing import Any, MutableMapping
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, IO, MutableMapping, Optional, Tuple
 
 ConfigType = MutableMapping[str, Any]
 
+TEXT_FORMAT = '%(asctime)s - %(module)s - %(levelname)s - %(message)s'
+
+
+def parse_level(name: Any, default: int = logging.INFO) -> int:
+    """
+    Return the numeric level for a level name such as "debug" or "WARNING".
+
+    Args:
+        name (Any): The level name.
+        default (int): The level used when the name is unknown.
+
+    Returns:
+        int: The numeric level.
+    """
+    level = getattr(logging, str(name).upper(), None)
+    return level if isinstance(level, int) else default
+
+
+class ModuleLevelFilter(logging.Filter):
+    """
+    Drops records below the level configured for the module that logged them.
+
+    Modules are matched on the file name of the caller (e.g. `contract_store`) and, for
+    libraries, on the top-level logger name (e.g. `web3`).
+    """
+
+    def __init__(self, default: int, levels: Optional[Dict[str, int]] = None):
+        """
+        Initialise the ModuleLevelFilter.
+
+        Args:
+            default (int): The level of modules without an entry.
+            levels (Optional[Dict[str, int]]): The level per module.
+        """
+        super().__init__()
+        self.default = default
+        self.levels = levels or {}
+
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        level = self.levels.get(record.module)
+        if level is None:
+            level = self.levels.get(record.name.split(".", 1)[0], self.default)
+        return record.levelno >= level
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limits how often one call site may log below WARNING.
+
+    Each call site may log `limit` records per `window` seconds. Beyond that, only a
+    `sample_ratio` fraction of its records is kept; the next record kept carries the
+    number suppressed in between. Warnings and errors are never limited.
+    """
+
+    def __init__(self, limit: int = 20, window: float = 10.0, sample_ratio: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise the RateLimitFilter.
+
+        Args:
+            limit (int): Records allowed per call site and window; 0 disables the limit.
+            window (float): The window length in seconds.
+            sample_ratio (float): Fraction of the records over the limit that are kept.
+            clock (Callable[[], float]): Returns the current time in seconds.
+        """
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.sample_ratio = sample_ratio
+        self.clock = clock
+        self._sites: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0 or record.levelno >= logging.WARNING:
+            return True
 
-def set_logger_level(config: ConfigType) -> None:
+        now = self.clock()
+        with self._lock:
+            site = self._sites.setdefault((record.pathname, record.lineno), [now, 0, 0])
+            if now - site[0] >= self.window:
+                site[0], site[1] = now, 0
+            site[1] += 1
+            if site[1] > self.limit and random.random() >= self.sample_ratio:
+                site[2] += 1
+                return False
+            suppressed, site[2] = site[2], 0
+
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc)
+                          .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that drops records when the queue is full instead of blocking.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_HANDLER: Optional[DroppingQueueHandler] = None
+_LISTENER: Optional[QueueListener] = None
+_LOCK = threading.Lock()
+
+
+def _start_listener(queue_size: int) -> None:
+    """Give the queue handler a new queue and start a listener thread draining it."""
+    global _LISTENER  # pylint: disable=global-statement
+    _HANDLER.queue = queue.Queue(queue_size)
+    _LISTENER = QueueListener(_HANDLER.queue, *_LISTENER.handlers,
+                              respect_handler_level=True)
+    _LISTENER.start()
+
+
+def _stop_listener() -> None:
+    """Write the queued records and stop the listener thread."""
+    if _LISTENER is not None and _LISTENER._thread is not None:  # pylint: disable=protected-access
+        _LISTENER.stop()
+
+
+def _after_fork() -> None:
+    """Restart the listener in a forked worker; the thread does not survive the fork."""
+    if _LISTENER is not None:
+        _LISTENER._thread = None  # pylint: disable=protected-access
+        _start_listener(_HANDLER.queue.maxsize)
+
+
+def configure_logging(config: ConfigType, stream: Optional[IO[str]] = None) -> None:
     """
-    Set the logger level based on the configuration.
+    Set up the logging pipeline from the configuration, replacing any earlier one.
 
     Args:
-        config (ConfigType): The configuration dictionary.
+        config (ConfigType): The configuration dictionary; reads `api_server.log_level`
+            and the `[logging]` section.
+        stream (Optional[IO[str]]): Where records are written; defaults to stderr.
 
     Returns:
         None
     """
-    log_level = config.get('api_server', {}).get('log_level', 'INFO').upper()
-    numeric_level = getattr(logging, log_level, logging.INFO)
-    logging.basicConfig(level=numeric_level, \
-                        format='%(asctime)s - %(module)s - %(levelname)s - %(message)s')
-    logging.getLogger().setLevel(numeric_level)
-    logging.info("Logger level set to %s", log_level)
+    global _HANDLER, _LISTENER  # pylint: disable=global-statement
+    settings = config.get("logging", {})
+    default = parse_level(config.get("api_server", {}).get("log_level", "INFO"))
+    levels = {module: parse_level(level, default)
+              for module, level in settings.get("modules", {}).items()}
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    if settings.get("format", "text") == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    handler = DroppingQueueHandler(queue.Queue(settings.get("queue_size", 10000)))
+    handler.addFilter(ModuleLevelFilter(default, levels))
+    handler.addFilter(RateLimitFilter(settings.get("rate_limit", 20),
+                                      settings.get("rate_window", 10.0),
+                                      settings.get("sample_ratio", 0.0)))
+
+    root = logging.getLogger()
+    with _LOCK:
+        first = _LISTENER is None
+        if _HANDLER is not None:
+            root.removeHandler(_HANDLER)
+            _stop_listener()
+        # Replace the blocking handlers of an earlier basicConfig
+        for existing in list(root.handlers):
+            if isinstance(existing, logging.StreamHandler) and \
+                    not isinstance(existing, logging.FileHandler):
+                root.removeHandler(existing)
+
+        _HANDLER = handler
+        _LISTENER = QueueListener(handler.queue, output, respect_handler_level=True)
+        _LISTENER.start()
+        root.addHandler(handler)
+        # Loggers skip records no module wants before building them
+        root.setLevel(min([default, *levels.values()]))
+
+    if first:
+        atexit.register(_stop_listener)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_after_fork)
+    LOGGER.info("Logger level set to %s", logging.getLevelName(default))
 
 
 # Create a global logger instance
@@ -0,0 +1,296 @@
+'''
+metrics.py
+
+This module keeps in-process counters, gauges and latency histograms and renders them
+in the Prometheus text exposition format for the `/metrics` endpoint. The metrics of
+the API routes, the JSON-RPC calls of every network, the database queries and the
+Solidity compiler are defined here, so that every module records into the same
+registry.
+
+Metrics are kept per process; with several workers, each one reports its own values
+and Prometheus sums them per instance.
+'''
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Latency buckets in seconds, from a cached read to a slow compilation
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues,
+                   extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render a label set such as `{network="sepolia",method="eth_call"}`."""
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value, keeping integers without a decimal point."""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """
+    Base class of the metric types, holding one value per label set.
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        """
+        Initialise the Metric.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The help text.
+            labelnames (Tuple[str, ...]): The names of the labels, in order.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        """
+        Return the label values in the order of the label names.
+
+        Raises:
+            ValueError: If the labels do not match the label names.
+        """
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, "
+                             f"got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+    def samples(self) -> List[str]:
+        """Return the sample lines of the metric."""
+        raise NotImplementedError
+
+
+    def render(self) -> str:
+        """Return the metric in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """
+    A value that only goes up.
+    """
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add to the counter of a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+    def value(self, **labels: str) -> float:
+        """Return the current value for a label set."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in items]
+
+
+class Gauge(Counter):
+    """
+    A value that goes up and down.
+    """
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge of a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Subtract from the gauge of a label set."""
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """
+    Counts observations into cumulative buckets, with their sum and count.
+    """
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialise the Histogram.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The help text.
+            labelnames (Tuple[str, ...]): The names of the labels, in order.
+            buckets (Tuple[float, ...]): The upper bounds of the buckets, ascending.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe how long the body of the `with` block takes, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+
+    def count(self, **labels: str) -> int:
+        """Return the number of observations for a label set."""
+        with self._lock:
+            return sum(self._counts.get(self._key(labels), []))
+
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            items = sorted((key, list(counts), self._sums[key])
+                           for key, counts in self._counts.items())
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds the metrics of the process and renders them together.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add a metric to the registry.
+
+        Raises:
+            ValueError: If a metric with the same name is already registered.
+        """
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """
+        Add a callable that refreshes gauges right before the metrics are rendered.
+
+        Args:
+            collector (Callable[[], None]): Called on every render; exceptions are ignored.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text format."""
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+        for collector in collectors:
+            try:
+                collector()
+            except Exception: # pylint: disable=broad-exception-caught
+                pass
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "wildweb3_http_requests_total", "API requests by route and status code.",
+    ("method", "route", "status")))
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "wildweb3_http_request_duration_seconds",
+    "Time until the response headers of an API request are sent.", ("method", "route")))
+
+RPC_REQUESTS = REGISTRY.register(Counter(
+    "wildweb3_rpc_requests_total", "JSON-RPC requests by network, method and outcome.",
+    ("network", "method", "outcome")))
+RPC_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "wildweb3_rpc_request_duration_seconds", "JSON-RPC request latency.",
+    ("network", "method")))
+
+DB_QUERIES = REGISTRY.register(Counter(
+    "wildweb3_db_queries_total", "Database queries by query and outcome.",
+    ("query", "outcome")))
+DB_QUERY_SECONDS = REGISTRY.register(Histogram(
+    "wildweb3_db_query_duration_seconds", "Database query latency, including the connection.",
+    ("query",)))
+
+COMPILE_SECONDS = REGISTRY.register(Histogram(
+    "wildweb3_compile_duration_seconds", "Solidity compilation time.", ("outcome",)))
+SOLC_CACHE = REGISTRY.register(Counter(
+    "wildweb3_solc_cache_total",
+    "Lookups of the installed solc binary; a miss downloads the compiler.", ("result",)))
+
+THREADPOOL_THREADS = REGISTRY.register(Gauge(
+    "wildweb3_threadpool_threads", "Threads of the pool running synchronous routes.",
+    ("state",)))
+PENDING_TRANSACTIONS = REGISTRY.register(Gauge(
+    "wildweb3_pending_transactions", "Sent transactions still waiting to be mined.",
+    ("network",)))
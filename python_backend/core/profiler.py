@@ -0,0 +1,298 @@
+'''
+profiler.py
+
+This module provides a low-overhead sampling profiler. A background thread reads the
+stack of every other thread with `sys._current_frames()` at a fixed interval and counts
+identical stacks. The result is written in the collapsed-stack format
+(`thread;outer;inner 42`), which flamegraph.pl, speedscope and most flame graph tools
+read directly.
+
+The sampled code runs unmodified; the only cost is the sampler holding the GIL
+briefly once per interval, so it can run in production. Threads waiting in locks,
+queues or selectors are skipped unless idle stacks are requested, so profiles show
+where CPU time goes.
+'''
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, List, Optional
+
+from core.logger_config import LOGGER
+
+# Leaf frames in these files mean the thread is waiting, not running
+IDLE_FILES = (
+    "threading.py", "selectors.py", "queue.py",
+    os.path.join("concurrent", "futures", "thread.py"),
+)
+
+DEFAULT_INTERVAL_SECONDS = 0.005
+MAX_STACK_DEPTH = 128
+
+
+def _frame_label(code) -> str:
+    """Label a frame as `function (file.py:line)`, without the collapsed-format separator."""
+    label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label.replace(";", ":")
+
+
+class StackSampler:
+    """
+    Samples the stacks of all other threads until stopped.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL_SECONDS,
+                 include_idle: bool = False, max_depth: int = MAX_STACK_DEPTH):
+        """
+        Initialise the StackSampler.
+
+        Args:
+            interval (float): Seconds between samples.
+            include_idle (bool): Also count threads that are waiting.
+            max_depth (int): Frames kept per stack, counted from the innermost.
+        """
+        self.interval = interval
+        self.include_idle = include_idle
+        self.max_depth = max_depth
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+
+    @property
+    def running(self) -> bool:
+        """Return True while the sampler thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+
+    def stop(self) -> Counter:
+        """
+        Stop sampling.
+
+        Returns:
+            Counter: The number of samples per collapsed stack.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped_at = time.time()
+        return self.snapshot()
+
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+    def sample(self) -> None:
+        """Take one sample of every other thread."""
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = []
+        for ident, frame in sys._current_frames().items(): # pylint: disable=protected-access
+            if ident == own:
+                continue
+            if not self.include_idle and frame.f_code.co_filename.endswith(IDLE_FILES):
+                continue
+            labels = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"thread-{ident}").replace(";", ":"))
+            stacks.append(";".join(reversed(labels)))
+
+        with self._lock:
+            self.samples += 1
+            self.counts.update(stacks)
+
+
+    def snapshot(self, reset: bool = False) -> Counter:
+        """
+        Return a copy of the counts gathered so far.
+
+        Args:
+            reset (bool): Start counting from zero afterwards.
+        """
+        with self._lock:
+            counts = Counter(self.counts)
+            if reset:
+                self.counts.clear()
+            return counts
+
+
+def to_collapsed(counts: Counter) -> str:
+    """
+    Render stack counts in the collapsed-stack format, most frequent first.
+
+    Args:
+        counts (Counter): The number of samples per collapsed stack.
+
+    Returns:
+        str: One `stack count` line per stack.
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+class Profile:
+    """
+    The collapsed stacks sampled while one request was handled.
+    """
+
+    def __init__(self, profile_id: str, method: str, path: str, duration_ms: float,
+                 counts: Counter):
+        """
+        Initialise the Profile.
+
+        Args:
+            profile_id (str): The id returned in the `X-Profile-Id` header.
+            method (str): The HTTP method of the request.
+            path (str): The path of the request.
+            duration_ms (float): How long the request took.
+            counts (Counter): The number of samples per collapsed stack.
+        """
+        self.profile_id = profile_id
+        self.method = method
+        self.path = path
+        self.duration_ms = duration_ms
+        self.counts = counts
+        self.created_at = time.time()
+
+
+    def summary(self) -> dict:
+        """Return the profile metadata, without the stacks."""
+        return {
+            "id": self.profile_id,
+            "method": self.method,
+            "path": self.path,
+            "duration_ms": round(self.duration_ms, 3),
+            "samples": sum(self.counts.values()),
+            "created_at": self.created_at,
+        }
+
+
+class ProfileStore:
+    """
+    Keeps the most recent request profiles, optionally also writing them to a directory.
+
+    Only one request is profiled at a time, so that concurrent profiles do not
+    double the sampling cost or show each other's stacks.
+    """
+
+    def __init__(self, max_profiles: int = 50, output_dir: Optional[str] = None):
+        """
+        Initialise the ProfileStore.
+
+        Args:
+            max_profiles (int): Profiles kept in memory; older ones are discarded.
+            output_dir (Optional[str]): Directory receiving a `<id>.collapsed` file per
+                profile.
+        """
+        self.output_dir = output_dir
+        self._profiles: Deque[Profile] = deque(maxlen=max_profiles)
+        self._ids = itertools.count(1)
+        self._active = threading.Lock()
+        self._lock = threading.Lock()
+
+
+    def try_begin(self) -> bool:
+        """Claim the profiling slot; return False if a request is already profiled."""
+        return self._active.acquire(blocking=False)
+
+
+    def end(self) -> None:
+        """Release the profiling slot."""
+        self._active.release()
+
+
+    def add(self, method: str, path: str, duration_ms: float, counts: Counter) -> Profile:
+        """
+        Store the profile of a request.
+
+        Returns:
+            Profile: The stored profile.
+        """
+        profile = Profile(f"{int(time.time())}-{next(self._ids)}", method, path,
+                          duration_ms, counts)
+        with self._lock:
+            self._profiles.append(profile)
+
+        if self.output_dir:
+            try:
+                os.makedirs(self.output_dir, exist_ok=True)
+                file_path = os.path.join(self.output_dir, f"{profile.profile_id}.collapsed")
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(to_collapsed(counts))
+            except OSError as e:
+                LOGGER.warning("Could not write profile %s: %s", profile.profile_id, e)
+        return profile
+
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        """Return a stored profile by id."""
+        with self._lock:
+            return next((p for p in self._profiles if p.profile_id == profile_id), None)
+
+
+    def list(self) -> List[dict]:
+        """Return the summaries of the stored profiles, newest first."""
+        with self._lock:
+            return [profile.summary() for profile in reversed(self._profiles)]
+
+
+_CONTINUOUS: Optional[StackSampler] = None
+_CONTINUOUS_LOCK = threading.Lock()
+
+
+def start_continuous(interval: float = 0.01, include_idle: bool = False) -> StackSampler:
+    """
+    Start the process-wide continuous sampler, if it is not already running.
+
+    Args:
+        interval (float): Seconds between samples.
+        include_idle (bool): Also count threads that are waiting.
+
+    Returns:
+        StackSampler: The running sampler.
+    """
+    global _CONTINUOUS  # pylint: disable=global-statement
+    with _CONTINUOUS_LOCK:
+        if _CONTINUOUS is None or not _CONTINUOUS.running:
+            _CONTINUOUS = StackSampler(interval, include_idle)
+            _CONTINUOUS.start()
+            LOGGER.info("Continuous profiling started (every %.1f ms)", interval * 1000)
+        return _CONTINUOUS
+
+
+def stop_continuous() -> Optional[Counter]:
+    """
+    Stop the continuous sampler.
+
+    Returns:
+        Optional[Counter]: The stacks sampled since it started, or None if it was not
+            running.
+    """
+    global _CONTINUOUS  # pylint: disable=global-statement
+    with _CONTINUOUS_LOCK:
+        sampler, _CONTINUOUS = _CONTINUOUS, None
+    if sampler is None:
+        return None
+    LOGGER.info("Continuous profiling stopped after %d samples", sampler.samples)
+    return sampler.stop()
+
+
+def get_continuous() -> Optional[StackSampler]:
+    """Return the continuous sampler, if one is running."""
+    return _CONTINUOUS
@@ -0,0 +1,263 @@
+'''
+rpc_guard.py
+
+This module isolates networks from each other by guarding every JSON-RPC call with a
+per-network bulkhead (a cap on in-flight calls plus a bounded wait queue) and a
+circuit breaker that fails fast after repeated timeouts or errors. The guards wrap
+the provider built by `Web3Connector` (see `rpc_router.GuardedProvider`), so one slow
+chain cannot exhaust the threadpool used by requests for the others.
+
+It does not depend on web3, so routes can catch `RPCUnavailableError` without loading it.
+'''
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from core.logger_config import LOGGER
+
+
+class RPCUnavailableError(Exception):
+    """
+    Raised when an RPC call is rejected without being sent to the node.
+    """
+    def __init__(self, network_name: str, reason: str):
+        super().__init__(f"RPC for network '{network_name}' is unavailable: {reason}")
+        self.network_name = network_name
+
+
+class CircuitOpenError(RPCUnavailableError):
+    """
+    Raised when the circuit breaker for a network is open.
+    """
+
+
+class BulkheadFullError(RPCUnavailableError):
+    """
+    Raised when a network already has the maximum number of in-flight and queued calls.
+    """
+
+
+class Bulkhead:
+    """
+    Limits the number of concurrent calls, with a bounded queue of waiting callers.
+    """
+
+    def __init__(self, network_name: str, max_in_flight: int = 16, max_queue: int = 32,
+                 queue_timeout: float = 5.0):
+        """
+        Initialise the Bulkhead.
+
+        Args:
+            network_name (str): The network the bulkhead protects.
+            max_in_flight (int): The maximum number of concurrent calls.
+            max_queue (int): The maximum number of callers waiting for a slot.
+            queue_timeout (float): How long a queued caller waits before giving up.
+        """
+        self.network_name = network_name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self._slots = threading.Semaphore(max_in_flight)
+        self._lock = threading.Lock()
+
+
+    def acquire(self) -> None:
+        """
+        Take a slot, waiting in the queue if necessary.
+
+        Raises:
+            BulkheadFullError: If the queue is full or no slot frees up in time.
+        """
+        if self._slots.acquire(blocking=False):
+            with self._lock:
+                self.in_flight += 1
+            return
+
+        with self._lock:
+            if self.waiting >= self.max_queue:
+                raise BulkheadFullError(self.network_name, "too many queued calls")
+            self.waiting += 1
+
+        try:
+            if not self._slots.acquire(timeout=self.queue_timeout):
+                raise BulkheadFullError(self.network_name, "timed out waiting for a free slot")
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+        with self._lock:
+            self.in_flight += 1
+
+
+    def release(self) -> None:
+        """Give a slot back."""
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+
+class CircuitBreaker:
+    """
+    Opens after consecutive failures and lets a single probe through after a cool-down.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, network_name: str, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise the CircuitBreaker.
+
+        Args:
+            network_name (str): The network the breaker protects.
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_timeout (float): Seconds to stay open before allowing a probe.
+            clock (Callable[[], float]): Monotonic clock, replaceable in tests.
+        """
+        self.network_name = network_name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._clock = clock
+        self._lock = threading.Lock()
+
+
+    def before_call(self) -> None:
+        """
+        Check whether a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or a probe is already in flight.
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if self._clock() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError(self.network_name, "circuit breaker is open")
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError(self.network_name, "circuit breaker is half-open")
+                self._probe_in_flight = True
+
+
+    def cancel_probe(self) -> None:
+        """Let another caller probe a half-open circuit when the probe never ran."""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                LOGGER.info("Circuit breaker for %s closed", self.network_name)
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit once the threshold is reached."""
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    LOGGER.warning("Circuit breaker for %s opened after %d failures",
+                                   self.network_name, self.failures)
+                self.state = self.OPEN
+                self.opened_at = self._clock()
+
+
+class RPCGuard:
+    """
+    Combines the bulkhead and circuit breaker of one network.
+    """
+
+    def __init__(self, network_name: str, max_in_flight: int = 16, max_queue: int = 32,
+                 queue_timeout: float = 5.0, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0):
+        """
+        Initialise the RPCGuard.
+
+        Args:
+            network_name (str): The network the guard protects.
+            max_in_flight (int): The maximum number of concurrent RPC calls.
+            max_queue (int): The maximum number of RPC calls waiting for a slot.
+            queue_timeout (float): How long a queued call waits before failing.
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_timeout (float): Seconds the circuit stays open before a probe.
+        """
+        self.bulkhead = Bulkhead(network_name, max_in_flight, max_queue, queue_timeout)
+        self.breaker = CircuitBreaker(network_name, failure_threshold, reset_timeout)
+
+
+    def call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run an RPC call through the circuit breaker and bulkhead.
+
+        Connection errors and timeouts (`OSError`) count as failures; JSON-RPC error
+        responses do not, as they come from a healthy node.
+
+        Raises:
+            RPCUnavailableError: If the call is rejected without being sent.
+        """
+        self.breaker.before_call()
+        try:
+            self.bulkhead.acquire()
+        except BulkheadFullError:
+            self.breaker.cancel_probe()
+            raise
+
+        try:
+            result = func(*args)
+        except OSError:
+            self.breaker.record_failure()
+            raise
+        except Exception:
+            # The node answered, even if the answer could not be used
+            self.breaker.record_success()
+            raise
+        finally:
+            self.bulkhead.release()
+
+        self.breaker.record_success()
+        return result
+
+
+_GUARDS: Dict[str, RPCGuard] = {}
+_GUARDS_LOCK = threading.Lock()
+
+
+def get_rpc_guard(network_config: dict) -> RPCGuard:
+    """
+    Return the shared guard for a network, creating it from its `rpc_guard` settings.
+
+    Args:
+        network_config (dict): The network configuration.
+
+    Returns:
+        RPCGuard: The guard shared by all connectors of this network.
+    """
+    name = network_config.get("name", "unknown")
+    with _GUARDS_LOCK:
+        guard = _GUARDS.get(name)
+        if guard is None:
+            guard = RPCGuard(name, **network_config.get("rpc_guard", {}))
+            _GUARDS[name] = guard
+        return guard
+
+
+def get_rpc_guards() -> Dict[str, RPCGuard]:
+    """Return the guards created so far, keyed by network name."""
+    with _GUARDS_LOCK:
+        return dict(_GUARDS)
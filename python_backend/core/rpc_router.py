@@ -0,0 +1,326 @@
+'''
+rpc_router.py
+
+This module provides the FailoverHTTPProvider, a Web3 provider that spreads requests
+over several JSON-RPC endpoints of the same network. Each request is routed to the
+endpoint with the best rolling latency and error statistics (scaled by its configured
+weight), failed requests fail over to the next endpoint, and slow read requests are
+hedged by sending a duplicate to a second endpoint. It also provides the
+GuardedProvider, which sends every request through the network's `RPCGuard` and
+records its latency and outcome per method, in the metrics and as a trace span.
+
+Both providers subclass web3 classes, so this module is only imported when a network
+is first connected.
+'''
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, List, Optional
+
+from web3 import HTTPProvider
+from web3.providers import JSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+from core.logger_config import LOGGER
+from core.metrics import RPC_REQUESTS, RPC_REQUEST_SECONDS
+from core.rpc_guard import RPCGuard, RPCUnavailableError
+from core.tracing import KIND_CLIENT, start_span
+
+# Read-only methods that are safe to send to two endpoints at once
+HEDGEABLE_METHODS = {
+    "eth_call", "eth_blockNumber", "eth_chainId", "eth_gasPrice", "eth_getBalance",
+    "eth_getBlockByNumber", "eth_getBlockByHash", "eth_getCode", "eth_getLogs",
+    "eth_getStorageAt", "eth_getTransactionByHash", "eth_getTransactionCount",
+    "eth_getTransactionReceipt", "eth_estimateGas", "eth_maxPriorityFeePerGas",
+    "eth_feeHistory", "net_version", "web3_clientVersion",
+}
+
+# Smoothing factor for the rolling latency and error statistics
+EWMA_ALPHA = 0.3
+
+# Latency penalty (in seconds) of an endpoint whose recent requests all failed
+ERROR_PENALTY_SECONDS = 1.0
+
+# The error rate halves every this many seconds, so an endpoint that is no longer
+# chosen after failing still recovers its rank
+ERROR_HALF_LIFE_SECONDS = 30.0
+
+# Cool-down applied to an endpoint after consecutive failures (doubles up to the max)
+BASE_COOLDOWN_SECONDS = 1.0
+MAX_COOLDOWN_SECONDS = 30.0
+
+
+class RPCEndpointState:
+    """
+    Rolling health statistics for one JSON-RPC endpoint.
+    """
+
+    def __init__(self, url: str, weight: float = 1.0, request_timeout: float = 10):
+        """
+        Initialise the RPCEndpointState.
+
+        Args:
+            url (str): The endpoint URL.
+            weight (float): Relative preference; higher weights receive more traffic.
+            request_timeout (float): HTTP timeout in seconds for this endpoint.
+        """
+        self.url = url
+        self.weight = max(float(weight), 0.001)
+        self.provider = HTTPProvider(url, request_kwargs={"timeout": request_timeout},
+                                     exception_retry_configuration=None)
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.error_updated_at = 0.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+
+    def is_available(self, now: float) -> bool:
+        """Return True if the endpoint is not cooling down after failures."""
+        return now >= self.cooldown_until
+
+
+    def decayed_error_rate(self, now: float) -> float:
+        """Return the error rate, decayed for the time since it was last updated."""
+        elapsed = max(now - self.error_updated_at, 0.0)
+        return self.error_rate * 0.5 ** (elapsed / ERROR_HALF_LIFE_SECONDS)
+
+
+    def score(self, now: Optional[float] = None) -> float:
+        """Return the routing score; lower is better."""
+        error_rate = self.decayed_error_rate(time.monotonic() if now is None else now)
+        return (self.latency + ERROR_PENALTY_SECONDS * error_rate) / self.weight
+
+
+    def record_success(self, latency: float, now: Optional[float] = None) -> None:
+        """Update the statistics after a successful request."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.latency = latency if self.latency == 0 else \
+                EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency
+            self.error_rate = (1 - EWMA_ALPHA) * self.decayed_error_rate(now)
+            self.error_updated_at = now
+            self.consecutive_failures = 0
+            self.cooldown_until = 0.0
+
+
+    def record_failure(self, now: float) -> None:
+        """Update the statistics after a failed request and start a cool-down."""
+        with self._lock:
+            self.error_rate = EWMA_ALPHA + (1 - EWMA_ALPHA) * self.decayed_error_rate(now)
+            self.error_updated_at = now
+            self.consecutive_failures += 1
+            cooldown = min(BASE_COOLDOWN_SECONDS * 2 ** (self.consecutive_failures - 1),
+                           MAX_COOLDOWN_SECONDS)
+            self.cooldown_until = now + cooldown
+
+
+class FailoverHTTPProvider(JSONBaseProvider):
+    """
+    Web3 provider that routes requests across several HTTP endpoints of one network.
+    """
+
+    def __init__(self, endpoints: List[dict], hedge_after_ms: Optional[float] = None,
+                 request_timeout: float = 10, max_in_flight: int = 16):
+        """
+        Initialise the FailoverHTTPProvider.
+
+        Args:
+            endpoints (List[dict]): Items with a `url` and an optional `weight`.
+            hedge_after_ms (Optional[float]): Send a duplicate read request to the next
+                best endpoint if the first has not answered after this many
+                milliseconds. None disables hedging.
+            request_timeout (float): HTTP timeout in seconds for each endpoint.
+            max_in_flight (int): The most concurrent requests, as allowed by the network's
+                bulkhead. Each hedged read takes up to two threads, so the pool has room
+                for all of them and reads never queue behind each other (which would count
+                against `hedge_after_ms` and trigger needless hedges).
+
+        Raises:
+            ValueError: If no endpoints are given.
+        """
+        super().__init__()
+        if not endpoints:
+            raise ValueError("At least one RPC endpoint is required")
+
+        self.endpoints = [
+            RPCEndpointState(e["url"], e.get("weight", 1.0), request_timeout) for e in endpoints
+        ]
+        self.hedge_after = hedge_after_ms / 1000 if hedge_after_ms else None
+        self._executor = ThreadPoolExecutor(max_workers=2 * max_in_flight,
+                                            thread_name_prefix="rpc-hedge")
+
+
+    def __str__(self) -> str:
+        return f"FailoverHTTPProvider({len(self.endpoints)} endpoints)"
+
+
+    def ranked_endpoints(self) -> List[RPCEndpointState]:
+        """
+        Return the endpoints ordered by preference.
+
+        Available endpoints come first, ordered by score; endpoints cooling down are
+        kept as a last resort.
+        """
+        now = time.monotonic()
+        return sorted(self.endpoints, key=lambda e: (not e.is_available(now), e.score(now)))
+
+
+    @staticmethod
+    def _call(endpoint: RPCEndpointState, method: RPCEndpoint, params: Any) -> RPCResponse:
+        """Send a request to one endpoint and record its latency or failure."""
+        start = time.monotonic()
+        try:
+            response = endpoint.provider.make_request(method, params)
+        except OSError:
+            endpoint.record_failure(time.monotonic())
+            raise
+        endpoint.record_success(time.monotonic() - start)
+        return response
+
+
+    def _hedged_call(self, ranked: List[RPCEndpointState], method: RPCEndpoint,
+                     params: Any) -> RPCResponse:
+        """
+        Send a read request to the best endpoint, and also to the next one if it is slow.
+
+        Returns:
+            RPCResponse: The first successful response.
+        """
+        primary = self._executor.submit(self._call, ranked[0], method, params)
+        done, _ = wait([primary], timeout=self.hedge_after)
+        if done:
+            try:
+                return primary.result()
+            except OSError as e:
+                return self._failover_call(ranked[1:], method, params, e)
+
+        LOGGER.debug("Hedging %s to %s", method, ranked[1].url)
+        pending = {primary, self._executor.submit(self._call, ranked[1], method, params)}
+        last_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except OSError as e:
+                    last_error = e
+
+        # Both hedged attempts failed, fall back to the remaining endpoints
+        return self._failover_call(ranked[2:], method, params, last_error)
+
+
+    def _failover_call(self, ranked: List[RPCEndpointState], method: RPCEndpoint,
+                       params: Any, last_error: Optional[Exception] = None) -> RPCResponse:
+        """
+        Try endpoints in order until one answers.
+
+        Raises:
+            ConnectionError: If every endpoint fails.
+        """
+        for endpoint in ranked:
+            try:
+                return self._call(endpoint, method, params)
+            except OSError as e:
+                LOGGER.warning("RPC endpoint failed for %s, failing over: %s", method, e)
+                last_error = e
+
+        raise ConnectionError(f"All RPC endpoints failed for {method}") from last_error
+
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        ranked = self.ranked_endpoints()
+        if self.hedge_after is not None and method in HEDGEABLE_METHODS and len(ranked) > 1:
+            return self._hedged_call(ranked, method, params)
+        return self._failover_call(ranked, method, params)
+
+
+    def make_batch_request(self, batch_requests: List[tuple]) -> Any:
+        last_error = None
+        for endpoint in self.ranked_endpoints():
+            start = time.monotonic()
+            try:
+                response = endpoint.provider.make_batch_request(batch_requests)
+            except OSError as e:
+                endpoint.record_failure(time.monotonic())
+                LOGGER.warning("RPC endpoint failed for batch request, failing over: %s", e)
+                last_error = e
+                continue
+            endpoint.record_success(time.monotonic() - start)
+            return response
+
+        raise ConnectionError("All RPC endpoints failed for batch request") from last_error
+
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return any(e.provider.is_connected(show_traceback=show_traceback)
+                   for e in self.ranked_endpoints())
+
+
+class GuardedProvider(JSONBaseProvider):
+    """
+    Web3 provider that sends every request through a network's RPCGuard.
+    """
+
+    def __init__(self, provider: JSONBaseProvider, guard: RPCGuard):
+        """
+        Initialise the GuardedProvider.
+
+        Args:
+            provider (JSONBaseProvider): The provider doing the actual requests.
+            guard (RPCGuard): The guard of the provider's network.
+        """
+        super().__init__()
+        self.provider = provider
+        self.guard = guard
+
+
+    def __str__(self) -> str:
+        return f"GuardedProvider({self.provider})"
+
+
+    def _observed_call(self, method: str, func: Any, *args: Any) -> Any:
+        """
+        Run a guarded call and record its latency and outcome.
+
+        The outcome is `ok`, `error` for a JSON-RPC error response, `rejected` when the
+        guard refused the call, or `failed` for connection errors and timeouts.
+        """
+        network = self.guard.breaker.network_name
+        start = time.perf_counter()
+        outcome = "failed"
+        span_attributes = {"rpc.system": "jsonrpc", "rpc.method": method, "network": network}
+        try:
+            with start_span(f"rpc {method}", KIND_CLIENT, span_attributes) as span:
+                response = self.guard.call(func, *args)
+                outcome = "error" if isinstance(response, dict) and "error" in response else "ok"
+                span.set_attribute("rpc.outcome", outcome)
+            return response
+        except RPCUnavailableError:
+            outcome = "rejected"
+            raise
+        finally:
+            RPC_REQUESTS.inc(network=network, method=method, outcome=outcome)
+            if outcome != "rejected":
+                RPC_REQUEST_SECONDS.observe(time.perf_counter() - start,
+                                            network=network, method=method)
+
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        return self._observed_call(method, self.provider.make_request, method, params)
+
+
+    def make_batch_request(self, batch_requests: List[tuple]) -> Any:
+        return self._observed_call("batch", self.provider.make_batch_request, batch_requests)
+
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        def check() -> bool:
+            if not self.provider.is_connected(show_traceback=show_traceback):
+                raise ConnectionError("Node did not respond to web3_clientVersion")
+            return True
+
+        try:
+            return self.guard.call(check)
+        except ConnectionError:
+            return False
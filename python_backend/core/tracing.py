@@ -0,0 +1,539 @@
+'''
+tracing.py
+
+This module provides lightweight distributed tracing. A span is opened for every API
+request, with child spans for JSON-RPC calls, database queries, transaction signing
+and Solidity compilation, so the time of a request can be broken down end to end.
+The current span is kept in a context variable, so nested calls find their parent
+without it being passed around.
+
+Finished spans are exported in batches from a background thread, either as JSON lines
+to a local file for offline analysis, or to an OpenTelemetry collector with OTLP/HTTP
+(JSON encoding). Incoming W3C `traceparent` headers continue the caller's trace.
+Tracing is configured by the `[tracing]` section and costs almost nothing when off.
+'''
+import contextvars
+import json
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.logger_config import LOGGER
+
+# Span kinds, numbered as in OTLP
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+# Spans waiting for export; further spans are dropped while the queue is full
+MAX_QUEUE_SIZE = 2048
+MAX_BATCH_SIZE = 256
+FLUSH_INTERVAL_SECONDS = 5.0
+
+_CURRENT_SPAN: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class SpanContext:
+    """
+    Identifies a span within a trace.
+    """
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool = True):
+        """
+        Initialise the SpanContext.
+
+        Args:
+            trace_id (str): 32 hex characters shared by every span of the trace.
+            span_id (str): 16 hex characters identifying the span.
+            sampled (bool): Whether the spans of this trace are recorded.
+        """
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+
+    def to_traceparent(self) -> str:
+        """Return the context as a W3C `traceparent` header value."""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+    @classmethod
+    def from_traceparent(cls, header: Optional[str]) -> Optional["SpanContext"]:
+        """
+        Parse a W3C `traceparent` header.
+
+        Args:
+            header (Optional[str]): The header value.
+
+        Returns:
+            Optional[SpanContext]: The remote parent, or None if the header is missing
+                or malformed.
+        """
+        parts = (header or "").strip().split("-")
+        if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+            return None
+        try:
+            flags = int(parts[3], 16)
+            if int(parts[1], 16) == 0 or int(parts[2], 16) == 0:
+                return None
+        except ValueError:
+            return None
+        return cls(parts[1].lower(), parts[2].lower(), bool(flags & 1))
+
+
+class Span:
+    """
+    A timed operation with attributes, events and links to other spans.
+    """
+
+    def __init__(self, tracer: "Tracer", name: str, context: SpanContext,
+                 parent_id: Optional[str] = None, kind: int = KIND_INTERNAL,
+                 attributes: Optional[Dict[str, Any]] = None,
+                 links: Optional[List[SpanContext]] = None):
+        """
+        Initialise the Span.
+
+        Args:
+            tracer (Tracer): The tracer exporting the span when it ends.
+            name (str): The operation name.
+            context (SpanContext): The identifiers of the span.
+            parent_id (Optional[str]): The span id of the parent, if any.
+            kind (int): One of the KIND_* constants.
+            attributes (Optional[Dict[str, Any]]): Initial attributes.
+            links (Optional[List[SpanContext]]): Related spans of other traces.
+        """
+        self.tracer = tracer
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.links = list(links or [])
+        self.events: List[dict] = []
+        self.status = "unset"
+        self.status_message = ""
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+
+    @property
+    def is_recording(self) -> bool:
+        """Return True if the span will be exported."""
+        return True
+
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute of the span."""
+        self.attributes[key] = value
+
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        """Record a point in time within the span."""
+        self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": attributes})
+
+
+    def add_link(self, context: Optional[SpanContext]) -> None:
+        """Link the span to a span of another trace, e.g. the request that caused it."""
+        if context is not None:
+            self.links.append(context)
+
+
+    def record_exception(self, error: BaseException) -> None:
+        """Mark the span as failed by an exception."""
+        self.status = "error"
+        self.status_message = f"{type(error).__name__}: {error}"
+        self.add_event("exception", type=type(error).__name__, message=str(error))
+
+
+    def end(self) -> None:
+        """Finish the span and hand it to the exporters."""
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.tracer.on_end(self)
+
+
+    def to_dict(self) -> dict:
+        """Return the span as a JSON-serialisable dict."""
+        end_ns = self.end_ns or time.time_ns()
+        return {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": end_ns,
+            "duration_ms": (end_ns - self.start_ns) / 1e6,
+            "attributes": self.attributes,
+            "events": self.events,
+            "links": [{"trace_id": link.trace_id, "span_id": link.span_id} for link in self.links],
+            "status": self.status,
+            "status_message": self.status_message,
+        }
+
+
+class NonRecordingSpan(Span):
+    """
+    A span that carries its context to children but records and exports nothing.
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, context: Optional[SpanContext] = None):
+        # Skips Span.__init__; nothing but the context is ever read
+        self.context = context or SpanContext("0" * 32, "0" * 16, sampled=False)
+
+
+    @property
+    def is_recording(self) -> bool:
+        return False
+
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        pass
+
+
+    def add_link(self, context: Optional[SpanContext]) -> None:
+        pass
+
+
+    def record_exception(self, error: BaseException) -> None:
+        pass
+
+
+    def end(self) -> None:
+        pass
+
+
+NOOP_SPAN = NonRecordingSpan()
+
+
+class SpanExporter:
+    """
+    Base class of the span exporters.
+    """
+
+    def export(self, spans: List[Span]) -> None:
+        """Send a batch of finished spans."""
+        raise NotImplementedError
+
+
+    def shutdown(self) -> None:
+        """Release resources held by the exporter."""
+
+
+class JsonLinesExporter(SpanExporter):
+    """
+    Appends each span as one JSON line to a local file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialise the JsonLinesExporter.
+
+        Args:
+            path (str): The file to append to.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+
+def _otlp_value(value: Any) -> dict:
+    """Encode an attribute value as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[dict]:
+    """Encode attributes as a list of OTLP KeyValues."""
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+class OTLPHttpExporter(SpanExporter):
+    """
+    Sends spans to an OpenTelemetry collector with OTLP/HTTP, using the JSON encoding.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, headers: Optional[dict] = None,
+                 timeout: float = 10.0):
+        """
+        Initialise the OTLPHttpExporter.
+
+        Args:
+            endpoint (str): The traces URL, e.g. `http://localhost:4318/v1/traces`.
+            service_name (str): The `service.name` resource attribute.
+            headers (Optional[dict]): Extra HTTP headers, e.g. for authentication.
+            timeout (float): HTTP timeout in seconds.
+        """
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.timeout = timeout
+
+
+    def encode(self, spans: List[Span]) -> dict:
+        """Return the OTLP `ExportTraceServiceRequest` for a batch of spans."""
+        encoded = []
+        for span in spans:
+            item = {
+                "traceId": span.context.trace_id,
+                "spanId": span.context.span_id,
+                "name": span.name,
+                "kind": span.kind,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                "attributes": _otlp_attributes(span.attributes),
+                "events": [{"name": event["name"], "timeUnixNano": str(event["time_ns"]),
+                            "attributes": _otlp_attributes(event["attributes"])}
+                           for event in span.events],
+                "links": [{"traceId": link.trace_id, "spanId": link.span_id}
+                          for link in span.links],
+                "status": {"code": 2 if span.status == "error" else 0,
+                           "message": span.status_message},
+            }
+            if span.parent_id:
+                item["parentSpanId"] = span.parent_id
+            encoded.append(item)
+
+        return {"resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+            "scopeSpans": [{"scope": {"name": "wildweb3"}, "spans": encoded}],
+        }]}
+
+
+    def export(self, spans: List[Span]) -> None:
+        body = json.dumps(self.encode(spans), default=str).encode("utf-8")
+        request = urllib.request.Request(self.endpoint, data=body, headers=self.headers,
+                                         method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class Tracer:
+    """
+    Creates spans and exports the finished ones in batches from a background thread.
+    """
+
+    def __init__(self, service_name: str = "wildweb3",
+                 exporters: Optional[List[SpanExporter]] = None, sample_ratio: float = 1.0,
+                 flush_interval: float = FLUSH_INTERVAL_SECONDS):
+        """
+        Initialise the Tracer.
+
+        Args:
+            service_name (str): The name reported for this service.
+            exporters (Optional[List[SpanExporter]]): Where finished spans go. Without
+                exporters the tracer is disabled and every span is a no-op.
+            sample_ratio (float): Fraction of new traces that are recorded.
+            flush_interval (float): Maximum seconds a finished span waits for export.
+        """
+        self.service_name = service_name
+        self.exporters = list(exporters or [])
+        self.sample_ratio = sample_ratio
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=MAX_QUEUE_SIZE)
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if spans are exported anywhere."""
+        return bool(self.exporters)
+
+
+    @staticmethod
+    def _new_id(bits: int) -> str:
+        return f"{random.getrandbits(bits) or 1:0{bits // 4}x}"
+
+
+    def create_span(self, name: str, kind: int = KIND_INTERNAL,
+                    attributes: Optional[Dict[str, Any]] = None,
+                    links: Optional[List[SpanContext]] = None,
+                    parent: Optional[SpanContext] = None) -> Span:
+        """
+        Create a span without making it current.
+
+        Args:
+            name (str): The operation name.
+            kind (int): One of the KIND_* constants.
+            attributes (Optional[Dict[str, Any]]): Initial attributes.
+            links (Optional[List[SpanContext]]): Related spans of other traces.
+            parent (Optional[SpanContext]): The parent; defaults to the current span.
+
+        Returns:
+            Span: The started span, or a non-recording span if the trace is not sampled.
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+
+        if parent is None:
+            current = _CURRENT_SPAN.get()
+            parent = current.context if current is not None else None
+
+        if parent is None:
+            sampled = self.sample_ratio >= 1.0 or random.random() < self.sample_ratio
+            context = SpanContext(self._new_id(128), self._new_id(64), sampled)
+        else:
+            context = SpanContext(parent.trace_id, self._new_id(64), parent.sampled)
+
+        if not context.sampled:
+            return NonRecordingSpan(context)
+        # Spans of unsampled traces are never exported, so there is nothing to link to
+        links = [link for link in links or [] if link is not None and link.sampled]
+        return Span(self, name, context, parent.span_id if parent else None, kind,
+                    attributes, links)
+
+
+    @contextmanager
+    def start_span(self, name: str, kind: int = KIND_INTERNAL,
+                   attributes: Optional[Dict[str, Any]] = None,
+                   links: Optional[List[SpanContext]] = None,
+                   parent: Optional[SpanContext] = None) -> Iterator[Span]:
+        """
+        Run the body of a `with` block in a new current span.
+
+        Exceptions raised by the body mark the span as failed and propagate.
+        """
+        span = self.create_span(name, kind, attributes, links, parent)
+        if span is NOOP_SPAN:
+            yield span
+            return
+
+        token = _CURRENT_SPAN.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _CURRENT_SPAN.reset(token)
+            span.end()
+
+
+    def on_end(self, span: Span) -> None:
+        """Queue a finished span for export, dropping it if the queue is full."""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="span-exporter",
+                                                daemon=True)
+                self._worker.start()
+
+
+    def _run(self) -> None:
+        """Export queued spans in batches until a None sentinel arrives."""
+        running = True
+        while running:
+            batch: List[Span] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < MAX_BATCH_SIZE:
+                try:
+                    span = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if span is None:
+                    running = False
+                    break
+                batch.append(span)
+            if batch:
+                self._export(batch)
+
+
+    def _export(self, batch: List[Span]) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(batch)
+            except Exception as e: # pylint: disable=broad-exception-caught
+                LOGGER.warning("Could not export %d spans with %s: %s",
+                               len(batch), type(exporter).__name__, e)
+
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Export the queued spans and stop the background thread."""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout)
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+_TRACER = Tracer()
+
+
+def configure_tracing(config: dict) -> Tracer:
+    """
+    Replace the shared tracer according to the `[tracing]` section.
+
+    Args:
+        config (dict): The configuration dictionary.
+
+    Returns:
+        Tracer: The shared tracer; disabled unless `enabled = true`.
+    """
+    global _TRACER  # pylint: disable=global-statement
+    settings = config.get("tracing", {})
+    exporters: List[SpanExporter] = []
+
+    if settings.get("enabled", False):
+        service_name = settings.get("service_name", "wildweb3")
+        if settings.get("exporter", "jsonl") == "otlp":
+            exporters.append(OTLPHttpExporter(
+                settings.get("otlp_endpoint", "http://localhost:4318/v1/traces"),
+                service_name, settings.get("otlp_headers")))
+        else:
+            exporters.append(JsonLinesExporter(settings.get("path", "traces.jsonl")))
+        LOGGER.info("Tracing enabled: %s exporter, sample ratio %s",
+                    settings.get("exporter", "jsonl"), settings.get("sample_ratio", 1.0))
+
+    _TRACER.shutdown(timeout=1.0)
+    _TRACER = Tracer(settings.get("service_name", "wildweb3"), exporters,
+                     float(settings.get("sample_ratio", 1.0)))
+    return _TRACER
+
+
+def get_tracer() -> Tracer:
+    """Return the shared tracer."""
+    return _TRACER
+
+
+def start_span(name: str, kind: int = KIND_INTERNAL,
+               attributes: Optional[Dict[str, Any]] = None,
+               links: Optional[List[SpanContext]] = None,
+               parent: Optional[SpanContext] = None):
+    """Open a span with the shared tracer; see `Tracer.start_span`."""
+    return _TRACER.start_span(name, kind, attributes, links, parent)
+
+
+def current_span() -> Span:
+    """Return the current span, or a non-recording span outside of any trace."""
+    return _CURRENT_SPAN.get() or NOOP_SPAN
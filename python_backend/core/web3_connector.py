@@ -5,8 +5,22 @@ This module provides the Web3Connector class, which facilitates connections to E
 using the Web3.py library. It allows for easy configuration and management of Web3 instances
 based on network details provided in a configuration dictionary.
 '''
-from web3 import Web3
+import threading
+from typing import TYPE_CHECKING
+from core.config import obscure_api_key
+from core.lazy_import import lazy_import
 from core.logger_config import LOGGER
+from core.rpc_guard import get_rpc_guard
+
+if TYPE_CHECKING:
+    from web3 import Web3
+
+# Loaded on the first connection, not when the API is imported
+web3 = lazy_import("web3")
+
+# Connectors shared across requests, keyed by network name and node URL
+_CONNECTORS = {}
+_CONNECTORS_LOCK = threading.Lock()
 
 class Web3Connector:
     """
@@ -24,7 +38,7 @@ class Web3Connector:
         self.w3 = self._connect()
 
 
-    def _connect(self) -> Web3:
+    def _connect(self) -> "Web3":
         """
         Establish a connection to the Ethereum network.
 
@@ -33,21 +47,52 @@ class Web3Connector:
 
         Raises:
             ConnectionError: If unable to connect to the Ethereum node.
+            RPCUnavailableError: If the network's circuit breaker or bulkhead rejects
+                the connection check.
         """
+        # The providers subclass web3 classes, so they are only imported when needed
+        from core.rpc_router import FailoverHTTPProvider, GuardedProvider # pylint: disable=C0415
+
+        endpoints = self.network_config.get("endpoints")
+        if endpoints:
+            guard = get_rpc_guard(self.network_config)
+            provider = FailoverHTTPProvider(
+                endpoints,
+                hedge_after_ms=self.network_config.get("hedge_after_ms"),
+                request_timeout=self.network_config.get("request_timeout", 10),
+                max_in_flight=guard.bulkhead.max_in_flight,
+            )
+            w3 = web3.Web3(GuardedProvider(provider, guard))
+
+            if not w3.is_connected():
+                raise ConnectionError(
+                    f"Failed to connect to any of the {len(endpoints)} Ethereum nodes "
+                    f"for {self.network_config.get('name')}"
+                )
+
+            LOGGER.info("Connected to Ethereum nodes: %s",
+                        ", ".join(obscure_api_key(e["url"]) for e in endpoints))
+            return w3
+
         node_url = self.network_config.get("url")
         if not node_url:
             raise ValueError("Node URL is missing in network configuration")
 
-        w3 = Web3(Web3.HTTPProvider(node_url))
+        provider = web3.HTTPProvider(
+            node_url, request_kwargs={"timeout": self.network_config.get("request_timeout", 10)}
+        )
+        w3 = web3.Web3(GuardedProvider(provider, get_rpc_guard(self.network_config)))
 
         if not w3.is_connected():
-            raise ConnectionError(f"Failed to connect to the Ethereum node at {node_url}")
+            raise ConnectionError(
+                f"Failed to connect to the Ethereum node at {obscure_api_key(node_url)}"
+            )
 
-        LOGGER.info("Connected to Ethereum node: %s", node_url)
+        LOGGER.info("Connected to Ethereum node: %s", obscure_api_key(node_url))
         return w3
 
 
-    def get_web3(self) -> Web3:
+    def get_web3(self) -> "Web3":
         """Return the connected Web3 instance."""
         return self.w3
 
@@ -55,3 +100,24 @@ class Web3Connector:
     def get_network_config(self) -> dict:
         """Return the network configuration."""
         return self.network_config
+
+
+def get_web3_connector(network_config: dict) -> Web3Connector:
+    """
+    Return a shared Web3Connector for a network, connecting on first use.
+
+    Args:
+        network_config (dict): A dictionary containing network connection details.
+
+    Returns:
+        Web3Connector: The connector shared by all services using this network.
+    """
+    key = (network_config.get("name"), network_config.get("url"),
+           tuple(e["url"] for e in network_config.get("endpoints", [])))
+    connector = _CONNECTORS.get(key)
+    if connector is None:
+        # Connect outside the lock so a slow node does not block other networks
+        connector = Web3Connector(network_config)
+        with _CONNECTORS_LOCK:
+            connector = _CONNECTORS.setdefault(key, connector)
+    return connector
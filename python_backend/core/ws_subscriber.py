@@ -0,0 +1,412 @@
+'''
+ws_subscriber.py
+
+This module provides the BlockSubscriber class, which keeps a persistent WebSocket
+JSON-RPC connection to a network's node, subscribes to `newHeads` and to the logs of
+tracked contracts, and publishes them on the internal event bus. Dropped connections
+are re-established with exponential backoff, and blocks (and logs) missed while
+disconnected are backfilled so that subscribers see every head exactly in order.
+
+A head whose parent is not the last published block means the chain was reorganised.
+The subscriber walks back to the last block both chains share, publishes a `reorg`
+event for the replaced blocks, and republishes the canonical blocks from there.
+
+Events published on the bus:
+    ("new_head", network): {"network", "number", "hash", "timestamp", "backfilled"}
+    ("reorg", network):    {"network", "common_ancestor", "depth", "removed", "new_head"}
+    ("log", network):      {"network", "address", "block_number", "transaction_hash",
+                            "log_index", "topics", "data", "removed"}
+'''
+import asyncio
+import itertools
+import json
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+import websockets
+from websockets.exceptions import WebSocketException
+
+from core.config import obscure_api_key
+from core.event_bus import EVENT_BUS, EventBus
+from core.logger_config import LOGGER
+
+
+class BlockSubscriber:
+    """
+    Streams new block headers and contract logs for one network onto the event bus.
+    """
+
+    def __init__(self, network_name: str, ws_url: str, bus: EventBus = EVENT_BUS,
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0,
+                 max_backfill: int = 128, request_timeout: float = 10.0):
+        """
+        Initialise the BlockSubscriber.
+
+        Args:
+            network_name (str): The network name used in bus topics.
+            ws_url (str): The WebSocket JSON-RPC endpoint.
+            bus (EventBus): The bus to publish on.
+            reconnect_delay (float): Initial delay before reconnecting.
+            max_reconnect_delay (float): Upper bound of the reconnect backoff.
+            max_backfill (int): The maximum number of missed blocks to backfill.
+            request_timeout (float): Timeout for JSON-RPC requests over the socket.
+        """
+        self.network_name = network_name
+        self.ws_url = ws_url
+        self.bus = bus
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_backfill = max_backfill
+        self.request_timeout = request_timeout
+
+        self.last_block: Optional[int] = None
+        self.connected = threading.Event()
+        # Hashes of the recently published blocks, by number, to detect reorgs
+        self._hashes: Dict[int, str] = {}
+        # Added to by request threads, read by the event loop
+        self._tracked: Set[str] = set()
+        self._tracked_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._subscriptions: Dict[str, str] = {}
+        self._logs_subscription: Optional[str] = None
+        self._logs_addresses: List[str] = []
+        self._ws = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+
+    # ------------------------------------------------------------------------------
+    # Lifecycle
+
+    def start(self) -> None:
+        """Start the subscriber in a background thread with its own event loop."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True,
+                                        name=f"ws-{self.network_name}")
+        self._thread.start()
+
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the subscriber and wait for its thread to exit."""
+        self._stopped.set()
+        if self._loop and self._task:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread:
+            self._thread.join(timeout)
+
+
+    def track_contract(self, address: str) -> None:
+        """
+        Start streaming the logs of a contract.
+
+        Args:
+            address (str): The contract address.
+        """
+        address = address.lower()
+        with self._tracked_lock:
+            if address in self._tracked:
+                return
+            self._tracked.add(address)
+        if self._loop and self.connected.is_set():
+            asyncio.run_coroutine_threadsafe(self._subscribe_logs(), self._loop)
+
+
+    def _run_loop(self) -> None:
+        """Thread target: run the reconnect loop until stopped."""
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._task = self._loop.create_task(self._run())
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+
+    async def _run(self) -> None:
+        """Connect, run a session, and reconnect with backoff when it drops."""
+        delay = self.reconnect_delay
+        while not self._stopped.is_set():
+            try:
+                async with websockets.connect(self.ws_url) as ws:
+                    LOGGER.info("WebSocket connected for %s: %s",
+                                self.network_name, obscure_api_key(self.ws_url))
+                    delay = self.reconnect_delay
+                    await self._session(ws)
+            except (OSError, WebSocketException, asyncio.TimeoutError) as e:
+                LOGGER.warning("WebSocket for %s dropped: %s", self.network_name, e)
+            finally:
+                self.connected.clear()
+
+            if self._stopped.is_set():
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+
+    # ------------------------------------------------------------------------------
+    # Session
+
+    async def _session(self, ws) -> None:
+        """Subscribe, backfill what was missed, then stream notifications."""
+        self._ws = ws
+        self._subscriptions = {}
+        self._logs_subscription = None
+        self._logs_addresses = []
+        queue: asyncio.Queue = asyncio.Queue()
+        reader = asyncio.create_task(self._reader(ws, queue))
+        processor = None
+        try:
+            heads_subscription = await self._request("eth_subscribe", ["newHeads"])
+            self._subscriptions[heads_subscription] = "new_head"
+            if self._tracked_addresses():
+                await self._subscribe_logs()
+
+            if self.last_block is not None:
+                head = int(await self._request("eth_blockNumber", []), 16)
+                await self._backfill(head)
+
+            self.connected.set()
+            # Contracts tracked while connecting were not seen by track_contract
+            if self._tracked_addresses() != self._logs_addresses:
+                await self._subscribe_logs()
+            processor = asyncio.create_task(self._processor(queue))
+            done, _ = await asyncio.wait({reader, processor}, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        finally:
+            for task in (reader, processor):
+                if task:
+                    task.cancel()
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("WebSocket closed"))
+            self._pending = {}
+            self._ws = None
+
+
+    async def _reader(self, ws, queue: asyncio.Queue) -> None:
+        """Dispatch responses to waiting requests and notifications to the queue."""
+        async for raw in ws:
+            message = json.loads(raw)
+            if message.get("method") == "eth_subscription":
+                queue.put_nowait(message["params"])
+                continue
+
+            future = self._pending.pop(message.get("id"), None)
+            if future and not future.done():
+                if "error" in message:
+                    future.set_exception(ValueError(message["error"]))
+                else:
+                    future.set_result(message.get("result"))
+        raise ConnectionError("WebSocket closed by the node")
+
+
+    async def _processor(self, queue: asyncio.Queue) -> None:
+        """Handle subscription notifications in order."""
+        while True:
+            params = await queue.get()
+            kind = self._subscriptions.get(params.get("subscription"))
+            result = params.get("result", {})
+            if kind == "new_head":
+                number = int(result["number"], 16)
+                if self.last_block is not None and number > self.last_block + 1:
+                    await self._backfill(number - 1)
+                if self._is_reorg(result):
+                    await self._rewind(result)
+                if self.last_block is None or number > self.last_block:
+                    self._publish_head(result, backfilled=False)
+            elif kind == "logs":
+                self._publish_log(result)
+
+
+    async def _request(self, method: str, params: List[Any]) -> Any:
+        """Send a JSON-RPC request over the socket and wait for its response."""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._ws.send(json.dumps(
+                {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+            ))
+        except BaseException:
+            # Nobody will wait for the response of a request that was never sent
+            self._pending.pop(request_id, None)
+            raise
+        return await asyncio.wait_for(future, self.request_timeout)
+
+
+    async def _subscribe_logs(self) -> None:
+        """(Re)subscribe to the logs of all tracked contracts."""
+        previous = self._logs_subscription
+        addresses = self._tracked_addresses()
+        subscription = await self._request("eth_subscribe", ["logs", {"address": addresses}])
+        self._logs_addresses = addresses
+        self._subscriptions[subscription] = "logs"
+        self._logs_subscription = subscription
+        if previous:
+            self._subscriptions.pop(previous, None)
+            await self._request("eth_unsubscribe", [previous])
+
+
+    async def _backfill(self, up_to: int) -> None:
+        """
+        Publish the blocks (and tracked logs) after `last_block` up to `up_to`.
+
+        Args:
+            up_to (int): The last block number to backfill.
+        """
+        if self.last_block is None or up_to <= self.last_block:
+            return
+
+        start = max(self.last_block + 1, up_to - self.max_backfill + 1)
+        if start > self.last_block + 1:
+            LOGGER.warning("Missed %d blocks on %s, backfilling the last %d",
+                           up_to - self.last_block, self.network_name, self.max_backfill)
+        LOGGER.info("Backfilling blocks %d-%d on %s", start, up_to, self.network_name)
+
+        logs = []
+        tracked = self._tracked_addresses()
+        if tracked:
+            logs = await self._request("eth_getLogs", [{
+                "fromBlock": hex(start), "toBlock": hex(up_to), "address": tracked,
+            }])
+
+        for number in range(start, up_to + 1):
+            block = await self._request("eth_getBlockByNumber", [hex(number), False])
+            if block is None:
+                break
+            if self._is_reorg(block):
+                await self._rewind(block)
+            for log in logs:
+                if int(log["blockNumber"], 16) == number:
+                    self._publish_log(log)
+            self._publish_head(block, backfilled=True)
+
+
+    def _tracked_addresses(self) -> List[str]:
+        """Return the tracked contract addresses, sorted."""
+        with self._tracked_lock:
+            return sorted(self._tracked)
+
+
+    def _is_reorg(self, header: dict) -> bool:
+        """Return True if a header replaces published blocks instead of extending them."""
+        if self.last_block is None:
+            return False
+        number = int(header["number"], 16)
+        if number <= self.last_block:
+            # The same block notified twice is not a reorg
+            return self._hashes.get(number) != header.get("hash")
+        known_parent = self._hashes.get(number - 1)
+        return known_parent is not None and header.get("parentHash") not in (None, known_parent)
+
+
+    async def _rewind(self, header: dict) -> None:
+        """
+        Roll back to the last block shared with the chain of `header`.
+
+        Publishes a `reorg` event for the published blocks that were replaced, then the
+        canonical blocks between the shared block and `header` (which the caller publishes).
+
+        Args:
+            header (dict): The head that does not extend the last published block.
+        """
+        number = int(header["number"], 16)
+        ancestor, parent_hash = number - 1, header.get("parentHash")
+        canonical = []
+        while ancestor in self._hashes and self._hashes[ancestor] != parent_hash and \
+                len(canonical) < self.max_backfill:
+            block = await self._request("eth_getBlockByNumber", [hex(ancestor), False])
+            if block is None:
+                break
+            canonical.append(block)
+            parent_hash = block.get("parentHash")
+            ancestor -= 1
+
+        removed = [self._hashes.pop(n) for n in sorted(self._hashes) if n > ancestor]
+        LOGGER.warning("Reorg on %s: %d blocks replaced after block %d",
+                       self.network_name, len(removed), ancestor)
+        self.bus.publish(("reorg", self.network_name), {
+            "network": self.network_name,
+            "common_ancestor": ancestor,
+            "depth": len(removed),
+            "removed": removed,
+            "new_head": number,
+        })
+        self.last_block = ancestor
+        for block in reversed(canonical):
+            self._publish_head(block, backfilled=True)
+
+
+    # ------------------------------------------------------------------------------
+    # Publishing
+
+    def _publish_head(self, header: dict, backfilled: bool) -> None:
+        """Publish a block header on the bus and remember it as the last seen block."""
+        number = int(header["number"], 16)
+        self.last_block = number
+        self._hashes[number] = header.get("hash")
+        for old in [n for n in self._hashes if n <= number - self.max_backfill]:
+            del self._hashes[old]
+        self.bus.publish(("new_head", self.network_name), {
+            "network": self.network_name,
+            "number": number,
+            "hash": header.get("hash"),
+            "timestamp": int(header.get("timestamp", "0x0"), 16),
+            "backfilled": backfilled,
+        })
+
+
+    def _publish_log(self, log: dict) -> None:
+        """Publish a contract log on the bus."""
+        self.bus.publish(("log", self.network_name), {
+            "network": self.network_name,
+            "address": log.get("address", "").lower(),
+            "block_number": int(log.get("blockNumber", "0x0"), 16),
+            "transaction_hash": log.get("transactionHash"),
+            "log_index": int(log.get("logIndex", "0x0"), 16),
+            "topics": log.get("topics", []),
+            "data": log.get("data"),
+            "removed": log.get("removed", False),
+        })
+
+
+_SUBSCRIBERS: Dict[str, BlockSubscriber] = {}
+
+
+def start_block_subscribers(config: dict, bus: EventBus = EVENT_BUS) -> List[BlockSubscriber]:
+    """
+    Start a BlockSubscriber for every network that configures a `ws_url`.
+
+    Args:
+        config (dict): The configuration dictionary.
+        bus (EventBus): The bus to publish on.
+
+    Returns:
+        List[BlockSubscriber]: The started subscribers.
+    """
+    for name, network in config.get("networks", {}).items():
+        ws_url = network.get("ws_url")
+        if ws_url and name not in _SUBSCRIBERS:
+            subscriber = BlockSubscriber(name, ws_url, bus)
+            subscriber.start()
+            _SUBSCRIBERS[name] = subscriber
+    return list(_SUBSCRIBERS.values())
+
+
+def stop_block_subscribers() -> None:
+    """Stop all running BlockSubscribers."""
+    for subscriber in _SUBSCRIBERS.values():
+        subscriber.stop()
+    _SUBSCRIBERS.clear()
+
+
+def get_block_subscriber(network_name: str) -> Optional[BlockSubscriber]:
+    """Return the running BlockSubscriber of a network, if it has one."""
+    return _SUBSCRIBERS.get(network_name)
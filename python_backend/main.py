@@ -2,14 +2,134 @@
 WildWeb3 Python Backend main module.
 
 This module contains the entry point for running the WildWeb3 Python backend server.
+With `[api_server] workers` above 1 it runs in production mode: several worker
+processes, forked from a master that has already loaded the configuration and
+built the shared state (gunicorn with `preload_app`), or uvicorn's own worker
+supervisor when gunicorn is not installed.
 """
 
 import argparse
-from typing import Dict, Union
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple, Union
 import uvicorn
 
 from core.config import load_config
-from api.app import create_app
+from core.logger_config import LOGGER
+from api.app import create_app, CONFIG_ENV_VAR
+
+# Seconds a worker gets to finish in-flight requests on shutdown or reload
+GRACEFUL_TIMEOUT = 30
+
+
+def worker_count(config: Dict[str, Union[str, int, bool]]) -> int:
+    """
+    Return the number of worker processes to run.
+
+    Args:
+        config (dict): The configuration dictionary.
+
+    Returns:
+        int: `[api_server] workers`, or one per CPU when it is 0 or "auto".
+    """
+    workers = config["api_server"].get("workers", 1)
+    if workers in (0, "auto"):
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def run_production_server(config: Dict[str, Union[str, int, bool]], workers: int) -> None:
+    """
+    Run several worker processes behind one listening socket.
+
+    With gunicorn, the app is created once in the master process and the workers are
+    forked from it, so configuration loading, environment resolution, the account
+    keyring and the ABI index are built only once. `kill -HUP <master>` replaces the
+    workers gracefully, but they are forked from the same preloaded app, so a
+    configuration change needs a full restart.
+
+    Args:
+        config (dict): The configuration dictionary.
+        workers (int): The number of worker processes.
+    """
+    server = config["api_server"]
+    try:
+        from gunicorn.app.base import BaseApplication  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        BaseApplication = None  # pylint: disable=invalid-name
+
+    if BaseApplication is None:
+        # Each worker builds its own app from the configuration file
+        LOGGER.warning("gunicorn is not installed; starting %d uvicorn workers without preload",
+                       workers)
+        uvicorn.run(
+            "api.app:create_app_from_env",
+            factory=True,
+            host=server["host"],
+            port=server["port"],
+            log_level=server["log_level"],
+            workers=workers,
+            timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+        )
+        return
+
+    class PreloadedApplication(BaseApplication):  # pylint: disable=abstract-method
+        """Gunicorn application serving an app created before the workers fork."""
+
+        def __init__(self):
+            self.application = create_app(config, preload=True)
+            super().__init__()
+
+        def load_config(self):
+            self.cfg.set("bind", f"{server['host']}:{server['port']}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", "uvicorn.workers.UvicornWorker")
+            self.cfg.set("preload_app", True)
+            self.cfg.set("graceful_timeout", GRACEFUL_TIMEOUT)
+            self.cfg.set("loglevel", server["log_level"])
+
+        def load(self):
+            return self.application
+
+    LOGGER.info("Starting %d preloaded workers on %s:%s", workers, server["host"], server["port"])
+    PreloadedApplication().run()
+
+
+def profile_imports(module: str = "api.app", top: int = 25) -> List[Tuple[str, float, float]]:
+    """
+    Measure how long importing a module takes, like `python -X importtime`.
+
+    The import runs in a fresh interpreter so that nothing is already loaded.
+
+    Args:
+        module (str): The module to import.
+        top (int): How many of the slowest imports to print.
+
+    Returns:
+        List[Tuple[str, float, float]]: `(module, self ms, cumulative ms)` for every
+            imported module, slowest cumulative time first.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=False,
+    )
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        timings.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    timings.sort(key=lambda timing: timing[2], reverse=True)
+
+    if result.returncode != 0:
+        print(result.stderr.splitlines()[-1] if result.stderr else "Import failed")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_ms, cumulative_ms in timings[:top]:
+        print(f"{cumulative_ms:>14.1f} {self_ms:>9.1f}  {name}")
+    return timings
 
 
 def run_webserver(config: Dict[str, Union[str, int, bool]]) -> None:
@@ -19,6 +139,10 @@ def run_webserver(config: Dict[str, Union[str, int, bool]]) -> None:
     Args:
         config (dict): The configuration dictionary for the web server.
     """
+    workers = worker_count(config)
+    if workers > 1 and not config["api_server"]["reload"]:
+        run_production_server(config, workers)
+        return
 
     server_config = uvicorn.Config(
         app=create_app(config),
@@ -39,8 +163,9 @@ def main(config_file: str) -> None:
     Args:
         config_file (str): The path to the configuration file.
     """
-    # Load the configuration
+    # Load the configuration; worker processes that cannot inherit it reload it from here
     config = load_config(config_file)
+    os.environ[CONFIG_ENV_VAR] = os.path.abspath(config_file)
 
     # Run the web server
     run_webserver(config)
@@ -55,8 +180,17 @@ if __name__ == "__main__":
         default="../data/config.toml",
         help="Path to the configuration file"
     )
+    parser.add_argument(
+        "--profile-imports",
+        action="store_true",
+        help="Print the slowest imports of the API and exit"
+    )
 
     args = parser.parse_args()
+    if args.profile_imports:
+        profile_imports()
+        sys.exit(0)
+
     print("Welcome to WildWeb3 python backend")
 
     main(args.config)
@@ -0,0 +1,441 @@
+'''
+Module: abi_codec
+
+This module turns a contract ABI into reusable codecs: for every function the
+4-byte selector is computed and the eth_abi tuple encoder/decoder for its inputs and
+outputs is built once, so encoding a call or decoding its result is a plain function
+call instead of web3's per-call ABI lookup and type parsing. Events get the same
+treatment, keyed by their topic. Codecs are cached per compiled artifact and rebuilt
+when the artifact changes.
+
+`AbiIndex` gathers the codecs of every artifact in `BUILD_PATH`, so calldata and logs
+can be decoded without knowing which contract they belong to.
+'''
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from eth_abi.decoding import ContextFramesBytesIO
+from eth_abi.exceptions import EncodingError
+from eth_abi.registry import registry
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector
+from eth_utils.abi import collapse_if_tuple
+from hexbytes import HexBytes
+
+from core.constants import BUILD_PATH
+from core.logger_config import LOGGER
+
+
+def _types(params: List[dict]) -> List[str]:
+    """Return the canonical ABI types of a list of parameters."""
+    return [collapse_if_tuple(param) for param in params]
+
+
+def normalize_arg(abi_type: str, value: Any) -> Any:
+    """
+    Convert a JSON value into what the eth_abi encoder expects for a type.
+
+    Hex strings become bytes for `bytes`/`bytesN`, numeric strings become integers
+    for `int`/`uint`, and arrays and tuples are converted element by element.
+
+    Args:
+        abi_type (str): The canonical ABI type.
+        value (Any): The JSON value.
+
+    Returns:
+        Any: The value to encode.
+    """
+    if abi_type.endswith("]"):
+        inner = abi_type[:abi_type.rindex("[")]
+        return [normalize_arg(inner, item) for item in value]
+    if abi_type.startswith("("):
+        inner_types = _split_tuple(abi_type)
+        return tuple(normalize_arg(t, v) for t, v in zip(inner_types, value))
+    if abi_type.startswith("bytes") and isinstance(value, str):
+        return bytes(HexBytes(value))
+    if abi_type.startswith(("int", "uint")) and isinstance(value, str):
+        return int(value, 0)
+    return value
+
+
+def _split_tuple(abi_type: str) -> List[str]:
+    """Split a canonical tuple type such as `(uint256,(bool,string))` into its members."""
+    members, depth, current = [], 0, ""
+    for char in abi_type[1:-1]:
+        if char == "," and depth == 0:
+            members.append(current)
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    if current:
+        members.append(current)
+    return members
+
+
+def to_json_value(value: Any) -> Any:
+    """
+    Convert a decoded ABI value into something JSON serialisable.
+
+    Args:
+        value (Any): The decoded value.
+
+    Returns:
+        Any: Bytes as 0x-prefixed hex, tuples as lists, everything else unchanged.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    if isinstance(value, (list, tuple)):
+        return [to_json_value(item) for item in value]
+    return value
+
+
+class FunctionCodec:
+    """
+    Precomputed selector, encoder and decoders of one ABI function.
+    """
+
+    def __init__(self, abi: dict):
+        """
+        Initialise the FunctionCodec.
+
+        Args:
+            abi (dict): The ABI entry of the function.
+        """
+        self.abi = abi
+        self.name = abi["name"]
+        self.input_types = _types(abi.get("inputs", []))
+        self.output_types = _types(abi.get("outputs", []))
+        self.output_names = [output.get("name", "") for output in abi.get("outputs", [])]
+        self.signature = f"{self.name}({','.join(self.input_types)})"
+        self.selector = function_abi_to_4byte_selector(abi)
+        self.state_mutability = abi.get("stateMutability", "nonpayable")
+        self._encoder = registry.get_tuple_encoder(*self.input_types)
+        self._input_decoder = registry.get_tuple_decoder(*self.input_types)
+        self._output_decoder = registry.get_tuple_decoder(*self.output_types)
+
+
+    @property
+    def read_only(self) -> bool:
+        """True for `view` and `pure` functions."""
+        return self.state_mutability in ("view", "pure")
+
+
+    def encode_input(self, args: List[Any]) -> bytes:
+        """
+        Encode a call to the function.
+
+        Args:
+            args (List[Any]): The positional arguments, as JSON values.
+
+        Returns:
+            bytes: The calldata (selector followed by the encoded arguments).
+
+        Raises:
+            ValueError: If the number of arguments is wrong or a value does not fit its type.
+        """
+        if len(args) != len(self.input_types):
+            raise ValueError(f"{self.signature} takes {len(self.input_types)} "
+                             f"arguments, got {len(args)}")
+        try:
+            values = tuple(normalize_arg(t, a) for t, a in zip(self.input_types, args))
+            return self.selector + self._encoder(values)
+        except (EncodingError, TypeError, ArithmeticError) as e:
+            raise ValueError(f"Invalid arguments for {self.signature}: {e}") from e
+
+
+    def decode_input(self, data: bytes) -> Tuple[Any, ...]:
+        """Decode the arguments of calldata (without the selector)."""
+        return self._input_decoder(ContextFramesBytesIO(data))
+
+
+    def decode_output(self, data: bytes) -> Tuple[Any, ...]:
+        """Decode the return data of a call."""
+        return self._output_decoder(ContextFramesBytesIO(data))
+
+
+class EventCodec:
+    """
+    Precomputed topic and decoders of one ABI event.
+    """
+
+    def __init__(self, abi: dict):
+        """
+        Initialise the EventCodec.
+
+        Args:
+            abi (dict): The ABI entry of the event.
+        """
+        self.abi = abi
+        self.name = abi["name"]
+        inputs = abi.get("inputs", [])
+        self.signature = f"{self.name}({','.join(_types(inputs))})"
+        self.topic = event_abi_to_log_topic(abi)
+        self._indexed = [(i.get("name", ""), collapse_if_tuple(i))
+                         for i in inputs if i.get("indexed")]
+        self._names = [i.get("name", "") for i in inputs]
+        self._data_names = [i.get("name", "") for i in inputs if not i.get("indexed")]
+        self._data_decoder = registry.get_tuple_decoder(
+            *_types([i for i in inputs if not i.get("indexed")])
+        )
+        self._topic_decoders = [registry.get_tuple_decoder(abi_type)
+                                for _, abi_type in self._indexed]
+
+
+    def decode_log(self, topics: List[bytes], data: bytes) -> Dict[str, Any]:
+        """
+        Decode the arguments of a log emitted by this event.
+
+        Indexed dynamic types (strings, bytes, arrays) are only available as their
+        keccak hash, which is returned as is.
+
+        Args:
+            topics (List[bytes]): The log topics, starting with the event topic.
+            data (bytes): The log data.
+
+        Returns:
+            Dict[str, Any]: The event arguments by name, in declaration order.
+        """
+        values = dict(zip(self._data_names, self._data_decoder(ContextFramesBytesIO(data))))
+        for (name, abi_type), decoder, topic in zip(self._indexed, self._topic_decoders,
+                                                   topics[1:]):
+            if abi_type in ("string", "bytes") or abi_type.endswith("]") or "(" in abi_type:
+                values[name] = topic
+            else:
+                values[name] = decoder(ContextFramesBytesIO(topic))[0]
+        return {name: values[name] for name in self._names}
+
+
+class ContractAbi:
+    """
+    The function and event codecs of one contract ABI, indexed by name, selector and topic.
+    """
+
+    def __init__(self, abi: List[dict]):
+        """
+        Initialise the ContractAbi.
+
+        Args:
+            abi (List[dict]): The contract ABI.
+        """
+        self.abi = abi
+        self.functions: Dict[str, List[FunctionCodec]] = {}
+        self.by_selector: Dict[bytes, FunctionCodec] = {}
+        self.events_by_topic: Dict[bytes, EventCodec] = {}
+        for entry in abi:
+            if entry.get("type") == "function":
+                codec = FunctionCodec(entry)
+                self.functions.setdefault(codec.name, []).append(codec)
+                self.by_selector[codec.selector] = codec
+            elif entry.get("type") == "event" and not entry.get("anonymous"):
+                event = EventCodec(entry)
+                self.events_by_topic[event.topic] = event
+
+
+    def function(self, name: str, arg_count: int) -> FunctionCodec:
+        """
+        Return the codec of a function, resolving overloads by argument count.
+
+        Args:
+            name (str): The function name.
+            arg_count (int): The number of arguments of the call.
+
+        Returns:
+            FunctionCodec: The matching function.
+
+        Raises:
+            ValueError: If the function does not exist or the overload is ambiguous.
+        """
+        overloads = self.functions.get(name)
+        if not overloads:
+            raise ValueError(f"Function '{name}' not found in the ABI")
+        if len(overloads) == 1:
+            return overloads[0]
+
+        matches = [codec for codec in overloads if len(codec.input_types) == arg_count]
+        if len(matches) != 1:
+            raise ValueError(f"Cannot resolve overloaded function '{name}' "
+                             f"with {arg_count} arguments")
+        return matches[0]
+
+
+_ABIS: Dict[str, Tuple[float, ContractAbi]] = {}
+_ABIS_LOCK = threading.Lock()
+
+
+def load_contract_abi(contract_name: str, build_path: Optional[str] = None) -> ContractAbi:
+    """
+    Return the codecs of a compiled contract, rebuilding them when the artifact changes.
+
+    Args:
+        contract_name (str): The base name of the compiled artifact.
+        build_path (Optional[str]): The directory holding the artifacts. Defaults to BUILD_PATH.
+
+    Returns:
+        ContractAbi: The contract codecs.
+
+    Raises:
+        FileNotFoundError: If the contract has not been compiled.
+        ValueError: If the contract name is not a plain file name.
+    """
+    if not contract_name or os.path.basename(contract_name) != contract_name:
+        raise ValueError(f"Invalid contract name '{contract_name}'")
+    abi_path = os.path.join(build_path or BUILD_PATH, f"{contract_name}ABI.json")
+    mtime = os.path.getmtime(abi_path)
+    with _ABIS_LOCK:
+        cached = _ABIS.get(abi_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+    with open(abi_path, "r", encoding="utf-8") as abi_file:
+        contract_abi = ContractAbi(json.load(abi_file))
+
+    with _ABIS_LOCK:
+        _ABIS[abi_path] = (mtime, contract_abi)
+    return contract_abi
+
+
+class AbiIndex:
+    """
+    Selector and topic lookup across every compiled artifact in the build directory.
+    """
+
+    def __init__(self, build_path: Optional[str] = None):
+        """
+        Initialise the AbiIndex.
+
+        Args:
+            build_path (Optional[str]): The directory holding the artifacts. Defaults to BUILD_PATH.
+        """
+        self.build_path = build_path or BUILD_PATH
+        self.contracts: Dict[str, ContractAbi] = {}
+        self.selectors: Dict[bytes, List[Tuple[str, FunctionCodec]]] = {}
+        self.topics: Dict[bytes, List[Tuple[str, EventCodec]]] = {}
+        self._version: Optional[Tuple] = None
+        self._lock = threading.Lock()
+
+
+    def artifacts(self) -> Dict[str, float]:
+        """Return the modification time of every ABI artifact, by contract name."""
+        artifacts = {}
+        try:
+            with os.scandir(self.build_path) as entries:
+                for entry in entries:
+                    if entry.name.endswith("ABI.json") and entry.is_file():
+                        artifacts[entry.name[:-len("ABI.json")]] = entry.stat().st_mtime
+        except FileNotFoundError:
+            pass
+        return artifacts
+
+
+    def refresh(self) -> None:
+        """Rebuild the lookup tables if an artifact was added, removed or recompiled."""
+        artifacts = self.artifacts()
+        version = tuple(sorted(artifacts.items()))
+        if version == self._version:
+            return
+
+        with self._lock:
+            if version == self._version:
+                return
+            contracts, selectors, topics = {}, {}, {}
+            for name in artifacts:
+                try:
+                    contract_abi = load_contract_abi(name, self.build_path)
+                except (OSError, ValueError) as e:
+                    LOGGER.warning("Skipping ABI artifact %s: %s", name, e)
+                    continue
+                contracts[name] = contract_abi
+                for selector, codec in contract_abi.by_selector.items():
+                    selectors.setdefault(selector, []).append((name, codec))
+                for topic, event in contract_abi.events_by_topic.items():
+                    topics.setdefault(topic, []).append((name, event))
+            self.contracts, self.selectors, self.topics = contracts, selectors, topics
+            self._version = version
+
+
+    def contract(self, contract_name: str) -> ContractAbi:
+        """
+        Return the codecs of a compiled contract.
+
+        Raises:
+            FileNotFoundError: If the contract has not been compiled.
+        """
+        return load_contract_abi(contract_name, self.build_path)
+
+
+    def decode_calldata(self, data: bytes, contract_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Decode transaction input into the function called and its arguments.
+
+        Args:
+            data (bytes): The calldata, starting with the 4-byte selector.
+            contract_name (Optional[str]): Restrict the lookup to one contract, which
+                disambiguates selectors shared by several artifacts.
+
+        Returns:
+            Dict[str, Any]: `contract`, `function`, `signature` and `args` (by name).
+
+        Raises:
+            ValueError: If no compiled function matches the selector.
+        """
+        data = bytes(HexBytes(data))
+        selector = data[:4]
+        if contract_name:
+            codec = self.contract(contract_name).by_selector.get(selector)
+            matches = [(contract_name, codec)] if codec else []
+        else:
+            self.refresh()
+            matches = self.selectors.get(selector, [])
+        if not matches:
+            raise ValueError(f"Unknown function selector 0x{selector.hex()}")
+
+        name, codec = matches[0]
+        names = [i.get("name") or f"arg{n}" for n, i in enumerate(codec.abi.get("inputs", []))]
+        return {
+            "contract": name,
+            "function": codec.name,
+            "signature": codec.signature,
+            "args": dict(zip(names, codec.decode_input(data[4:]))),
+        }
+
+
+    def decode_log(self, topics: List[Any], data: Any) -> Optional[Dict[str, Any]]:
+        """
+        Decode a log emitted by any compiled contract.
+
+        Args:
+            topics (List[Any]): The log topics (bytes or hex strings).
+            data (Any): The log data (bytes or hex string).
+
+        Returns:
+            Optional[Dict[str, Any]]: `contract`, `event`, `signature` and `args`, or
+                None for anonymous or unknown events.
+        """
+        if not topics:
+            return None
+        topics = [bytes(HexBytes(topic)) for topic in topics]
+        self.refresh()
+        for name, event in self.topics.get(topics[0], []):
+            try:
+                args = event.decode_log(topics, bytes(HexBytes(data)))
+            except Exception: # pylint: disable=broad-exception-caught
+                # Same signature but different indexing; try the next artifact
+                continue
+            return {"contract": name, "event": event.name, "signature": event.signature,
+                    "args": args}
+        return None
+
+
+_INDEX: Optional[AbiIndex] = None
+
+
+def get_abi_index() -> AbiIndex:
+    """Return the shared AbiIndex over BUILD_PATH."""
+    global _INDEX  # pylint: disable=global-statement
+    if _INDEX is None:
+        _INDEX = AbiIndex()
+    return _INDEX
@@ -0,0 +1,138 @@
+"""
+Account keyring module.
+
+This module derives the `LocalAccount` for every user in `config["accounts"]` once
+at startup, so that services can sign transactions without re-deriving keys on
+every request. The keyring is shared through `init_keyring` / `get_keyring`.
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+from core.lazy_import import lazy_import
+from core.logger_config import LOGGER
+
+if TYPE_CHECKING:
+    from eth_account.signers.local import LocalAccount
+
+# Loaded when the keyring is built, which happens during the startup warm-up
+eth_account = lazy_import("eth_account")
+
+
+def check_address(user: str, details: dict, account: "LocalAccount") -> None:
+    """
+    Check that the configured address of a user matches the account derived from its key.
+
+    An address that is not set (or whose environment variable is not set) is not checked.
+
+    Args:
+        user (str): The user name.
+        details (dict): The user's entry in the `[accounts]` section.
+        account (LocalAccount): The account derived from the private key.
+
+    Raises:
+        ValueError: If the configured address does not match the private key.
+    """
+    address = details.get("address")
+    if address and not address.startswith("${") and address.lower() != account.address.lower():
+        raise ValueError(
+            f"Configured address {address} for user '{user}' does not match "
+            f"its private key ({account.address})"
+        )
+
+
+class AccountKeyring:
+    """
+    Holds pre-derived local accounts keyed by user name.
+    """
+
+    def __init__(self, accounts: Dict[str, "LocalAccount"]):
+        """
+        Initialise the AccountKeyring.
+
+        Args:
+            accounts (Dict[str, "LocalAccount"]): The derived accounts keyed by user name.
+        """
+        self.accounts = accounts
+
+
+    @classmethod
+    def from_config(cls, config: dict) -> "AccountKeyring":
+        """
+        Derive the accounts configured in the `[accounts]` section.
+
+        Users whose private key is missing, unresolved or invalid are skipped with a
+        warning so the API can still serve read-only requests.
+
+        Args:
+            config (dict): The configuration dictionary.
+
+        Returns:
+            AccountKeyring: The keyring.
+
+        Raises:
+            ValueError: If a configured address does not match its private key.
+        """
+        accounts = {}
+        for user, details in config.get("accounts", {}).items():
+            private_key = details.get("private_key")
+            if not private_key or private_key.startswith("${"):
+                LOGGER.warning("Private key for user '%s' is not set, skipping", user)
+                continue
+
+            try:
+                account = eth_account.Account.from_key(private_key)
+            except (ValueError, TypeError) as e:
+                LOGGER.warning("Invalid private key for user '%s', skipping: %s", user, e)
+                continue
+
+            check_address(user, details, account)
+            accounts[user] = account
+
+        LOGGER.info("Keyring loaded with %d accounts", len(accounts))
+        return cls(accounts)
+
+
+    def get(self, user: str) -> "LocalAccount":
+        """
+        Return the local account for a user.
+
+        Args:
+            user (str): The user name.
+
+        Returns:
+            LocalAccount: The derived account.
+
+        Raises:
+            ValueError: If the user has no usable account.
+        """
+        account = self.accounts.get(user)
+        if account is None:
+            raise ValueError(f"User '{user}' not found in the keyring")
+        return account
+
+
+    def users(self) -> List[str]:
+        """Return the names of the users with a usable account."""
+        return list(self.accounts.keys())
+
+
+_KEYRING: Optional[AccountKeyring] = None
+
+
+def init_keyring(config: dict) -> AccountKeyring:
+    """
+    Load the shared keyring from the configuration.
+
+    Args:
+        config (dict): The configuration dictionary.
+
+    Returns:
+        AccountKeyring: The shared keyring.
+    """
+    global _KEYRING  # pylint: disable=global-statement
+    _KEYRING = AccountKeyring.from_config(config)
+    return _KEYRING
+
+
+def get_keyring() -> Optional[AccountKeyring]:
+    """Return the shared keyring, or None if `init_keyring` has not been called."""
+    return _KEYRING
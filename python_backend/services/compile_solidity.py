@@ -3,10 +3,35 @@ Module for compiling Solidity contracts.
 """
 import os
 import json
-import solcx
+import time
 
-from core.constants import BUILD_PATH
+from core.constants import BUILD_PATH, ensure_storage_dirs
+from core.lazy_import import lazy_import
+from core.logger_config import LOGGER
+from core.metrics import COMPILE_SECONDS, SOLC_CACHE
+from core.tracing import start_span
 
+# py-solc-x is only needed when something is compiled
+solcx = lazy_import("solcx")
+
+# The compiler version used for every contract
+SOLC_VERSION = '0.8.0'
+
+
+def ensure_solc() -> None:
+    """
+    Install the Solidity compiler unless it is already installed, and select it.
+
+    Lookups are counted as cache hits or misses in the metrics registry.
+    """
+    installed = {str(version) for version in solcx.get_installed_solc_versions()}
+    if SOLC_VERSION in installed:
+        SOLC_CACHE.inc(result="hit")
+    else:
+        SOLC_CACHE.inc(result="miss")
+        with start_span("solc install", attributes={"solc.version": SOLC_VERSION}):
+            solcx.install_solc(SOLC_VERSION)
+    solcx.set_solc_version(SOLC_VERSION)
 
 
 def compile_solidity(filename: str):
@@ -17,23 +42,31 @@ def compile_solidity(filename: str):
         filename (str): The path to the Solidity source file.
     """
     # Set the Solidity compiler version
-    solcx.install_solc('0.8.0')
-    solcx.set_solc_version('0.8.0')
+    ensure_solc()
 
     # Read the Solidity source code
     with open(filename, 'r', encoding='utf-8') as file:
         solidity_source = file.read()
 
     # Compile the Solidity source code
-    compiled_sol = solcx.compile_source(
-        solidity_source,
-        output_values=['abi', 'bin']
-    )
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with start_span("solc compile", attributes={"solc.version": SOLC_VERSION,
+                                                    "source.bytes": len(solidity_source)}):
+            compiled_sol = solcx.compile_source(
+                solidity_source,
+                output_values=['abi', 'bin']
+            )
+        outcome = "ok"
+    finally:
+        COMPILE_SECONDS.observe(time.perf_counter() - start, outcome=outcome)
 
     # Extract the contract interface
     _, contract_interface = compiled_sol.popitem()
 
     # Get the base filename without the .sol extension
+    ensure_storage_dirs()
     base_filename = os.path.splitext(os.path.basename(filename))[0]
 
     # Save the ABI and binary to JSON files
@@ -42,4 +75,4 @@ def compile_solidity(filename: str):
     with open(f'{BUILD_PATH}/{base_filename}BIN.json', 'w', encoding='utf-8') as bin_file:
         bin_file.write(contract_interface['bin'])
 
-    print(f"Contract {base_filename} compiled successfully!")
+    LOGGER.info("Contract %s compiled successfully", base_filename)
@@ -0,0 +1,294 @@
+'''
+contract_cache.py
+
+This module keeps the deployed contracts in memory, enriched with their explorer URLs,
+so that `/contracts/metadata` is served without a database query. A trigger on the
+`contracts` table (see db/init.sql) sends a notification on the `contracts_changed`
+channel for every change. A background thread LISTENs on it with its own connection:
+
+- inserted rows are fetched by id and merged into the cache;
+- updates, deletes and truncates reload the whole table;
+- after a lost connection the cache is reloaded once listening again, since
+  notifications sent meanwhile are lost;
+- every `verify_seconds` the cache is compared with the table version, and reloaded
+  if a notification was missed.
+
+The trigger is only created with a fresh database volume. If it is missing (an older
+database that was not migrated), the cache stays off and callers keep reading from the
+database, since no notification would ever arrive.
+
+Every worker process and replica runs its own listener, so all of them follow the same
+table. Until the first load has completed (and while disconnected) the cache is not
+live, and callers read from the database instead.
+'''
+import bisect
+import json
+import select
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api.models import Contract
+from core.logger_config import LOGGER
+from services.contract_store import get_connection, get_contracts, get_contracts_version
+
+CHANNEL = "contracts_changed"
+
+# Fields returned per contract, in the order of the Contract model
+CONTRACT_FIELDS = tuple(Contract.model_fields)
+
+
+def enrich_contract(row: Dict[str, Any], networks: dict) -> Dict[str, Any]:
+    """
+    Shape a database row into the fields of the Contract model, with its explorer URL.
+
+    The rows come from our own table, whose columns already have the types of the
+    model, so they are not validated.
+
+    Args:
+        row (Dict[str, Any]): The row, by column name.
+        networks (dict): The `networks` section of the configuration.
+
+    Returns:
+        Dict[str, Any]: The contract metadata.
+    """
+    row = {**row, "explorer_url": networks.get(row.get("network"), {}).get("explorer")}
+    return {field: row.get(field) for field in CONTRACT_FIELDS}
+
+
+class ContractCache:
+    """
+    In-memory copy of the contracts table, kept current by LISTEN/NOTIFY.
+    """
+
+    def __init__(self, networks: dict, fetch: Callable[..., List[Dict[str, Any]]] = get_contracts,
+                 connect: Callable[[], Any] = get_connection, reconnect_delay: float = 5.0,
+                 fetch_version: Callable[[], Tuple[int, int]] = get_contracts_version,
+                 verify_seconds: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise the ContractCache.
+
+        Args:
+            networks (dict): The `networks` section of the configuration.
+            fetch (Callable[..., List[Dict[str, Any]]]): Reads rows, oldest first; called
+                with `after_id` for incremental fetches.
+            connect (Callable[[], Any]): Opens the database connection that listens.
+            reconnect_delay (float): Seconds between attempts to reconnect.
+            fetch_version (Callable[[], Tuple[int, int]]): Reads the table version, like
+                get_contracts_version.
+            verify_seconds (float): Interval of the version check; 0 disables it.
+            clock (Callable[[], float]): Monotonic clock, replaceable in tests.
+        """
+        self.networks = networks
+        self.fetch = fetch
+        self.connect = connect
+        self.reconnect_delay = reconnect_delay
+        self.fetch_version = fetch_version
+        self.verify_seconds = verify_seconds
+        self._clock = clock
+        self.live = False
+        self._trigger_warned = False
+        # Replaced, never modified, so readers can use them without the lock
+        self._ids: List[int] = []
+        self._contracts: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+
+    def contracts(self) -> List[Dict[str, Any]]:
+        """Return the metadata of every contract, oldest first. Do not modify it."""
+        return self._contracts
+
+
+    def metadata(self) -> Dict[str, Any]:
+        """Return the body of `/contracts/metadata`."""
+        return {"contracts": self._contracts}
+
+
+    def version(self) -> Tuple[int, int]:
+        """
+        Return the highest contract id and the number of contracts.
+
+        Matches get_contracts_version, so ETags agree with workers reading the database.
+        """
+        ids = self._ids
+        return (ids[-1] if ids else 0), len(ids)
+
+
+    def reload(self) -> None:
+        """Replace the cache with the whole table."""
+        rows = self.fetch()
+        ids = [row["id"] for row in rows]
+        contracts = [enrich_contract(row, self.networks) for row in rows]
+        with self._lock:
+            self._ids, self._contracts = ids, contracts
+        LOGGER.info("Contract cache loaded: %d contracts", len(ids))
+
+
+    def merge(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Add newly inserted rows, keeping the cache ordered by id.
+
+        Rows already cached are skipped. Rows are usually appended; rows committed out
+        of id order are inserted in place.
+
+        Args:
+            rows (List[Dict[str, Any]]): The rows, by column name.
+
+        Returns:
+            int: The number of rows added.
+        """
+        with self._lock:
+            ids, contracts = list(self._ids), list(self._contracts)
+            added = 0
+            for row in rows:
+                position = bisect.bisect_left(ids, row["id"])
+                if position < len(ids) and ids[position] == row["id"]:
+                    continue
+                ids.insert(position, row["id"])
+                contracts.insert(position, enrich_contract(row, self.networks))
+                added += 1
+            self._ids, self._contracts = ids, contracts
+        return added
+
+
+    def apply(self, payloads: List[str]) -> None:
+        """
+        Bring the cache up to date after notifications.
+
+        Args:
+            payloads (List[str]): The notification payloads, `{"op": ..., "id": ...}`.
+        """
+        inserted = []
+        for payload in payloads:
+            try:
+                change = json.loads(payload)
+            except ValueError:
+                change = {}
+            if change.get("op") != "INSERT" or not isinstance(change.get("id"), int):
+                self.reload()
+                return
+            inserted.append(change["id"])
+
+        if inserted:
+            # Ids are allocated before commit, so fetch from the lowest one notified
+            added = self.merge(self.fetch(after_id=min(inserted) - 1))
+            LOGGER.debug("Contract cache: %d contracts added", added)
+
+
+    def verify(self) -> bool:
+        """
+        Reload the cache if it does not match the version of the table.
+
+        Returns:
+            bool: True if the cache was reloaded.
+        """
+        if self.fetch_version() == self.version():
+            return False
+        LOGGER.warning("Contract cache is out of date (missed notification?), reloading")
+        self.reload()
+        return True
+
+
+    @staticmethod
+    def has_trigger(conn: Any) -> bool:
+        """Return True if the notification trigger exists on the contracts table and is enabled."""
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1 FROM pg_trigger WHERE tgrelid = 'contracts'::regclass "
+                        "AND tgname = %s AND tgenabled <> 'D';", (CHANNEL,))
+            return cur.fetchone() is not None
+
+
+    def start(self) -> None:
+        """Start listening for changes in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="contract-cache", daemon=True)
+        self._thread.start()
+
+
+    def stop(self) -> None:
+        """Stop listening; the cache is no longer live."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.live = False
+
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self.connect()
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {CHANNEL};")
+                if self.has_trigger(conn):
+                    # Listening first means no change falls between the load and the LISTEN
+                    self.reload()
+                    self.live = True
+                    self._listen(conn)
+                elif not self._trigger_warned:
+                    self._trigger_warned = True
+                    LOGGER.warning("The %s trigger is missing on the contracts table; reading "
+                                   "contracts from the database until db/init.sql is applied",
+                                   CHANNEL)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                LOGGER.warning("Contract cache listener failed, reading from the database: %s",
+                               e)
+            finally:
+                self.live = False
+                if conn is not None:
+                    conn.close()
+            self._stop.wait(self.reconnect_delay)
+
+
+    def _listen(self, conn: Any) -> None:
+        next_verify = self._clock() + self.verify_seconds
+        while not self._stop.is_set():
+            if self.verify_seconds and self._clock() >= next_verify:
+                self.verify()
+                next_verify = self._clock() + self.verify_seconds
+            if select.select([conn], [], [], 1.0) == ([], [], []):
+                continue
+            conn.poll()
+            payloads = [notify.payload for notify in conn.notifies]
+            conn.notifies.clear()
+            if payloads:
+                self.apply(payloads)
+
+
+_CACHE: Optional[ContractCache] = None
+
+
+def start_contract_cache(config: dict) -> Optional[ContractCache]:
+    """
+    Start the contract cache, unless `[metadata_cache] enabled = false`.
+
+    Args:
+        config (dict): The configuration dictionary.
+
+    Returns:
+        Optional[ContractCache]: The started cache.
+    """
+    global _CACHE  # pylint: disable=global-statement
+    settings = config.get("metadata_cache", {})
+    if _CACHE is None and settings.get("enabled", True):
+        _CACHE = ContractCache(config.get("networks", {}),
+                               reconnect_delay=settings.get("reconnect_seconds", 5.0),
+                               verify_seconds=settings.get("verify_seconds", 60.0))
+        _CACHE.start()
+    return _CACHE
+
+
+def stop_contract_cache() -> None:
+    """Stop the contract cache."""
+    global _CACHE  # pylint: disable=global-statement
+    if _CACHE is not None:
+        _CACHE.stop()
+        _CACHE = None
+
+
+def get_contract_cache() -> Optional[ContractCache]:
+    """Return the contract cache, if it is live."""
+    return _CACHE if _CACHE is not None and _CACHE.live else None
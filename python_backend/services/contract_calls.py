@@ -0,0 +1,191 @@
+'''
+Module: contract_calls
+
+This module provides ABI-driven contract access that works for any compiled contract:
+read-only calls (single or as one JSON-RPC batch across many contracts) and
+state-changing transactions. Calldata is encoded and results decoded with the
+precomputed codecs of `services.abi_codec`.
+'''
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from eth_utils import to_checksum_address, to_hex
+from services.abi_codec import FunctionCodec, load_contract_abi, to_json_value
+from services.ethereum_account import EthereumAccount
+from services.singleflight import SingleFlight
+from services.tx_replacement import track_transaction
+from core.logger_config import LOGGER
+
+if TYPE_CHECKING:
+    from web3 import Web3
+
+# Coalesces identical concurrent reads of the same contract into one RPC call
+CONTRACT_READS = SingleFlight()
+
+
+def format_output(codec: FunctionCodec, values: Tuple[Any, ...]) -> Any:
+    """
+    Shape decoded return values for a JSON response.
+
+    Args:
+        codec (FunctionCodec): The function that was called.
+        values (Tuple[Any, ...]): The decoded return values.
+
+    Returns:
+        Any: The value itself for a single output, a dict when every output is named,
+            otherwise a list.
+    """
+    if len(values) == 1:
+        return to_json_value(values[0])
+    if codec.output_names and all(codec.output_names):
+        return {name: to_json_value(value) for name, value in zip(codec.output_names, values)}
+    return to_json_value(values)
+
+
+def call_function(w3: "Web3", network_name: str, contract_address: str, contract_name: str,
+                  function: str, args: List[Any], block: str = "latest") -> Any:
+    """
+    Call a read-only contract function with `eth_call`.
+
+    Args:
+        w3 (Web3): The Web3 instance of the network.
+        network_name (str): The network name, used to coalesce identical reads.
+        contract_address (str): The contract address.
+        contract_name (str): The compiled contract providing the ABI.
+        function (str): The function name.
+        args (List[Any]): The positional arguments.
+        block (str): The block identifier to call at.
+
+    Returns:
+        Any: The decoded return value(s).
+
+    Raises:
+        FileNotFoundError: If the contract has not been compiled.
+        ValueError: If the function or arguments do not match the ABI.
+        ContractLogicError: If the call reverts.
+    """
+    codec = load_contract_abi(contract_name).function(function, len(args))
+    values = read_function(w3, network_name, contract_address, codec, args, block)
+    return format_output(codec, values)
+
+
+def read_function(w3: "Web3", network_name: str, contract_address: str, codec: FunctionCodec,
+                  args: List[Any], block: str = "latest") -> Tuple[Any, ...]:
+    """
+    Run `eth_call` for a function codec, coalescing identical concurrent reads.
+
+    Args:
+        w3 (Web3): The Web3 instance of the network.
+        network_name (str): The network name, part of the coalescing key.
+        contract_address (str): The contract address.
+        codec (FunctionCodec): The function to call.
+        args (List[Any]): The positional arguments.
+        block (str): The block identifier to call at.
+
+    Returns:
+        Tuple[Any, ...]: The decoded return values.
+    """
+    address = to_checksum_address(contract_address)
+    data = to_hex(codec.encode_input(args))
+
+    key = (network_name, address.lower(), data, block)
+    raw = CONTRACT_READS.do(key, lambda: w3.eth.call({"to": address, "data": data}, block))
+    return codec.decode_output(bytes(raw))
+
+
+def batch_call(w3: "Web3", calls: List[Dict[str, Any]], block: str = "latest") -> List[dict]:
+    """
+    Run many read-only calls, possibly on different contracts, in one JSON-RPC batch.
+
+    Args:
+        w3 (Web3): The Web3 instance of the network.
+        calls (List[Dict[str, Any]]): Items with `contract_address`, `contract_name`,
+            `function` and `args` keys.
+        block (str): The block identifier to call at.
+
+    Returns:
+        List[dict]: One `{"result", "error"}` per call, in order.
+    """
+    results = [{"result": None, "error": None} for _ in calls]
+    requests = []
+    sent = []
+
+    for index, call in enumerate(calls):
+        try:
+            codec = load_contract_abi(call["contract_name"]).function(
+                call["function"], len(call.get("args", []))
+            )
+            request = {
+                "to": to_checksum_address(call["contract_address"]),
+                "data": to_hex(codec.encode_input(call.get("args", []))),
+            }
+            requests.append(("eth_call", [request, block]))
+            sent.append((index, codec))
+        except (OSError, ValueError) as e:
+            results[index]["error"] = str(e)
+
+    if not requests:
+        return results
+
+    responses = w3.provider.make_batch_request(requests)
+    if not isinstance(responses, list):
+        raise ValueError(f"Batch call rejected: {responses.get('error')}")
+
+    for (index, codec), response in zip(sent, responses):
+        if "error" in response:
+            error = response["error"]
+            results[index]["error"] = error.get("message", str(error)) \
+                if isinstance(error, dict) else str(error)
+            continue
+        try:
+            values = codec.decode_output(bytes.fromhex(response["result"][2:]))
+            results[index]["result"] = format_output(codec, values)
+        except Exception as e: # pylint: disable=broad-exception-caught
+            results[index]["error"] = f"Could not decode result: {e}"
+
+    LOGGER.info("Batch call: %d calls, %d errors",
+                len(results), sum(1 for result in results if result["error"]))
+    return results
+
+
+def transact_function(eth_account: EthereumAccount, contract_address: str,
+                      contract_name: str, function: str, args: List[Any],
+                      value: int = 0, gas: Optional[int] = None) -> str:
+    """
+    Send a transaction calling a contract function, and follow it in the background.
+
+    Args:
+        eth_account (EthereumAccount): The account sending the transaction.
+        contract_address (str): The contract address.
+        contract_name (str): The compiled contract providing the ABI.
+        function (str): The function name.
+        args (List[Any]): The positional arguments.
+        value (int): Wei to send along with the call.
+        gas (Optional[int]): The gas limit. Estimated when not given.
+
+    Returns:
+        str: The transaction hash.
+
+    Raises:
+        FileNotFoundError: If the contract has not been compiled.
+        ValueError: If the function or arguments do not match the ABI, or the node
+            rejects the transaction.
+    """
+    codec = load_contract_abi(contract_name).function(function, len(args))
+    transaction = {
+        "from": eth_account.account.address,
+        "to": to_checksum_address(contract_address),
+        "data": to_hex(codec.encode_input(args)),
+        "value": value,
+        "nonce": eth_account.get_nonce("pending"),
+        "gasPrice": eth_account.get_gas_price(),
+        "chainId": eth_account.config["network"].get("chain_id") or eth_account.w3.eth.chain_id,
+    }
+    transaction["gas"] = gas or eth_account.w3.eth.estimate_gas(transaction)
+
+    signed_tx = eth_account.sign_transaction(transaction)
+    tx_hash = eth_account.send_transaction(signed_tx)
+    LOGGER.info("Transaction for %s.%s sent: %s", contract_name, codec.name, tx_hash)
+
+    track_transaction(eth_account, transaction, tx_hash)
+    return tx_hash
@@ -0,0 +1,196 @@
+'''
+Module: contract_watcher
+
+This module provides the `ContractWatcher` class, which follows the state of one
+deployed contract and fans its changes out to any number of streaming clients. There
+is a single watcher per (network, contract address): it re-reads the contract on each
+new block when the network has a WebSocket block subscription, and polls otherwise.
+Transaction lifecycle events and logs of the contract are forwarded from the event
+bus, with the logs decoded against the compiled ABIs.
+'''
+
+import asyncio
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from services.abi_codec import get_abi_index, to_json_value
+from core.event_bus import EVENT_BUS, EventBus
+from core.logger_config import LOGGER
+from core.rpc_guard import RPCUnavailableError
+from core.ws_subscriber import get_block_subscriber
+
+# Events buffered per client before the oldest are dropped
+MAX_QUEUED_EVENTS = 100
+
+
+class ContractWatcher:
+    """
+    Watches one contract and fans state changes and transaction events out to clients.
+    """
+
+    def __init__(self, network_name: str, contract_address: str,
+                 read_state: Callable[[], dict], bus: EventBus = EVENT_BUS,
+                 poll_interval: float = 5.0):
+        """
+        Initialise the ContractWatcher.
+
+        Args:
+            network_name (str): The network the contract is deployed on.
+            contract_address (str): The contract address.
+            read_state (Callable[[], dict]): Blocking function returning the contract state.
+            bus (EventBus): The bus carrying new heads and transaction events.
+            poll_interval (float): Seconds between reads when there are no new-head events.
+        """
+        self.network_name = network_name
+        self.contract_address = contract_address.lower()
+        self.read_state = read_state
+        self.bus = bus
+        self.poll_interval = poll_interval
+        self.state: Optional[dict] = None
+        self.on_idle: Optional[Callable[[], None]] = None
+        self._queues: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._unsubscribe = []
+
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Register a client, starting the upstream watch for the first one.
+
+        Returns:
+            asyncio.Queue: Receives `{"event": ..., "data": ...}` dictionaries.
+        """
+        queue: asyncio.Queue = asyncio.Queue(MAX_QUEUED_EVENTS)
+        if self.state is not None:
+            queue.put_nowait({"event": "state", "data": self.state})
+        self._queues.add(queue)
+        if self._task is None:
+            self._start()
+        return queue
+
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove a client, stopping the upstream watch after the last one."""
+        self._queues.discard(queue)
+        if not self._queues and self._task is not None:
+            self._stop()
+            if self.on_idle:
+                self.on_idle()
+
+
+    def subscriber_count(self) -> int:
+        """Return the number of connected clients."""
+        return len(self._queues)
+
+
+    def _start(self) -> None:
+        """Start following new heads, transaction events, logs and the contract state."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._unsubscribe = [
+            self.bus.subscribe(("new_head", self.network_name), self._on_new_head),
+            self.bus.subscribe(("tx", self.network_name), self._on_tx),
+            self.bus.subscribe(("log", self.network_name), self._on_log),
+        ]
+        subscriber = get_block_subscriber(self.network_name)
+        if subscriber:
+            subscriber.track_contract(self.contract_address)
+        self._task = self._loop.create_task(self._run())
+
+
+    def _stop(self) -> None:
+        """Stop the upstream watch."""
+        for unsubscribe in self._unsubscribe:
+            unsubscribe()
+        self._unsubscribe = []
+        self._task.cancel()
+        self._task = None
+        self.state = None
+
+
+    def _on_new_head(self, _event: dict) -> None:
+        """Bus callback (any thread): re-read the contract."""
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+
+    def _on_tx(self, event: dict) -> None:
+        """Bus callback (any thread): forward events of transactions to this contract."""
+        if event.get("to") != self.contract_address:
+            return
+        self._loop.call_soon_threadsafe(self._broadcast, {"event": "tx", "data": event})
+        if event.get("status") == "mined":
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+
+    def _on_log(self, event: dict) -> None:
+        """Bus callback (any thread): forward logs of this contract, decoded if possible."""
+        if event.get("address") != self.contract_address:
+            return
+        decoded = get_abi_index().decode_log(event.get("topics", []), event.get("data") or "0x")
+        if decoded:
+            decoded["args"] = {name: to_json_value(value)
+                               for name, value in decoded["args"].items()}
+        self._loop.call_soon_threadsafe(self._broadcast,
+                                        {"event": "log", "data": {**event, "decoded": decoded}})
+
+
+    def _broadcast(self, message: dict) -> None:
+        """Push a message to every client, dropping the oldest event of slow ones."""
+        for queue in self._queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+
+    async def _run(self) -> None:
+        """Read the contract whenever woken up (or on every poll) and push changes."""
+        while True:
+            try:
+                state = await self._loop.run_in_executor(None, self.read_state)
+                if state != self.state:
+                    self.state = state
+                    self._broadcast({"event": "state", "data": state})
+            except RPCUnavailableError as e:
+                LOGGER.warning("Contract watcher for %s skipped a read: %s",
+                               self.contract_address, e)
+            except Exception as e: # pylint: disable=broad-exception-caught
+                LOGGER.error("Contract watcher for %s failed to read state: %s",
+                             self.contract_address, e)
+
+            timeout = None if get_block_subscriber(self.network_name) else self.poll_interval
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+_WATCHERS: Dict[Tuple[str, str], ContractWatcher] = {}
+
+
+def get_contract_watcher(network_name: str, contract_address: str,
+                         read_state: Callable[[], dict],
+                         poll_interval: float = 5.0) -> ContractWatcher:
+    """
+    Return the shared watcher of a contract, creating it if needed.
+
+    Must be called from the event loop that serves the streaming clients.
+
+    Args:
+        network_name (str): The network the contract is deployed on.
+        contract_address (str): The contract address.
+        read_state (Callable[[], dict]): Used when a new watcher is created.
+        poll_interval (float): Used when a new watcher is created.
+
+    Returns:
+        ContractWatcher: The watcher shared by all clients of this contract.
+    """
+    key = (network_name, contract_address.lower())
+    watcher = _WATCHERS.get(key)
+    if watcher is None:
+        watcher = ContractWatcher(network_name, contract_address, read_state,
+                                  poll_interval=poll_interval)
+        watcher.on_idle = lambda: _WATCHERS.pop(key, None)
+        _WATCHERS[key] = watcher
+    return watcher
@@ -2,15 +2,81 @@
 Module for deploying Solidity contracts.
 """
 
-import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from web3.exceptions import TransactionNotFound
-from web3.contract import Contract as Web3Contract
+from typing import TYPE_CHECKING, Any, Dict, List
 from api.models import Contract
-from services.contract_store import store_contract_info
+from services.contract_store import store_contract_info, store_contracts_info
 from services.ethereum_account import EthereumAccount
+from services.gas_cache import get_gas_cache
+from core.lazy_import import lazy_import
 from core.logger_config import LOGGER
+from core.rpc_guard import RPCUnavailableError
+from core.tracing import start_span
+
+if TYPE_CHECKING:
+    from web3 import Web3
+    from web3.contract import Contract as Web3Contract
+
+# web3 is loaded by the first deployment, or by the startup warm-up
+web3 = lazy_import("web3")
+
+# Upper bound on threads waiting for receipts in a batch deployment
+MAX_RECEIPT_WORKERS = 16
+
+
+def load_contract_artifact(w3: "Web3", base_filename: str) -> "Web3Contract":
+    """
+    Load the compiled ABI and BIN files of a contract.
+
+    Args:
+        w3 (Web3): The Web3 instance to bind the contract to.
+        base_filename (str): The base filename of the contract's ABI and BIN files.
+
+    Returns:
+        Web3.eth.Contract: The contract factory.
+
+    Raises:
+        FileNotFoundError: If the ABI or BIN files are not found.
+    """
+    abi_path = f'build/{base_filename}ABI.json'
+    bin_path = f'build/{base_filename}BIN.json'
+
+    with open(abi_path, 'r', encoding='utf-8') as abi_file:
+        contract_abi = json.load(abi_file)
+
+    with open(bin_path, 'r', encoding='utf-8') as bin_file:
+        contract_bin = bin_file.read()
+
+    return w3.eth.contract(abi=contract_abi, bytecode=contract_bin)
+
+
+def build_contract_info(config: dict, contract_name: str, user: str,
+                        deployer_address: str, tx_receipt) -> Contract:
+    """
+    Prepare the contract information to store for a mined deployment.
+
+    Args:
+        config (dict): The configuration dictionary, updated with the selected network.
+        contract_name (str): The name of the deployed contract.
+        user (str): The user that deployed the contract.
+        deployer_address (str): The address of the deploying account.
+        tx_receipt (TxReceipt): The receipt of the deployment transaction.
+
+    Returns:
+        Contract: The contract information.
+    """
+    return Contract(
+        contract_name=contract_name,
+        deployer_name=user,
+        deployer_address=deployer_address,
+        contract_address=tx_receipt.contractAddress,
+        network=config["network"]["name"],
+        deployment_tx_hash=tx_receipt['transactionHash'].hex(),
+        deployment_timestamp=datetime.now(),
+        explorer_url=config['network']['explorer']
+    )
 
 
 class ContractDeployer:
@@ -38,7 +104,7 @@ class ContractDeployer:
         self.contract = self.load_contract(base_filename)
 
 
-    def load_contract(self, base_filename: str) -> Web3Contract:
+    def load_contract(self, base_filename: str) -> "Web3Contract":
         """
         Load ABI and BIN files.
 
@@ -48,16 +114,7 @@ class ContractDeployer:
         Raises:
             FileNotFoundError: If the ABI or BIN files are not found.
         """
-        abi_path = f'build/{base_filename}ABI.json'
-        bin_path = f'build/{base_filename}BIN.json'
-
-        with open(abi_path, 'r', encoding='utf-8') as abi_file:
-            contract_abi = json.load(abi_file)
-
-        with open(bin_path, 'r', encoding='utf-8') as bin_file:
-            contract_bin = bin_file.read()
-
-        return self.eth_account.w3.eth.contract(abi=contract_abi, bytecode=contract_bin)
+        return load_contract_artifact(self.eth_account.w3, base_filename)
 
 
     def build_transaction(self) -> dict:
@@ -73,9 +130,13 @@ class ContractDeployer:
         balance = self.eth_account.get_balance()
         LOGGER.info("ETH Balance: %s ETH", self.eth_account.from_wei(balance, 'ether'))
 
-        estimated_gas = self.contract.constructor(*self.constructor_args).estimate_gas({
-            'from': self.eth_account.account.address
-        })
+        # Encode the constructor call once, for both the estimate and the transaction
+        sender = self.eth_account.account.address
+        constructor_data = self.contract.constructor(*self.constructor_args).data_in_transaction
+        estimated_gas = get_gas_cache(self.config).estimate_deployment(
+            self.eth_account.w3, self.config["network"]["name"],
+            self.contract.bytecode, constructor_data, sender
+        )
 
         # Total gas cost in wei
         gas_cost = estimated_gas * gas_price
@@ -88,13 +149,15 @@ class ContractDeployer:
                 f"to cover estimated gas cost ({self.eth_account.from_wei(gas_cost, 'ether')} ETH)."
             )
 
-        transaction = self.contract.constructor(*self.constructor_args).build_transaction({
-            'from': self.eth_account.account.address,
+        transaction = {
+            'from': sender,
+            'data': constructor_data,
+            'value': 0,
             'nonce': self.eth_account.get_nonce(),
             'gas': estimated_gas,
-            # 'gas': 1_500_000,
-            'gasPrice': int(gas_price)
-        })
+            'gasPrice': int(gas_price),
+            'chainId': self.config["network"].get("chain_id") or self.eth_account.w3.eth.chain_id,
+        }
         return transaction
 
 
@@ -114,50 +177,23 @@ class ContractDeployer:
         return tx_hash
 
 
-    def wait_for_transaction(self, tx_hash: str, max_attempts: int = 50) -> dict:
+    def wait_for_transaction(self, transaction: dict, tx_hash: str) -> dict:
         """
         Wait for the transaction to be mined and confirmed.
 
+        Stuck transactions are replaced according to the configured replacement policy.
+
         Args:
+            transaction (dict): The transaction dictionary that was sent.
             tx_hash (str): The transaction hash.
-            max_attempts (int): The maximum number of attempts to wait for confirmation.
 
         Returns:
             dict: The transaction receipt.
 
         Raises:
-            TimeoutError: If the transaction is not confirmed within the maximum attempts.
+            TimeoutError: If the transaction is not confirmed within the policy timeout.
         """
-        attempt = 0
-        self.eth_account.w3.eth.poll_latency = 10
-        while attempt < max_attempts:
-            try:
-                tx_receipt = self.eth_account.w3.eth.get_transaction_receipt(tx_hash)
-                if tx_receipt:
-                    LOGGER.info("Transaction confirmed: %s", tx_receipt)
-                    return tx_receipt
-            except TransactionNotFound:
-                LOGGER.info("Attempt %d: Waiting for transaction confirmation...", attempt + 1)
-
-            # Detect stuck transactions and reattempt with a higher gas price
-            if attempt % 10 == 0:  # Every 10 attempts, check if it's stuck
-                pending_tx = dict(self.eth_account.w3.eth.get_transaction(tx_hash))
-                current_gas_price = self.eth_account.get_gas_price()
-
-                if pending_tx["gasPrice"] < current_gas_price:
-                    LOGGER.warning("Transaction is likely stuck. \
-                                   Resubmitting with higher gas price...")
-                    new_tx = pending_tx.copy()
-                    # Increase gas price
-                    new_tx["gasPrice"] = int(current_gas_price * 1.2)
-                    signed_tx = self.eth_account.sign_transaction(new_tx)
-                    tx_hash = self.eth_account.send_transaction(signed_tx)
-                    LOGGER.info("Replaced transaction with new hash: %s", tx_hash.hex())
-
-            time.sleep(10)
-            attempt += 1
-
-        raise TimeoutError(f"Transaction {tx_hash} not confirmed after {max_attempts} attempts.")
+        return self.eth_account.wait_for_transaction(transaction, tx_hash)
 
 
     def deploy(self) -> str:
@@ -172,28 +208,20 @@ class ContractDeployer:
         """
         LOGGER.info("Deploying contract from address: %s", self.eth_account.account.address)
 
-        transaction = self.build_transaction()
-        tx_hash = self.sign_and_send_transaction(transaction)
-        tx_receipt = self.wait_for_transaction(tx_hash)
+        # Gas estimation, broadcast and confirmation each get their own span
+        with start_span("deploy.build_transaction"):
+            transaction = self.build_transaction()
+        with start_span("deploy.broadcast") as span:
+            tx_hash = self.sign_and_send_transaction(transaction)
+            span.set_attribute("tx.hash", tx_hash)
+        tx_receipt = self.wait_for_transaction(transaction, tx_hash)
 
         contract_address = tx_receipt.contractAddress
         LOGGER.info("Contract deployed at address: %s", contract_address)
 
-        deployment_tx_hash = tx_receipt['transactionHash'].hex()
-
-        explorer_url = self.config['network']['explorer']
-
         # Prepare the contract information using the Contract class
-        info = Contract(
-            contract_name=self.contract_name,
-            deployer_name=self.user,
-            deployer_address=self.eth_account.account.address,
-            contract_address=contract_address,
-            network=self.config["network"]["name"],
-            deployment_tx_hash=deployment_tx_hash,
-            deployment_timestamp=datetime.now(),
-            explorer_url=explorer_url
-        )
+        info = build_contract_info(self.config, self.contract_name, self.user,
+                                   self.eth_account.account.address, tx_receipt)
 
         LOGGER.debug("Deployment info: %s", info)
 
@@ -205,3 +233,155 @@ class ContractDeployer:
             raise
 
         return contract_address
+
+
+class BatchContractDeployer:
+    """
+    Class for deploying many contracts from one account in a single pass.
+
+    All deployment transactions are built with sequential nonces, signed and
+    broadcast up front; receipts are then awaited concurrently and the mined
+    contracts are stored with one batched insert. Deployments after one the node
+    rejects are cancelled and reported as blocked rather than awaited.
+    """
+
+    def __init__(self, user: str, items: List[Dict[str, Any]], config: dict):
+        """
+        Initialise the BatchContractDeployer.
+
+        Args:
+            user (str): The user deploying the contracts.
+            items (List[Dict[str, Any]]): Items with `contract_name` and
+                `constructor_args` keys, one per contract instance to deploy.
+            config (dict): The configuration dictionary.
+        """
+        self.config = config
+        self.user = user
+        self.items = items
+        self.eth_account = EthereumAccount(user, config)
+
+
+    def build_transactions(self, results: List[dict]) -> List[tuple]:
+        """
+        Build the deployment transactions using sequential nonces.
+
+        Items that fail to load or estimate have their error recorded in `results`
+        and do not consume a nonce.
+
+        Args:
+            results (List[dict]): The per-item results, updated in place on error.
+
+        Returns:
+            List[tuple]: (item index, transaction) pairs for the buildable items.
+
+        Raises:
+            ValueError: If the account cannot cover the estimated cost of the batch.
+        """
+        w3 = self.eth_account.w3
+        sender = self.eth_account.account.address
+        chain_id = self.config["network"].get("chain_id") or w3.eth.chain_id
+        gas_price = self.eth_account.get_gas_price()
+        nonce = self.eth_account.get_nonce("pending")
+
+        gas_cache = get_gas_cache(self.config)
+        contracts = {}
+        transactions = []
+        for index, item in enumerate(self.items):
+            try:
+                name = item["contract_name"]
+                if name not in contracts:
+                    contracts[name] = load_contract_artifact(w3, name)
+
+                constructor = contracts[name].constructor(*item.get("constructor_args", []))
+                data = constructor.data_in_transaction
+                estimated_gas = gas_cache.estimate_deployment(
+                    w3, self.config["network"]["name"], contracts[name].bytecode, data, sender
+                )
+            except (OSError, TypeError, ValueError, web3.exceptions.Web3Exception) as e:
+                LOGGER.error("Skipping deployment of %s: %s", item.get("contract_name"), e)
+                results[index]["error"] = str(e)
+                continue
+
+            transactions.append((index, {
+                "from": sender,
+                "data": data,
+                "value": 0,
+                "nonce": nonce + len(transactions),
+                "gas": estimated_gas,
+                "gasPrice": gas_price,
+                "chainId": chain_id,
+            }))
+
+        gas_cost = sum(tx["gas"] for _, tx in transactions) * gas_price
+        balance = self.eth_account.get_balance()
+        if balance < gas_cost:
+            raise ValueError(
+                f"Insufficient balance ({self.eth_account.from_wei(balance, 'ether')} ETH) "
+                f"to cover estimated batch cost "
+                f"({self.eth_account.from_wei(gas_cost, 'ether')} ETH)."
+            )
+        return transactions
+
+
+    def deploy(self) -> List[dict]:
+        """
+        Deploy all items and store the deployment information.
+
+        Returns:
+            List[dict]: One result per item with `contract_name`, `contract_address`,
+                `tx_hash` and `error`.
+
+        Raises:
+            RuntimeError: If storing the contract information in the database fails.
+        """
+        LOGGER.info("Batch deploying %d contracts from address: %s",
+                    len(self.items), self.eth_account.account.address)
+
+        results = [{"contract_name": item["contract_name"], "contract_address": None,
+                    "tx_hash": None, "error": None} for item in self.items]
+
+        transactions = self.build_transactions(results)
+        broadcast = self.eth_account.broadcast_sequence([tx for _, tx in transactions]) \
+            if transactions else []
+        sent = []
+        for (index, tx), (tx_hash, error) in zip(transactions, broadcast):
+            results[index]["tx_hash"] = tx_hash
+            results[index]["error"] = error
+            if tx_hash:
+                sent.append((index, tx, tx_hash))
+
+        infos = []
+        if sent:
+            with ThreadPoolExecutor(max_workers=min(len(sent), MAX_RECEIPT_WORKERS)) as pool:
+                futures = [(index, pool.submit(self.eth_account.wait_for_transaction, tx, tx_hash))
+                           for index, tx, tx_hash in sent]
+
+                for index, future in futures:
+                    try:
+                        tx_receipt = future.result()
+                    except (TimeoutError, ValueError, web3.exceptions.Web3Exception,
+                            RPCUnavailableError) as e:
+                        LOGGER.error("Deployment %s failed: %s", results[index]["tx_hash"], e)
+                        results[index]["error"] = str(e)
+                        continue
+
+                    if tx_receipt.get("status") == 0:
+                        results[index]["error"] = "Deployment transaction reverted"
+                        continue
+
+                    info = build_contract_info(self.config, results[index]["contract_name"],
+                                               self.user, self.eth_account.account.address,
+                                               tx_receipt)
+                    results[index]["contract_address"] = info.contract_address
+                    results[index]["tx_hash"] = info.deployment_tx_hash
+                    infos.append(info)
+
+        # Store all mined contracts at once, and let exceptions propagate
+        if infos:
+            try:
+                store_contracts_info(infos)
+            except RuntimeError as e:
+                LOGGER.error("Failed to store contract info: %s", e)
+                raise
+
+        return results
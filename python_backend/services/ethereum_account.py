@@ -2,10 +2,24 @@
 This module handles Ethereum account management, including private key management,
 Web3 connection, and transaction signing and sending.
 """
-from web3.types import TxParams, SignedTx
-from eth_account import Account
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+from eth_utils import to_hex
+from core.lazy_import import lazy_import
 from core.logger_config import LOGGER
-from core.web3_connector import Web3Connector
+from core.tracing import start_span
+from core.web3_connector import get_web3_connector
+from services.account_keyring import check_address, get_keyring
+from services.tx_replacement import MIN_REPLACEMENT_BUMP_PERCENT, ReplacementPolicy, \
+    TransactionReplacer
+
+if TYPE_CHECKING:
+    from web3.types import TxParams, SignedTx
+
+# Only needed when the keyring has not been built yet
+eth_account = lazy_import("eth_account")
+
+# Gas of a plain value transfer, used to cancel queued transactions
+TRANSFER_GAS = 21000
 
 
 
@@ -22,13 +36,19 @@ class EthereumAccount:
         if not user_config:
             raise ValueError(f"User '{self.user}' not found in the configuration")
 
-        self.private_key = user_config.get("private_key")
-        if not self.private_key:
-            raise ValueError(f"Private key for user '{self.user}' is missing in configuration")
+        # Prefer the account derived once at startup over deriving it per request
+        keyring = get_keyring()
+        if keyring is not None:
+            self.account = keyring.get(self.user)
+        else:
+            private_key = user_config.get("private_key")
+            if not private_key:
+                raise ValueError(f"Private key for user '{self.user}' is missing in configuration")
+            self.account = eth_account.Account.from_key(private_key)
+            check_address(self.user, user_config, self.account)
 
-        self.web3_connector = Web3Connector(self.config["network"])
+        self.web3_connector = get_web3_connector(self.config["network"])
         self.w3 = self.web3_connector.get_web3()
-        self.account = Account().from_key(self.private_key)
 
 
     def get_balance(self) -> int:
@@ -36,9 +56,15 @@ class EthereumAccount:
         return self.w3.eth.get_balance(self.account.address)
 
 
-    def get_nonce(self) -> int:
-        """Retrieve the current nonce for the Ethereum account."""
-        return self.w3.eth.get_transaction_count(self.account.address)
+    def get_nonce(self, block_identifier: str = "latest") -> int:
+        """
+        Retrieve the current nonce for the Ethereum account.
+
+        Args:
+            block_identifier (str): "latest" for mined transactions only, or "pending"
+                to also count transactions waiting in the node's mempool.
+        """
+        return self.w3.eth.get_transaction_count(self.account.address, block_identifier)
 
 
     def get_gas_price(self) -> int:
@@ -46,7 +72,7 @@ class EthereumAccount:
         return self.w3.eth.gas_price
 
 
-    def sign_transaction(self, transaction: TxParams) -> SignedTx:
+    def sign_transaction(self, transaction: "TxParams") -> "SignedTx":
         """
         Sign a transaction using the account's private key.
 
@@ -56,13 +82,137 @@ class EthereumAccount:
         Returns:
             SignedTransaction: The signed transaction object.
         """
-        signed_tx = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
-        LOGGER.info("Transaction signed: Nonce %d, Gas Price %d", \
-                    transaction["nonce"], transaction["gasPrice"])
+        with start_span("sign_transaction", attributes={"tx.nonce": transaction.get("nonce")}):
+            signed_tx = self.account.sign_transaction(transaction)
+        LOGGER.debug("Transaction signed: Nonce %d, Gas Price %s", \
+                     transaction["nonce"],
+                     transaction.get("gasPrice", transaction.get("maxFeePerGas")))
         return signed_tx
 
 
-    def send_transaction(self, signed_tx: SignedTx) -> str:
+    def sign_transactions(self, transactions: List["TxParams"]) -> List["SignedTx"]:
+        """
+        Sign several transactions with the already-derived local account.
+
+        Args:
+            transactions (List[TxParams]): Fully populated transaction dictionaries.
+
+        Returns:
+            List[SignedTransaction]: The signed transactions, in the same order.
+        """
+        with start_span("sign_transactions", attributes={"tx.count": len(transactions)}):
+            signed = [self.account.sign_transaction(tx) for tx in transactions]
+        LOGGER.info("Signed %d transactions for %s", len(signed), self.user)
+        return signed
+
+
+    def send_transactions_batch(
+        self, signed_txs: List["SignedTx"]
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Broadcast signed transactions in a single JSON-RPC batch of `eth_sendRawTransaction`.
+
+        Args:
+            signed_txs (List[SignedTransaction]): The signed transaction objects.
+
+        Returns:
+            List[Tuple[Optional[str], Optional[str]]]: A (tx_hash, error) pair per transaction.
+
+        Raises:
+            ValueError: If the node rejects the batch as a whole.
+        """
+        if not signed_txs:
+            return []
+
+        responses = self.w3.provider.make_batch_request([
+            ("eth_sendRawTransaction", [to_hex(signed_tx.raw_transaction)])
+            for signed_tx in signed_txs
+        ])
+        if not isinstance(responses, list):
+            raise ValueError(f"Batch broadcast rejected: {responses.get('error')}")
+
+        results = []
+        for response in responses:
+            if "error" in response:
+                error = response["error"]
+                results.append((None, error.get("message", str(error))
+                                if isinstance(error, dict) else str(error)))
+            else:
+                results.append((response["result"], None))
+
+        LOGGER.info("Batch sent: %d transactions, %d errors",
+                    len(results), sum(1 for _, error in results if error))
+        return results
+
+
+    def broadcast_sequence(
+        self, transactions: List["TxParams"]
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Sign and broadcast transactions with consecutive nonces, stopping at the first failure.
+
+        The transactions are sent in one batch. Any accepted after a rejected one would wait
+        behind the unused nonce, and be mined unexpectedly once the account sends something
+        else with it. Their nonces are therefore used up by zero-value transfers to the
+        account itself, which replace them, and they are reported as blocked.
+
+        Args:
+            transactions (List[TxParams]): Fully populated transactions, in nonce order.
+
+        Returns:
+            List[Tuple[Optional[str], Optional[str]]]: A (tx_hash, error) pair per
+                transaction; blocked transactions have no hash.
+        """
+        sent = self.send_transactions_batch(self.sign_transactions(transactions))
+        failed = next((i for i, (_, error) in enumerate(sent) if error), None)
+        if failed is None:
+            return sent
+
+        stranded = [tx for tx, (tx_hash, _) in zip(transactions[failed + 1:], sent[failed + 1:])
+                    if tx_hash]
+        if stranded:
+            gas_price = max(tx.get("gasPrice", tx.get("maxFeePerGas", 0)) for tx in stranded)
+            try:
+                self.cancel_nonces(range(transactions[failed]["nonce"], stranded[-1]["nonce"] + 1),
+                                   gas_price, transactions[failed].get("chainId"))
+            except (OSError, ValueError) as e:
+                LOGGER.error("Could not cancel the transactions after nonce %d: %s",
+                             transactions[failed]["nonce"], e)
+
+        blocked = f"Blocked: transaction with nonce {transactions[failed]['nonce']} failed"
+        return sent[:failed + 1] + [(None, error or blocked) for _, error in sent[failed + 1:]]
+
+
+    def cancel_nonces(self, nonces: Iterable[int], gas_price: int,
+                      chain_id: Optional[int]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Use up nonces with zero-value transfers to the account itself.
+
+        The fee is bumped by the minimum replacement increment over `gas_price`, so that
+        transactions queued with these nonces are replaced.
+
+        Args:
+            nonces (Iterable[int]): The nonces to use up.
+            gas_price (int): The highest fee per gas of the queued transactions.
+            chain_id (Optional[int]): The chain id; read from the node when not given.
+
+        Returns:
+            List[Tuple[Optional[str], Optional[str]]]: A (tx_hash, error) pair per nonce.
+        """
+        price = gas_price + (gas_price * MIN_REPLACEMENT_BUMP_PERCENT + 99) // 100
+        chain_id = chain_id or self.w3.eth.chain_id
+        cancels = [{"to": self.account.address, "value": 0, "nonce": nonce, "gas": TRANSFER_GAS,
+                    "gasPrice": price, "chainId": chain_id} for nonce in nonces]
+        results = self.send_transactions_batch(self.sign_transactions(cancels))
+        for cancel, (tx_hash, error) in zip(cancels, results):
+            if error:
+                LOGGER.error("Could not cancel nonce %d: %s", cancel["nonce"], error)
+            else:
+                LOGGER.warning("Cancelled nonce %d with %s", cancel["nonce"], tx_hash)
+        return results
+
+
+    def send_transaction(self, signed_tx: "SignedTx") -> str:
         """
         Send a signed Ethereum transaction.
 
@@ -77,6 +227,28 @@ class EthereumAccount:
         return tx_hash.hex()
 
 
+    def wait_for_transaction(self, transaction: "TxParams", tx_hash: str,
+                             policy: ReplacementPolicy = None):
+        """
+        Wait for a sent transaction to be mined, replacing it with higher fees if it gets stuck.
+
+        Args:
+            transaction (TxParams): The transaction dictionary that was signed and sent.
+            tx_hash (str): The hash returned by `send_transaction`.
+            policy (ReplacementPolicy): The escalation policy. Defaults to the
+                `[replacement]` section of the configuration.
+
+        Returns:
+            TxReceipt: The receipt of whichever version of the transaction was mined.
+
+        Raises:
+            TimeoutError: If no version is mined within the policy timeout.
+        """
+        policy = policy or ReplacementPolicy.from_config(self.config)
+        replacer = TransactionReplacer(self, transaction, tx_hash, policy)
+        return replacer.wait_for_receipt()
+
+
     def from_wei(self, value: int, unit: str) -> float:
         """
         Convert a value from Wei to the specified unit.
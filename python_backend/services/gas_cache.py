@@ -0,0 +1,157 @@
+"""
+Gas estimate cache module.
+
+Deployments of the same artifact with the same constructor arguments from the same
+sender need the same amount of gas, so their `eth_estimateGas` result is cached for
+a configurable TTL. A safety margin is added on top of every estimate to absorb
+small state-dependent differences.
+"""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple, Union
+
+from eth_utils import keccak, to_bytes
+from core.logger_config import LOGGER
+
+if TYPE_CHECKING:
+    from web3 import Web3
+
+CacheKey = Tuple[str, str, str, str]
+
+
+class GasEstimateCache:
+    """
+    TTL cache of deployment gas estimates.
+    """
+
+    def __init__(self, ttl_seconds: float = 600, margin: float = 0.1, max_entries: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise the GasEstimateCache.
+
+        Args:
+            ttl_seconds (float): How long an estimate stays valid.
+            margin (float): Fraction added on top of every estimate (0.1 = +10%).
+            max_entries (int): The maximum number of cached estimates.
+            clock (Callable[[], float]): Monotonic clock, replaceable in tests.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.margin = margin
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: Dict[CacheKey, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+
+    @classmethod
+    def from_config(cls, config: dict) -> "GasEstimateCache":
+        """
+        Build a cache from the `[gas_cache]` section of the configuration.
+
+        Args:
+            config (dict): The configuration dictionary.
+
+        Returns:
+            GasEstimateCache: The cache, using defaults for missing keys.
+        """
+        return cls(**config.get("gas_cache", {}))
+
+
+    @staticmethod
+    def deployment_key(network: str, bytecode: Union[bytes, str], data: str,
+                       sender: str) -> CacheKey:
+        """
+        Build the cache key for a deployment.
+
+        Args:
+            network (str): The network name.
+            bytecode (Union[bytes, str]): The contract creation bytecode.
+            data (str): The full deployment calldata (bytecode followed by encoded arguments).
+            sender (str): The deploying address.
+
+        Returns:
+            CacheKey: (network, bytecode hash, ABI-encoded constructor arguments, sender).
+        """
+        bytecode = to_bytes(hexstr=bytecode) if isinstance(bytecode, str) else bytes(bytecode)
+        encoded_args = to_bytes(hexstr=data)[len(bytecode):]
+        return (network, keccak(bytecode).hex(), encoded_args.hex(), sender.lower())
+
+
+    def _with_margin(self, estimate: int) -> int:
+        """Apply the safety margin to a raw estimate."""
+        return int(estimate * (1 + self.margin))
+
+
+    def get(self, key: CacheKey) -> Optional[int]:
+        """
+        Return a cached estimate with the margin applied, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            estimate, expires_at = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return None
+        return self._with_margin(estimate)
+
+
+    def put(self, key: CacheKey, estimate: int) -> None:
+        """Store a raw estimate, evicting expired or the oldest entries when full."""
+        now = self._clock()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                for expired in [k for k, (_, exp) in self._entries.items() if exp <= now]:
+                    del self._entries[expired]
+            if len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (estimate, now + self.ttl_seconds)
+
+
+    def estimate_deployment(self, w3: "Web3", network: str, bytecode: Union[bytes, str],
+                            data: str, sender: str) -> int:
+        """
+        Return the gas for a deployment, calling `eth_estimateGas` only on a cache miss.
+
+        Args:
+            w3 (Web3): The Web3 instance for the network.
+            network (str): The network name.
+            bytecode (Union[bytes, str]): The contract creation bytecode.
+            data (str): The already encoded deployment calldata.
+            sender (str): The deploying address.
+
+        Returns:
+            int: The gas estimate including the safety margin.
+        """
+        key = self.deployment_key(network, bytecode, data, sender)
+        cached = self.get(key)
+        if cached is not None:
+            LOGGER.debug("Gas estimate cache hit for %s", key[1][:12])
+            return cached
+
+        estimate = w3.eth.estimate_gas({"from": sender, "data": data})
+        self.put(key, estimate)
+        return self._with_margin(estimate)
+
+
+_GAS_CACHE: Optional[GasEstimateCache] = None
+_GAS_CACHE_LOCK = threading.Lock()
+
+
+def get_gas_cache(config: dict) -> GasEstimateCache:
+    """
+    Return the shared gas estimate cache, creating it from the configuration on first use.
+
+    Args:
+        config (dict): The configuration dictionary.
+
+    Returns:
+        GasEstimateCache: The shared cache.
+    """
+    global _GAS_CACHE  # pylint: disable=global-statement
+    with _GAS_CACHE_LOCK:
+        if _GAS_CACHE is None:
+            _GAS_CACHE = GasEstimateCache.from_config(config)
+        return _GAS_CACHE
@@ -5,14 +5,28 @@ This module provides the `InboxContract` class, which facilitates interactions
 with a deployed Solidity smart contract named "Inbox". The class includes methods
 to fetch and update the contract's stored message, retrieve a counter value, and
 perform mathematical operations using the contract's functions.
+
+Calldata is encoded and results decoded with the precompiled codecs of the ABI
+index rather than web3's dynamic contract functions.
 '''
 
-import json
-from web3.contract import Contract as Web3Contract
-from web3.exceptions import ContractLogicError, TransactionNotFound
+from typing import Any, Callable, Dict, List, Tuple
+from eth_utils import to_checksum_address, to_hex
+from services.abi_codec import ContractAbi, get_abi_index
 from services.ethereum_account import EthereumAccount
+from services.contract_calls import read_function
+from services.tx_replacement import track_transaction
+from core.lazy_import import lazy_import
 from core.logger_config import LOGGER
-from core.web3_connector import Web3Connector
+from core.rpc_guard import RPCUnavailableError
+from core.web3_connector import get_web3_connector
+
+# web3 is loaded by the first request that needs it, or by the startup warm-up
+web3 = lazy_import("web3")
+
+# Gas limit used for setMessage transactions
+SET_MESSAGE_GAS_LIMIT = 150000
+
 
 class InboxContract:
     """
@@ -29,7 +43,6 @@ class InboxContract:
             user (str): The user interacting with the contract.
             config (dict): The configuration dictionary.
         """
-        print(f"DEBUG: --init--: config = {config}")
         self.config = config
         self.contract_address = contract_address
 
@@ -38,26 +51,25 @@ class InboxContract:
             self.w3 = self.eth_account.w3
         else:
             self.eth_account = None
-            self.w3 = Web3Connector(self.config["network"]).get_web3()
+            self.w3 = get_web3_connector(self.config["network"]).get_web3()
             self.account = None
 
-        self.contract = self.load_contract(contract_name)
+        self.abi = self.load_contract(contract_name)
 
-    def load_contract(self, contract_name: str) -> Web3Contract:
+    def load_contract(self, contract_name: str) -> ContractAbi:
         """
-        Load the deployed Inbox contract using its ABI.
+        Load the codecs of the Inbox contract from the ABI index.
 
         Returns:
-            Web3.eth.Contract: The contract instance.
+            ContractAbi: The function codecs of the contract.
         """
-        abi_path = "build/" + contract_name + "ABI.json"
+        return get_abi_index().contract(contract_name)
 
-        with open(abi_path, "r", encoding="utf-8") as abi_file:
-            contract_abi = json.load(abi_file)
-
-        return self.w3.eth.contract(
-            address=self.contract_address, abi=contract_abi
-        )
+    def _call(self, function: str, *args: Any) -> Tuple[Any, ...]:
+        """Call a read-only function of this contract and return its decoded outputs."""
+        codec = self.abi.function(function, len(args))
+        return read_function(self.w3, self.config["network"].get("name"),
+                             self.contract_address, codec, list(args))
 
     def get_message(self) -> str:
         """
@@ -67,10 +79,12 @@ class InboxContract:
             str: The stored message.
         """
         try:
-            return self.contract.functions.message().call()
-        except ContractLogicError as e:
+            return self._call("message")[0]
+        except web3.exceptions.ContractLogicError as e:
             LOGGER.error("Failed to fetch message: %s", str(e))
             return "Error fetching message"
+        except RPCUnavailableError:
+            raise
         except Exception as e: # pylint: disable=broad-exception-caught
             LOGGER.error("Unexpected error while fetching message: %s", str(e))
             return "Error fetching message"
@@ -83,10 +97,12 @@ class InboxContract:
             int: The counter value.
         """
         try:
-            return self.contract.functions.counter().call()
-        except ContractLogicError as e:
+            return self._call("counter")[0]
+        except web3.exceptions.ContractLogicError as e:
             LOGGER.error("Failed to fetch counter: %s", str(e))
             return -1
+        except RPCUnavailableError:
+            raise
         except Exception as e: # pylint: disable=broad-exception-caught
             LOGGER.error("Unexpected error while fetching message: %s", str(e))
             return -1
@@ -104,26 +120,33 @@ class InboxContract:
         try:
             nonce = self.eth_account.get_nonce()
             gas_price = self.eth_account.get_gas_price()
-            gas_limit = 150000
+            gas_limit = SET_MESSAGE_GAS_LIMIT
 
-            txn = self.contract.functions.setMessage(new_message).build_transaction({
+            txn = {
                 "from": self.eth_account.account.address,
+                "to": to_checksum_address(self.contract_address),
+                "data": to_hex(self.abi.function("setMessage", 1).encode_input([new_message])),
+                "value": 0,
                 "nonce": nonce,
                 "gas": gas_limit,
                 "gasPrice": gas_price,
-            })
+                "chainId": self.config["network"].get("chain_id") or self.w3.eth.chain_id,
+            }
 
             signed_txn = self.eth_account.sign_transaction(txn)
             tx_hash = self.eth_account.send_transaction(signed_txn)
 
             LOGGER.info("Message update transaction sent: %s", tx_hash)
+            track_transaction(self.eth_account, txn, tx_hash)
             return tx_hash
-        except TransactionNotFound as e:
+        except web3.exceptions.TransactionNotFound as e:
             LOGGER.error("Transaction not found: %s", str(e))
             return "Error updating message"
         except ValueError as e:
             LOGGER.error("Invalid transaction parameters: %s", str(e))
             return "Error updating message"
+        except RPCUnavailableError:
+            raise
         except Exception as e: # pylint: disable=broad-exception-caught
             LOGGER.error("Unexpected error while updating message: %s", str(e))
             return "Error updating message"
@@ -140,19 +163,98 @@ class InboxContract:
             dict: A dictionary containing sum, difference, product, and is_zero.
         """
         try:
-            result = self.contract.functions.doMath(a, b).call()
+            result = self._call("doMath", a, b)
             return {
                 "sum": result[0],
                 "diff": result[1],
                 "product": result[2],
                 "is_zero": result[3],
             }
-        except ContractLogicError as e:
+        except web3.exceptions.ContractLogicError as e:
             LOGGER.error("Math operation failed: %s", str(e))
             return {"error": "Math operation failed"}
         except ValueError as e:
             LOGGER.error("Invalid input for math operation: %s", str(e))
             return {"error": "Invalid input"}
+        except RPCUnavailableError:
+            raise
         except Exception as e: # pylint: disable=broad-exception-caught
             LOGGER.error("Unexpected error during math operation: %s", str(e))
             return {"error": "Math operation failed"}
+
+
+def bulk_update_messages(eth_account: EthereumAccount, updates: List[Dict[str, str]]) -> List[dict]:
+    """
+    Update the message on many Inbox contracts with a single nonce and gas price lookup.
+
+    Transactions are built and signed in one pass using sequential nonces, then
+    broadcast together in one JSON-RPC batch. If one is rejected, the updates after it
+    are cancelled and reported as blocked, so none is left waiting behind a nonce gap.
+
+    Args:
+        eth_account (EthereumAccount): The account sending the updates.
+        updates (List[Dict[str, str]]): Items with `contract_name`, `contract_address`
+            and `message` keys.
+
+    Returns:
+        List[dict]: One result per update with `contract_address`, `tx_hash` and `error`.
+    """
+    w3 = eth_account.w3
+    chain_id = eth_account.config["network"].get("chain_id") or w3.eth.chain_id
+    gas_price = eth_account.get_gas_price()
+    nonce = eth_account.get_nonce("pending")
+
+    results = [{"contract_address": u["contract_address"], "tx_hash": None, "error": None}
+               for u in updates]
+    index = get_abi_index()
+    transactions = []
+    pending = []
+
+    for position, update in enumerate(updates):
+        try:
+            set_message = index.contract(update["contract_name"]).function("setMessage", 1)
+            transactions.append({
+                "to": to_checksum_address(update["contract_address"]),
+                "data": to_hex(set_message.encode_input([update["message"]])),
+                "value": 0,
+                "nonce": nonce + len(transactions),
+                "gas": SET_MESSAGE_GAS_LIMIT,
+                "gasPrice": gas_price,
+                "chainId": chain_id,
+            })
+            pending.append(position)
+        except (OSError, ValueError) as e:
+            LOGGER.error("Skipping update for %s: %s", update.get("contract_address"), e)
+            results[position]["error"] = str(e)
+
+    sent = eth_account.broadcast_sequence(transactions) if transactions else []
+    for position, transaction, (tx_hash, error) in zip(pending, transactions, sent):
+        results[position]["tx_hash"] = tx_hash
+        results[position]["error"] = error
+        if tx_hash:
+            track_transaction(eth_account, transaction, tx_hash)
+
+    return results
+
+
+def read_inbox_state(config: dict, contract_address: str, contract_name: str) -> Callable[[], dict]:
+    """
+    Build a function that reads the message and counter of an Inbox contract.
+
+    Args:
+        config (dict): The configuration dictionary, with the network selected.
+        contract_address (str): The deployed contract address.
+        contract_name (str): The contract name used to locate its ABI.
+
+    Returns:
+        Callable[[], dict]: Returns `{"message": ..., "count": ...}` when called.
+    """
+    contracts = []
+
+    def read() -> dict:
+        # Built on first use, so callers that only need an existing watcher pay nothing
+        if not contracts:
+            contracts.append(InboxContract(contract_address, contract_name, None, config))
+        return {"message": contracts[0].get_message(), "count": contracts[0].get_counter()}
+
+    return read
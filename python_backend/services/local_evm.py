@@ -0,0 +1,518 @@
+"""
+Local EVM execution module.
+
+This module runs `pure` (and, with a storage cache, `view`) contract functions in a
+small in-process EVM interpreter using the deployed runtime bytecode, instead of an
+`eth_call` round trip. Only the opcodes such functions need are implemented: anything
+that depends on the environment (calls, balances, block data, logs, storage writes)
+raises `UnsupportedOperation`, and the caller falls back to RPC.
+
+Runtime bytecode is fetched once per contract with `eth_getCode`. For `view`
+functions, storage slots are read with `eth_getStorageAt` on first use and cached
+until the next block (or for a short TTL on networks without a block subscription).
+"""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from eth_utils import keccak, to_checksum_address, to_hex
+from services.abi_codec import FunctionCodec
+from services.contract_calls import read_function
+from core.event_bus import EVENT_BUS, EventBus
+from core.lazy_import import lazy_import
+from core.logger_config import LOGGER
+from core.rpc_guard import RPCUnavailableError
+
+if TYPE_CHECKING:
+    from web3 import Web3
+
+# Reverts are raised as web3's ContractLogicError, like the RPC path does
+web3 = lazy_import("web3")
+
+UINT_MAX = 2 ** 256 - 1
+SIGN_BIT = 2 ** 255
+
+# Reported by the GAS opcode; execution is bounded by `max_steps` instead
+GAS_REMAINING = 30_000_000
+
+# Selectors of the standard revert payloads
+ERROR_SELECTOR = bytes.fromhex("08c379a0")
+PANIC_SELECTOR = bytes.fromhex("4e487b71")
+
+
+class UnsupportedOperation(Exception):
+    """
+    Raised when the code needs something the local interpreter does not provide.
+    """
+
+
+class MissingState(Exception):
+    """
+    Raised when a storage slot is needed that the state provider does not have.
+    """
+    def __init__(self, slot: int):
+        super().__init__(f"Storage slot {slot:#x} is not available locally")
+        self.slot = slot
+
+
+def _signed(value: int) -> int:
+    """Interpret a 256-bit word as a two's complement integer."""
+    return value - 2 ** 256 if value & SIGN_BIT else value
+
+
+def _jump_destinations(code: bytes) -> set:
+    """Return the offsets of every JUMPDEST that is not inside PUSH data."""
+    destinations = set()
+    pc = 0
+    while pc < len(code):
+        op = code[pc]
+        if op == 0x5B:
+            destinations.add(pc)
+        elif 0x60 <= op <= 0x7F:
+            pc += op - 0x5F
+        pc += 1
+    return destinations
+
+
+def revert_message(data: bytes) -> str:
+    """
+    Render revert data the way nodes report it.
+
+    Args:
+        data (bytes): The revert payload.
+
+    Returns:
+        str: "execution reverted" followed by the reason, if any.
+    """
+    if data[:4] == ERROR_SELECTOR and len(data) >= 68:
+        length = int.from_bytes(data[36:68], "big")
+        reason = data[68:68 + length].decode("utf-8", errors="replace")
+        return f"execution reverted: {reason}"
+    if data[:4] == PANIC_SELECTOR and len(data) >= 36:
+        return f"execution reverted: panic code {int.from_bytes(data[4:36], 'big'):#x}"
+    return "execution reverted"
+
+
+class LocalEVM:
+    """
+    Minimal EVM interpreter for side-effect-free calls.
+    """
+
+    def __init__(self, code: bytes, max_steps: int = 1_000_000,
+                 max_memory: int = 1 << 20):
+        """
+        Initialise the LocalEVM.
+
+        Args:
+            code (bytes): The runtime bytecode.
+            max_steps (int): The maximum number of instructions per call.
+            max_memory (int): The maximum memory size in bytes per call.
+        """
+        self.code = code
+        self.max_steps = max_steps
+        self.max_memory = max_memory
+        self.jump_destinations = _jump_destinations(code)
+
+
+    def execute(self, calldata: bytes,
+                sload: Optional[Callable[[int], int]] = None,
+                address: bytes = bytes(20), caller: bytes = bytes(20)) -> bytes:
+        """
+        Run the code as a static call.
+
+        Args:
+            calldata (bytes): The call input.
+            sload (Optional[Callable[[int], int]]): Returns the value of a storage slot,
+                or raises MissingState. Without it, any SLOAD is unsupported.
+            address (bytes): The address of the contract (ADDRESS).
+            caller (bytes): The sender of the call (CALLER and ORIGIN).
+
+        Returns:
+            bytes: The return data.
+
+        Raises:
+            ContractLogicError: If the code reverts.
+            UnsupportedOperation: If the code needs an unsupported opcode or limit.
+            MissingState: If a storage slot is not available.
+        """
+        # pylint: disable=too-many-branches,too-many-statements,too-many-locals
+        code = self.code
+        stack: List[int] = []
+        memory = bytearray()
+        pc = 0
+        steps = 0
+
+        def pop() -> int:
+            if not stack:
+                raise UnsupportedOperation("stack underflow")
+            return stack.pop()
+
+        def push(value: int) -> None:
+            if len(stack) >= 1024:
+                raise UnsupportedOperation("stack overflow")
+            stack.append(value & UINT_MAX)
+
+        def expand(offset: int, size: int) -> None:
+            if size == 0:
+                return
+            end = offset + size
+            if end > self.max_memory:
+                raise UnsupportedOperation("memory limit exceeded")
+            if end > len(memory):
+                memory.extend(bytes(((end + 31) // 32) * 32 - len(memory)))
+
+        def read_padded(source: bytes, offset: int, size: int) -> bytes:
+            chunk = source[offset:offset + size] if offset < len(source) else b""
+            return chunk + bytes(size - len(chunk))
+
+        while pc < len(code):
+            steps += 1
+            if steps > self.max_steps:
+                raise UnsupportedOperation("step limit exceeded")
+
+            op = code[pc]
+            pc += 1
+
+            # Push, dup and swap
+            if 0x60 <= op <= 0x7F:
+                width = op - 0x5F
+                push(int.from_bytes(read_padded(code, pc, width), "big"))
+                pc += width
+            elif op == 0x5F:
+                push(0)
+            elif 0x80 <= op <= 0x8F:
+                depth = op - 0x7F
+                if len(stack) < depth:
+                    raise UnsupportedOperation("stack underflow")
+                push(stack[-depth])
+            elif 0x90 <= op <= 0x9F:
+                depth = op - 0x8E
+                if len(stack) < depth:
+                    raise UnsupportedOperation("stack underflow")
+                stack[-1], stack[-depth] = stack[-depth], stack[-1]
+            elif op == 0x50:
+                pop()
+
+            # Arithmetic
+            elif op == 0x01:
+                push(pop() + pop())
+            elif op == 0x02:
+                push(pop() * pop())
+            elif op == 0x03:
+                a, b = pop(), pop()
+                push(a - b)
+            elif op == 0x04:
+                a, b = pop(), pop()
+                push(a // b if b else 0)
+            elif op == 0x05:
+                a, b = _signed(pop()), _signed(pop())
+                if b == 0:
+                    push(0)
+                else:
+                    sign = -1 if (a < 0) != (b < 0) else 1
+                    push(sign * (abs(a) // abs(b)))
+            elif op == 0x06:
+                a, b = pop(), pop()
+                push(a % b if b else 0)
+            elif op == 0x07:
+                a, b = _signed(pop()), _signed(pop())
+                if b == 0:
+                    push(0)
+                else:
+                    sign = -1 if a < 0 else 1
+                    push(sign * (abs(a) % abs(b)))
+            elif op == 0x08:
+                a, b, n = pop(), pop(), pop()
+                push((a + b) % n if n else 0)
+            elif op == 0x09:
+                a, b, n = pop(), pop(), pop()
+                push((a * b) % n if n else 0)
+            elif op == 0x0A:
+                base, exponent = pop(), pop()
+                push(pow(base, exponent, 2 ** 256))
+            elif op == 0x0B:
+                size, value = pop(), pop()
+                if size < 31:
+                    bit = size * 8 + 7
+                    mask = (1 << bit) - 1
+                    value = value | (UINT_MAX - mask) if value & (1 << bit) else value & mask
+                push(value)
+
+            # Comparison and bitwise logic
+            elif op == 0x10:
+                a, b = pop(), pop()
+                push(int(a < b))
+            elif op == 0x11:
+                a, b = pop(), pop()
+                push(int(a > b))
+            elif op == 0x12:
+                a, b = _signed(pop()), _signed(pop())
+                push(int(a < b))
+            elif op == 0x13:
+                a, b = _signed(pop()), _signed(pop())
+                push(int(a > b))
+            elif op == 0x14:
+                push(int(pop() == pop()))
+            elif op == 0x15:
+                push(int(pop() == 0))
+            elif op == 0x16:
+                push(pop() & pop())
+            elif op == 0x17:
+                push(pop() | pop())
+            elif op == 0x18:
+                push(pop() ^ pop())
+            elif op == 0x19:
+                push(UINT_MAX - pop())
+            elif op == 0x1A:
+                index, value = pop(), pop()
+                push((value >> (248 - index * 8)) & 0xFF if index < 32 else 0)
+            elif op == 0x1B:
+                shift, value = pop(), pop()
+                push(value << shift if shift < 256 else 0)
+            elif op == 0x1C:
+                shift, value = pop(), pop()
+                push(value >> shift if shift < 256 else 0)
+            elif op == 0x1D:
+                shift, value = pop(), _signed(pop())
+                push(value >> min(shift, 256))
+
+            elif op == 0x20:
+                offset, size = pop(), pop()
+                expand(offset, size)
+                push(int.from_bytes(keccak(bytes(memory[offset:offset + size])), "big"))
+
+            # Call environment
+            elif op == 0x30:
+                push(int.from_bytes(address, "big"))
+            elif op in (0x32, 0x33):
+                push(int.from_bytes(caller, "big"))
+            elif op == 0x34:
+                push(0)
+            elif op == 0x35:
+                push(int.from_bytes(read_padded(calldata, pop(), 32), "big"))
+            elif op == 0x36:
+                push(len(calldata))
+            elif op in (0x37, 0x39):
+                dest, offset, size = pop(), pop(), pop()
+                expand(dest, size)
+                source = calldata if op == 0x37 else code
+                memory[dest:dest + size] = read_padded(source, offset, size)
+            elif op == 0x38:
+                push(len(code))
+            elif op == 0x3D:
+                push(0)
+            elif op == 0x3E:
+                dest, offset, size = pop(), pop(), pop()
+                if offset + size > 0:
+                    raise UnsupportedOperation("RETURNDATACOPY out of bounds")
+
+            # Memory, storage and flow
+            elif op == 0x51:
+                offset = pop()
+                expand(offset, 32)
+                push(int.from_bytes(memory[offset:offset + 32], "big"))
+            elif op == 0x52:
+                offset, value = pop(), pop()
+                expand(offset, 32)
+                memory[offset:offset + 32] = value.to_bytes(32, "big")
+            elif op == 0x53:
+                offset, value = pop(), pop()
+                expand(offset, 1)
+                memory[offset] = value & 0xFF
+            elif op == 0x54:
+                if sload is None:
+                    raise UnsupportedOperation("SLOAD without a storage provider")
+                push(sload(pop()))
+            elif op == 0x56:
+                pc = self._jump(pop())
+            elif op == 0x57:
+                dest, condition = pop(), pop()
+                if condition:
+                    pc = self._jump(dest)
+            elif op == 0x58:
+                push(pc - 1)
+            elif op == 0x59:
+                push(len(memory))
+            elif op == 0x5A:
+                push(GAS_REMAINING)
+            elif op == 0x5B:
+                pass
+            elif op == 0x5C:
+                # Transient storage is empty in a fresh static call
+                pop()
+                push(0)
+            elif op == 0x5E:
+                dest, offset, size = pop(), pop(), pop()
+                expand(max(dest, offset), size)
+                memory[dest:dest + size] = memory[offset:offset + size]
+
+            # Halting
+            elif op == 0x00:
+                return b""
+            elif op == 0xF3:
+                offset, size = pop(), pop()
+                expand(offset, size)
+                return bytes(memory[offset:offset + size])
+            elif op == 0xFD:
+                offset, size = pop(), pop()
+                expand(offset, size)
+                data = bytes(memory[offset:offset + size])
+                raise web3.exceptions.ContractLogicError(revert_message(data), data=to_hex(data))
+            elif op == 0xFE:
+                raise web3.exceptions.ContractLogicError("invalid opcode", data="0x")
+            else:
+                raise UnsupportedOperation(f"opcode {op:#04x} at {pc - 1}")
+
+        return b""
+
+
+    def _jump(self, destination: int) -> int:
+        """Validate a jump target."""
+        if destination not in self.jump_destinations:
+            raise UnsupportedOperation(f"invalid jump destination {destination}")
+        return destination
+
+
+class LocalExecutor:
+    """
+    Runs read-only functions of one network's contracts locally, falling back to RPC.
+    """
+
+    def __init__(self, network_name: str, w3: "Web3", enabled: bool = False,
+                 execute_views: bool = False, storage_ttl_seconds: float = 12.0,
+                 max_contracts: int = 256,
+                 bus: EventBus = EVENT_BUS, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise the LocalExecutor.
+
+        Args:
+            network_name (str): The network the contracts are deployed on.
+            w3 (Web3): The Web3 instance used for code, storage and fallbacks.
+            enabled (bool): Run `pure` functions locally; when False everything uses RPC.
+            execute_views (bool): Also run `view` functions locally against cached storage.
+            storage_ttl_seconds (float): How long a cached storage slot is reused when
+                no new-head event clears it first.
+            max_contracts (int): The maximum number of runtime bytecodes kept.
+            bus (EventBus): The bus whose new-head events clear the storage cache.
+            clock (Callable[[], float]): Monotonic clock, replaceable in tests.
+        """
+        self.network_name = network_name
+        self.w3 = w3
+        self.enabled = enabled
+        self.execute_views = execute_views
+        self.storage_ttl_seconds = storage_ttl_seconds
+        self.max_contracts = max_contracts
+        self._clock = clock
+        self._evms: Dict[str, LocalEVM] = {}
+        self._storage: Dict[Tuple[str, int], Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        bus.subscribe(("new_head", network_name), lambda _event: self.clear_storage())
+
+
+    def clear_storage(self) -> None:
+        """Forget cached storage, e.g. because a new block was mined."""
+        with self._lock:
+            self._storage.clear()
+
+
+    def _evm(self, address: str) -> LocalEVM:
+        """Return the interpreter for a contract, fetching its runtime code once."""
+        with self._lock:
+            evm = self._evms.get(address)
+        if evm is not None:
+            return evm
+
+        code = bytes(self.w3.eth.get_code(to_checksum_address(address)))
+        if not code:
+            raise UnsupportedOperation(f"no code at {address}")
+        evm = LocalEVM(code)
+        with self._lock:
+            if len(self._evms) >= self.max_contracts:
+                self._evms.pop(next(iter(self._evms)))
+            self._evms[address] = evm
+        return evm
+
+
+    def _sload(self, address: str) -> Callable[[int], int]:
+        """Return a storage reader for a contract backed by the slot cache."""
+        checksum_address = to_checksum_address(address)
+
+        def sload(slot: int) -> int:
+            now = self._clock()
+            with self._lock:
+                cached = self._storage.get((address, slot))
+            if cached and now - cached[1] < self.storage_ttl_seconds:
+                return cached[0]
+
+            value = int.from_bytes(self.w3.eth.get_storage_at(checksum_address, slot), "big")
+            with self._lock:
+                self._storage[(address, slot)] = (value, now)
+            return value
+
+        return sload
+
+
+    def call(self, contract_address: str, codec: FunctionCodec, args: List[Any]) -> Tuple[Any, ...]:
+        """
+        Call a read-only function, locally when possible.
+
+        Args:
+            contract_address (str): The contract address.
+            codec (FunctionCodec): The function to call.
+            args (List[Any]): The positional arguments.
+
+        Returns:
+            Tuple[Any, ...]: The decoded return values.
+
+        Raises:
+            ContractLogicError: If the call reverts.
+        """
+        local = self.enabled and (codec.state_mutability == "pure" or
+                                  (self.execute_views and codec.state_mutability == "view"))
+        if local:
+            address = contract_address.lower()
+            try:
+                evm = self._evm(address)
+                sload = self._sload(address) if codec.state_mutability == "view" else None
+                output = evm.execute(codec.encode_input(args), sload,
+                                     address=bytes.fromhex(address[2:]))
+                return codec.decode_output(output)
+            except (UnsupportedOperation, MissingState) as e:
+                LOGGER.debug("Falling back to RPC for %s.%s: %s",
+                             contract_address, codec.name, e)
+            except (OSError, RPCUnavailableError) as e:
+                LOGGER.debug("Could not load state for %s.%s: %s",
+                             contract_address, codec.name, e)
+
+        return read_function(self.w3, self.network_name, contract_address, codec, args)
+
+
+_EXECUTORS: Dict[str, LocalExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def get_local_executor(config: dict, w3: "Web3") -> LocalExecutor:
+    """
+    Return the shared LocalExecutor of the selected network.
+
+    Args:
+        config (dict): The configuration dictionary, with the network selected.
+        w3 (Web3): The Web3 instance of the network.
+
+    Returns:
+        LocalExecutor: The executor, configured from the `[local_evm]` section.
+    """
+    name = config["network"].get("name")
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(name)
+        if executor is None:
+            settings = config.get("local_evm", {})
+            executor = LocalExecutor(
+                name, w3,
+                enabled=settings.get("enabled", False),
+                execute_views=settings.get("execute_views", False),
+                storage_ttl_seconds=settings.get("storage_ttl_seconds", 12.0),
+            )
+            _EXECUTORS[name] = executor
+        return executor
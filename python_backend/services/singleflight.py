@@ -0,0 +1,120 @@
+"""
+Singleflight module.
+
+This module provides request coalescing: while a call for a given key is in flight,
+identical calls wait for it and share its result (or exception) instead of issuing
+their own. It is used by the contract-read layer so that a burst of identical
+`eth_call`s for the same contract results in a single RPC request.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    """An in-flight synchronous call and its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls, for both threaded and asyncio callers.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._futures: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Run `func` unless a call with the same key is already in flight.
+
+        Args:
+            key (Hashable): Identifies identical calls.
+            func (Callable[[], Any]): The call to make if none is in flight.
+
+        Returns:
+            Any: The result of the single in-flight call.
+
+        Raises:
+            Exception: Whatever the in-flight call raised.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+    async def do_async(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `func()` unless a call with the same key is already in flight.
+
+        Args:
+            key (Hashable): Identifies identical calls.
+            func (Callable[[], Awaitable[Any]]): Returns the awaitable to run if none
+                is in flight.
+
+        Returns:
+            Any: The result of the single in-flight call.
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            future = self._futures.get(loop_key)
+            leader = future is None
+            if leader:
+                future = loop.create_future()
+                self._futures[loop_key] = future
+
+        if not leader:
+            # Shield so a cancelled follower does not cancel the shared call
+            return await asyncio.shield(future)
+
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case there are no followers
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._futures[loop_key]
+
+
+    def in_flight(self) -> int:
+        """Return the number of distinct calls currently in flight."""
+        with self._lock:
+            return len(self._calls) + len(self._futures)
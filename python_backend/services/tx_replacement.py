@@ -0,0 +1,547 @@
+"""
+Stuck-transaction replacement engine.
+
+This module watches a transaction sent through an `EthereumAccount` and, if it is
+not mined within the configured time-to-inclusion target, re-broadcasts it with
+the same nonce and an escalated fee. Every replacement hash is tracked so that
+whichever version ends up mined is detected.
+
+Lifecycle changes (pending, replaced, mined, failed), with the decoded function
+call, are published on the event bus under `("tx", network)` so that streaming
+endpoints can forward them to clients, and recorded as span events. Waiting for the
+receipt is traced as a `tx.confirm` span linked to the span that sent the
+transaction, even when it runs in the background.
+
+Transactions sent by request handlers are followed by a single `TransactionTracker`
+thread that polls every pending hash in turn, instead of one thread per transaction.
+These are only replaced with `[replacement] replace_tracked = true` (or per call);
+otherwise the tracker just reports their lifecycle.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from eth_abi.exceptions import DecodingError
+from eth_utils import to_hex
+from services.abi_codec import get_abi_index, to_json_value
+from core.event_bus import EVENT_BUS
+from core.lazy_import import lazy_import
+from core.logger_config import LOGGER
+from core.metrics import PENDING_TRANSACTIONS
+from core.rpc_guard import RPCUnavailableError
+from core.tracing import current_span, get_tracer, start_span
+
+# web3 is loaded by the first request that needs it, or by the startup warm-up
+web3 = lazy_import("web3")
+
+# Nodes reject replacements that do not raise the fee by at least 10% (geth default)
+MIN_REPLACEMENT_BUMP_PERCENT = 10
+
+# Fields accepted when re-signing a transaction; anything else is node-only
+TRANSACTION_FIELDS = {
+    "nonce", "gas", "gasPrice", "maxFeePerGas", "maxPriorityFeePerGas",
+    "to", "value", "data", "chainId", "type", "accessList",
+}
+
+
+def sanitize_transaction(transaction: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Strip node-only fields (hash, blockNumber, v/r/s, ...) from a transaction dictionary.
+
+    Args:
+        transaction (dict): A built transaction or the result of `eth_getTransactionByHash`.
+
+    Returns:
+        dict: A transaction dictionary that can be signed again.
+    """
+    tx = dict(transaction)
+    if "input" in tx and "data" not in tx:
+        tx["data"] = tx["input"]
+    return {k: v for k, v in tx.items() if k in TRANSACTION_FIELDS}
+
+
+def decode_call(transaction: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Decode the contract function a transaction calls, for its lifecycle events.
+
+    Args:
+        transaction (dict): A sanitized transaction dictionary.
+
+    Returns:
+        Optional[dict]: `contract`, `function`, `signature` and `args`, or None for
+            deployments, plain transfers and functions of contracts not compiled here.
+    """
+    data = transaction.get("data")
+    if not transaction.get("to") or not data:
+        return None
+    try:
+        call = get_abi_index().decode_calldata(data)
+    except (ValueError, DecodingError):
+        return None
+    call["args"] = {name: to_json_value(value) for name, value in call["args"].items()}
+    return call
+
+
+class ReplacementPolicy:
+    """
+    Controls when and how much a pending transaction's fee is escalated.
+    """
+
+    def __init__(self,
+                 target_inclusion_seconds: float = 120,
+                 max_replacements: int = 4,
+                 curve: Union[str, List[float]] = "exponential",
+                 bump_factor: float = 1.125,
+                 max_fee_per_gas_gwei: Optional[float] = None,
+                 max_total_fee_eth: Optional[float] = None,
+                 poll_interval_seconds: float = 5,
+                 timeout_seconds: float = 600):
+        """
+        Initialise the ReplacementPolicy.
+
+        Args:
+            target_inclusion_seconds (float): Time by which the last escalation step is reached.
+            max_replacements (int): The maximum number of replacement transactions.
+            curve (Union[str, List[float]]): "linear", "exponential", or explicit
+                multipliers of the original fee for each replacement step.
+            bump_factor (float): Per-step factor used by the named curves.
+            max_fee_per_gas_gwei (Optional[float]): Cap on the fee per gas.
+            max_total_fee_eth (Optional[float]): Cap on gas limit multiplied by fee per gas.
+            poll_interval_seconds (float): Delay between receipt polls.
+            timeout_seconds (float): Give up if nothing is mined after this long.
+        """
+        if isinstance(curve, str):
+            if curve not in ("linear", "exponential"):
+                raise ValueError(f"Unknown escalation curve '{curve}'")
+        elif not curve or not all(isinstance(m, (int, float)) and m > 0 for m in curve):
+            raise ValueError("An explicit escalation curve must be a non-empty list of "
+                             "positive multipliers")
+        if bump_factor < 1 + MIN_REPLACEMENT_BUMP_PERCENT / 100:
+            raise ValueError(
+                f"bump_factor must raise the fee by at least {MIN_REPLACEMENT_BUMP_PERCENT}%"
+            )
+
+        self.target_inclusion_seconds = target_inclusion_seconds
+        self.max_replacements = max_replacements
+        self.curve = curve
+        self.bump_factor = bump_factor
+        self.max_fee_per_gas_gwei = max_fee_per_gas_gwei
+        self.max_total_fee_eth = max_total_fee_eth
+        self.poll_interval_seconds = poll_interval_seconds
+        self.timeout_seconds = timeout_seconds
+
+
+    @classmethod
+    def from_config(cls, config: dict) -> "ReplacementPolicy":
+        """
+        Build a policy from the `[replacement]` section of the configuration.
+
+        Args:
+            config (dict): The configuration dictionary.
+
+        Returns:
+            ReplacementPolicy: The policy, using defaults for missing keys.
+        """
+        settings = dict(config.get("replacement", {}))
+        # Read by track_transaction, not part of the policy
+        settings.pop("replace_tracked", None)
+        return cls(**settings)
+
+
+    def multiplier(self, step: int) -> float:
+        """
+        Return the multiplier of the original fee for a replacement step (1-based).
+        """
+        if isinstance(self.curve, str):
+            if self.curve == "linear":
+                return 1 + (self.bump_factor - 1) * step
+            return self.bump_factor ** step
+
+        return self.curve[min(step, len(self.curve)) - 1]
+
+
+    def replacement_interval(self) -> float:
+        """Return the time to wait after a broadcast before escalating the fee."""
+        return self.target_inclusion_seconds / max(1, self.max_replacements)
+
+
+    def fee_cap(self, gas: int) -> Optional[int]:
+        """
+        Return the highest fee per gas (in wei) allowed for a transaction.
+
+        Args:
+            gas (int): The transaction gas limit.
+
+        Returns:
+            Optional[int]: The cap in wei, or None if the policy is uncapped.
+        """
+        caps = []
+        if self.max_fee_per_gas_gwei is not None:
+            caps.append(int(self.max_fee_per_gas_gwei * 10**9))
+        if self.max_total_fee_eth is not None and gas:
+            caps.append(int(self.max_total_fee_eth * 10**18) // gas)
+        return min(caps) if caps else None
+
+
+class TransactionReplacer:
+    """
+    Waits for a transaction to be mined, replacing it with higher fees when it is stuck.
+    """
+
+    def __init__(self, eth_account, transaction: dict, tx_hash: str,
+                 policy: Optional[ReplacementPolicy] = None,
+                 replace: bool = True,
+                 sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise the TransactionReplacer.
+
+        Args:
+            eth_account (EthereumAccount): The account that signed the transaction.
+            transaction (dict): The transaction as it was signed.
+            tx_hash (str): The hash of the broadcast transaction.
+            policy (Optional[ReplacementPolicy]): The escalation policy.
+            replace (bool): Replace the transaction when it is stuck; when False it is
+                only watched.
+            sleep (Callable[[float], None]): Sleep function, replaceable in tests.
+            clock (Callable[[], float]): Monotonic clock, replaceable in tests.
+        """
+        self.eth_account = eth_account
+        self.transaction = sanitize_transaction(transaction)
+        self.original_transaction = dict(self.transaction)
+        # The function called, included in every lifecycle event
+        self.call = decode_call(self.transaction)
+        self.policy = policy or ReplacementPolicy()
+        self.replace = replace
+        self.tx_hashes = [tx_hash]
+        self.replacements = 0
+        self.network_name = eth_account.config["network"].get("name")
+        # The span that sent the transaction, linked from the confirmation span
+        self.origin = current_span().context
+        # The `tx.confirm` span, once waiting has started
+        self.span = None
+        self.started_at = None
+        self.last_broadcast = None
+        self._sleep = sleep
+        self._clock = clock
+
+
+    def _escalated_fees(self, step: int) -> Optional[Dict[str, int]]:
+        """
+        Compute the fee fields for a replacement step.
+
+        Returns:
+            Optional[dict]: The new fee fields, or None if the cap prevents a valid bump.
+        """
+        cap = self.policy.fee_cap(self.transaction.get("gas", 0))
+        network_price = self.eth_account.get_gas_price()
+        multiplier = self.policy.multiplier(step)
+
+        fee_keys = ["maxFeePerGas", "maxPriorityFeePerGas"] \
+            if "maxFeePerGas" in self.transaction else ["gasPrice"]
+
+        fees, required = {}, {}
+        for key in fee_keys:
+            previous = self.transaction[key]
+            required[key] = previous + (previous * MIN_REPLACEMENT_BUMP_PERCENT + 99) // 100
+            target = int(self.original_transaction[key] * multiplier)
+            if key != "maxPriorityFeePerGas":
+                target = max(target, network_price)
+            fees[key] = max(target, required[key])
+
+            if cap is not None and fees[key] > cap:
+                if required[key] > cap:
+                    return None
+                fees[key] = cap
+
+        if "maxPriorityFeePerGas" in fees:
+            fees["maxPriorityFeePerGas"] = min(fees["maxPriorityFeePerGas"], fees["maxFeePerGas"])
+            # Clamped below the required bump, the node would reject it as underpriced
+            if fees["maxPriorityFeePerGas"] < required["maxPriorityFeePerGas"]:
+                return None
+        return fees
+
+
+    def _replace(self) -> bool:
+        """
+        Re-sign and broadcast the transaction with an escalated fee.
+
+        Returns:
+            bool: True if a replacement was broadcast.
+        """
+        step = self.replacements + 1
+        fees = self._escalated_fees(step)
+        if fees is None:
+            LOGGER.warning("Fee cap reached for nonce %s, no further replacements",
+                           self.transaction.get("nonce"))
+            self.replacements = self.policy.max_replacements
+            return False
+
+        new_tx = {**self.transaction, **fees}
+        try:
+            signed_tx = self.eth_account.sign_transaction(new_tx)
+            tx_hash = self.eth_account.send_transaction(signed_tx)
+        except (ValueError, web3.exceptions.Web3Exception) as e:
+            # Most likely one of the earlier versions was mined in the meantime
+            LOGGER.warning("Replacement for nonce %s rejected: %s", new_tx.get("nonce"), e)
+            self.replacements = step
+            return False
+
+        LOGGER.info("Replaced transaction %s with %s (step %d, fees %s)",
+                    self.tx_hashes[-1], tx_hash, step, fees)
+        self.publish("replaced", tx_hash, replaces=self.tx_hashes[-1])
+        self.transaction = new_tx
+        self.tx_hashes.append(tx_hash)
+        self.replacements = step
+        return True
+
+
+    def publish(self, status: str, tx_hash: str, **details: Any) -> None:
+        """
+        Publish a lifecycle event for the transaction on the event bus.
+
+        Args:
+            status (str): One of "pending", "replaced", "mined" or "failed".
+            tx_hash (str): The hash the event refers to.
+            **details: Extra fields to include in the event.
+        """
+        to = self.transaction.get("to")
+        (self.span or current_span()).add_event(f"tx.{status}", tx_hash=tx_hash)
+        EVENT_BUS.publish(("tx", self.network_name), {
+            "status": status,
+            "tx_hash": tx_hash,
+            "nonce": self.transaction.get("nonce"),
+            "to": to.lower() if isinstance(to, str) else to,
+            "call": self.call,
+            **details,
+        })
+
+
+    def _find_receipt(self):
+        """Return the receipt of whichever tracked hash has been mined, if any."""
+        for tx_hash in reversed(self.tx_hashes):
+            try:
+                receipt = self.eth_account.w3.eth.get_transaction_receipt(tx_hash)
+            except web3.exceptions.TransactionNotFound:
+                continue
+            except (OSError, RPCUnavailableError) as e:
+                # The node is unreachable for now; keep waiting until the timeout
+                LOGGER.warning("Could not poll receipt for %s: %s", tx_hash, e)
+                return None
+            if receipt:
+                return receipt
+        return None
+
+
+    def confirm_span_attributes(self) -> Dict[str, Any]:
+        """Return the initial attributes of the `tx.confirm` span."""
+        return {"network": self.network_name, "tx.hash": self.tx_hashes[0],
+                "tx.nonce": self.transaction.get("nonce")}
+
+
+    def wait_for_receipt(self):
+        """
+        Poll until one of the tracked transactions is mined.
+
+        Returns:
+            dict: The transaction receipt.
+
+        Raises:
+            TimeoutError: If nothing is mined within the policy timeout.
+        """
+        with start_span("tx.confirm", attributes=self.confirm_span_attributes(),
+                        links=[self.origin]) as span:
+            self.span = span
+            receipt = self._poll_for_receipt()
+            span.set_attribute("tx.replacements", self.replacements)
+            span.set_attribute("tx.block_number", receipt.get("blockNumber"))
+            return receipt
+
+
+    def _poll_for_receipt(self):
+        """Poll for the receipt, replacing the transaction while it is stuck."""
+        while True:
+            receipt = self.poll()
+            if receipt:
+                return receipt
+            self._sleep(self.policy.poll_interval_seconds)
+
+
+    def poll(self):
+        """
+        Check once whether a tracked transaction was mined, escalating the fee if it is due.
+
+        Returns:
+            Optional[dict]: The receipt, or None if nothing is mined yet.
+
+        Raises:
+            TimeoutError: If nothing is mined within the policy timeout.
+        """
+        now = self._clock()
+        if self.started_at is None:
+            self.started_at = self.last_broadcast = now
+
+        receipt = self._find_receipt()
+        if receipt:
+            LOGGER.info("Transaction confirmed: %s", receipt["transactionHash"].hex())
+            self.publish("mined" if receipt.get("status", 1) else "failed",
+                         to_hex(receipt["transactionHash"]),
+                         block_number=receipt.get("blockNumber"))
+            return receipt
+
+        if now - self.started_at >= self.policy.timeout_seconds:
+            error = (f"Transaction not confirmed after {self.policy.timeout_seconds}s "
+                     f"(hashes: {', '.join(self.tx_hashes)})")
+            self.publish("failed", self.tx_hashes[-1], error=error)
+            raise TimeoutError(error)
+
+        if self.replace and self.replacements < self.policy.max_replacements and \
+                now - self.last_broadcast >= self.policy.replacement_interval():
+            LOGGER.warning("Transaction %s is likely stuck, escalating fee", self.tx_hashes[-1])
+            self._replace()
+            self.last_broadcast = now
+
+        LOGGER.debug("Waiting for transaction confirmation: %s", self.tx_hashes[-1])
+        return None
+
+
+class TransactionTracker:
+    """
+    Follows many pending transactions from one background thread.
+
+    Each transaction is polled every `poll_interval_seconds` of its policy; the
+    thread sleeps until the next one is due and is started by the first `track`.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialise the TransactionTracker.
+
+        Args:
+            clock (Callable[[], float]): Monotonic clock, replaceable in tests.
+        """
+        self._clock = clock
+        self._cond = threading.Condition()
+        # [next poll time, replacer, future] for every transaction still pending
+        self._entries: List[list] = []
+        self._thread: Optional[threading.Thread] = None
+
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._entries)
+
+
+    def track(self, replacer: TransactionReplacer, start: bool = True) -> Future:
+        """
+        Add a transaction to the polling loop.
+
+        Args:
+            replacer (TransactionReplacer): The replacer following the transaction.
+            start (bool): Start the background thread if it is not running.
+
+        Returns:
+            Future: Resolves to the receipt, or raises TimeoutError.
+        """
+        future: Future = Future()
+        first_poll = self._clock() + replacer.policy.poll_interval_seconds
+        with self._cond:
+            self._entries.append([first_poll, replacer, future])
+            if start and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="tx-tracker",
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+
+    def poll_once(self) -> None:
+        """Poll every transaction that is due once, resolving those that are done."""
+        now = self._clock()
+        with self._cond:
+            due = [entry for entry in self._entries if entry[0] <= now]
+
+        for entry in due:
+            _, replacer, future = entry
+            if replacer.span is None:
+                # Runs in the tracker thread, so the span starts a trace of its own
+                replacer.span = get_tracer().create_span(
+                    "tx.confirm", attributes=replacer.confirm_span_attributes(),
+                    links=[replacer.origin])
+            try:
+                receipt = replacer.poll()
+            except Exception as e: # pylint: disable=broad-exception-caught
+                self._finish(entry, error=e)
+                continue
+            if receipt:
+                self._finish(entry, receipt=receipt)
+            else:
+                entry[0] = now + replacer.policy.poll_interval_seconds
+
+
+    def _finish(self, entry: list, receipt=None, error: Optional[Exception] = None) -> None:
+        """Remove a transaction from the loop, end its span and resolve its future."""
+        _, replacer, future = entry
+        with self._cond:
+            self._entries.remove(entry)
+        PENDING_TRANSACTIONS.dec(network=replacer.network_name)
+
+        replacer.span.set_attribute("tx.replacements", replacer.replacements)
+        if error is None:
+            replacer.span.set_attribute("tx.block_number", receipt.get("blockNumber"))
+            replacer.span.end()
+            future.set_result(receipt)
+            return
+
+        LOGGER.warning("Gave up tracking transaction %s: %s", replacer.tx_hashes[0], error)
+        replacer.span.record_exception(error)
+        replacer.span.end()
+        future.set_exception(error)
+
+
+    def _run(self) -> None:
+        while True:
+            self.poll_once()
+            with self._cond:
+                if not self._entries:
+                    self._cond.wait()
+                    continue
+                delay = min(entry[0] for entry in self._entries) - self._clock()
+                if delay > 0:
+                    self._cond.wait(delay)
+
+
+# Follows the transactions sent by request handlers
+TRACKER = TransactionTracker()
+
+
+def track_transaction(eth_account, transaction: dict, tx_hash: str,
+                      policy: Optional[ReplacementPolicy] = None,
+                      replace: Optional[bool] = None) -> Future:
+    """
+    Follow a sent transaction in the background until it is mined or given up.
+
+    A "pending" event is published straight away; the tracker publishes the rest.
+    Unless replacement is requested the transaction is only watched, never re-signed.
+
+    Args:
+        eth_account (EthereumAccount): The account that signed the transaction.
+        transaction (dict): The transaction as it was signed.
+        tx_hash (str): The hash of the broadcast transaction.
+        policy (Optional[ReplacementPolicy]): The escalation policy. Defaults to the
+            `[replacement]` section of the account's configuration.
+        replace (Optional[bool]): Replace the transaction when it is stuck. Defaults
+            to `[replacement] replace_tracked`, which is off.
+
+    Returns:
+        Future: Resolves to the receipt, or raises TimeoutError.
+    """
+    policy = policy or ReplacementPolicy.from_config(eth_account.config)
+    if replace is None:
+        replace = eth_account.config.get("replacement", {}).get("replace_tracked", False)
+    replacer = TransactionReplacer(eth_account, transaction, tx_hash, policy, replace)
+    replacer.publish("pending", tx_hash)
+    PENDING_TRANSACTIONS.inc(network=replacer.network_name)
+    return TRACKER.track(replacer)
@@ -0,0 +1,102 @@
+"""
+Shared fakes for the unit tests of the python_backend.
+"""
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+from eth_account import Account
+from hexbytes import HexBytes
+from web3.exceptions import TransactionNotFound
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.services.ethereum_account import EthereumAccount # pylint: disable=C0413
+
+# ABI of the Inbox contract, with an overloaded function and an event
+INBOX_ABI = [
+    {"type": "function", "name": "message", "stateMutability": "view", "inputs": [],
+     "outputs": [{"name": "", "type": "string"}]},
+    {"type": "function", "name": "setMessage", "stateMutability": "nonpayable",
+     "inputs": [{"name": "newMessage", "type": "string"}], "outputs": []},
+    {"type": "function", "name": "doMath", "stateMutability": "pure",
+     "inputs": [{"name": "a", "type": "int256"}, {"name": "b", "type": "int256"}],
+     "outputs": [{"name": "sum", "type": "int256"}, {"name": "diff", "type": "int256"},
+                 {"name": "product", "type": "int256"}, {"name": "isZero", "type": "bool"}]},
+    {"type": "function", "name": "get", "stateMutability": "view",
+     "inputs": [{"name": "key", "type": "bytes32"}], "outputs": [{"name": "", "type": "uint256"}]},
+    {"type": "function", "name": "get", "stateMutability": "view",
+     "inputs": [], "outputs": [{"name": "", "type": "uint256"}]},
+    {"type": "event", "name": "MessageChanged", "anonymous": False,
+     "inputs": [{"name": "sender", "type": "address", "indexed": True},
+                {"name": "note", "type": "string", "indexed": True},
+                {"name": "message", "type": "string", "indexed": False}]},
+]
+
+
+def write_inbox_abi(build_path):
+    """Write the Inbox ABI artifact into a build directory."""
+    with open(os.path.join(build_path, "InboxABI.json"), "w", encoding="utf-8") as f:
+        json.dump(INBOX_ABI, f)
+
+
+def make_batch_account(rejected=(), error="insufficient funds", nonce=40, gas_price=100):
+    """
+    Build an EthereumAccount that signs with a throwaway key and broadcasts to a fake
+    JSON-RPC batch provider.
+
+    The first batch rejects the items at the positions in `rejected` with `error`; every
+    other item is accepted with the hash `0x<batch number><position>`. Each batch sent
+    is recorded in `account.batches`.
+    """
+    account = EthereumAccount.__new__(EthereumAccount)
+    account.user = "alice"
+    account.config = {"network": {"name": "testnet", "chain_id": 1337}}
+    account.account = Account.create()
+    account.w3 = MagicMock()
+    account.w3.eth.gas_price = gas_price
+    account.w3.eth.get_transaction_count.return_value = nonce
+    account.batches = []
+
+    def make_batch_request(calls):
+        first = not account.batches
+        account.batches.append(calls)
+        return [{"id": i, "error": {"message": error}}
+                if first and i in rejected else {"id": i, "result": f"0x{len(account.batches)}{i}"}
+                for i in range(len(calls))]
+    account.w3.provider.make_batch_request.side_effect = make_batch_request
+    account.sign_transactions = MagicMock(wraps=account.sign_transactions)
+    return account
+
+
+def make_receipt_account(mined_hash=None, mined_after=0, gas_price=100):
+    """
+    Build a fake EthereumAccount whose transaction `mined_hash` is mined after a number
+    of receipt polls.
+
+    Signing returns the transaction unchanged, and sent transactions are recorded in
+    `account.sent` and get the hashes `0xhash1`, `0xhash2`, ...
+    """
+    account = MagicMock()
+    account.config = {"network": {"name": "testnet"}}
+    account.get_gas_price.return_value = gas_price
+    account.sign_transaction.side_effect = lambda tx: tx
+    sent = []
+
+    def send_transaction(tx):
+        sent.append(tx)
+        return f"0xhash{len(sent)}"
+    account.send_transaction.side_effect = send_transaction
+    account.sent = sent
+
+    polls = {"count": 0}
+
+    def get_receipt(tx_hash):
+        polls["count"] += 1
+        if tx_hash == mined_hash and polls["count"] > mined_after:
+            return {"transactionHash": HexBytes("0x01"), "hash": tx_hash}
+        raise TransactionNotFound(tx_hash)
+    account.w3.eth.get_transaction_receipt.side_effect = get_receipt
+    return account
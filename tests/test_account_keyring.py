@@ -0,0 +1,75 @@
+"""
+Unit tests for the account_keyring module in the python_backend.
+"""
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+from eth_account import Account
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.api import routes_health # pylint: disable=C0413
+from python_backend.services.account_keyring import AccountKeyring, \
+    check_address # pylint: disable=C0413
+
+ALICE = Account.create()
+BOB = Account.create()
+
+
+class TestAccountKeyring(unittest.TestCase):
+    """
+    Test cases for AccountKeyring and the keyring readiness check.
+    """
+
+    def test_accounts_are_derived(self):
+        """Test that usable keys are derived and the others skipped."""
+        keyring = AccountKeyring.from_config({"accounts": {
+            "alice": {"address": ALICE.address.lower(), "private_key": ALICE.key.hex()},
+            "bob": {"address": "${BOB_ADDRESS}", "private_key": BOB.key.hex()},
+            "carol": {"private_key": "${CAROL_PRIVATE_KEY}"},
+            "dave": {"private_key": "0x1234"},
+        }})
+
+        self.assertEqual(keyring.users(), ["alice", "bob"])
+        self.assertEqual(keyring.get("alice").address, ALICE.address)
+        with self.assertRaises(ValueError):
+            keyring.get("carol")
+
+    def test_address_mismatch(self):
+        """Test that an address that does not match its key is rejected."""
+        with self.assertRaises(ValueError) as raised:
+            AccountKeyring.from_config({"accounts": {
+                "alice": {"address": BOB.address, "private_key": ALICE.key.hex()}}})
+        self.assertIn("alice", str(raised.exception))
+
+        check_address("alice", {}, ALICE)
+        with self.assertRaises(ValueError):
+            check_address("alice", {"address": "0xAliceEthereumAddress"}, ALICE)
+
+    def test_mismatch_keeps_readiness_failing(self):
+        """Test that /health/ready reports the keyring error."""
+        app = FastAPI()
+        app.state.warmed_up = threading.Event()
+        app.state.warmed_up.set()
+        app.state.keyring_error = "Configured address does not match"
+        app.include_router(routes_health.router, prefix="/health")
+        client = TestClient(app)
+
+        with patch.object(routes_health, "DATABASE_CHECK", return_value=True):
+            response = client.get("/health/ready")
+            self.assertEqual(response.status_code, 503)
+            self.assertFalse(response.json()["checks"]["keyring"])
+            self.assertEqual(response.json()["errors"]["keyring"], app.state.keyring_error)
+
+            app.state.keyring_error = None
+            self.assertEqual(client.get("/health/ready").status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Unit tests for the batch deployment of the python_backend.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.services import contract_store, deploy_contract # pylint: disable=C0413
+from tests.helpers import make_batch_account # pylint: disable=C0413
+
+
+def make_account(rejected=()):
+    """Build a batch account whose node rejects items with "nonce too low" and mines the rest."""
+    account = make_batch_account(rejected, error="nonce too low")
+    account.wait_for_transaction = MagicMock(
+        side_effect=lambda tx, tx_hash: {"status": 1, "hash": tx_hash})
+    return account
+
+
+class TestBatchDeploy(unittest.TestCase):
+    """
+    Test cases for BatchContractDeployer and store_contracts_info.
+    """
+
+    def make_deployer(self, account, count):
+        """Build a deployer for `count` items whose transactions are already built."""
+        deployer = deploy_contract.BatchContractDeployer.__new__(
+            deploy_contract.BatchContractDeployer)
+        deployer.config = {"network": {"name": "testnet", "explorer": None}}
+        deployer.user = "alice"
+        deployer.items = [{"contract_name": "Inbox"} for _ in range(count)]
+        deployer.eth_account = account
+        transactions = [(i, {"data": "0x60", "value": 0, "nonce": 7 + i, "gas": 100000,
+                             "gasPrice": 50, "chainId": 1337}) for i in range(count)]
+        deployer.build_transactions = MagicMock(return_value=transactions)
+        return deployer
+
+    def test_failure_blocks_later_deployments(self):
+        """Test that deployments after a rejected one are cancelled and never awaited."""
+        account = make_account(rejected={1})
+        deployer = self.make_deployer(account, 3)
+
+        def build_info(*args):
+            return MagicMock(contract_address="0xc", deployment_tx_hash=args[4]["hash"])
+
+        with patch.object(deploy_contract, "store_contracts_info") as store, \
+                patch.object(deploy_contract, "build_contract_info", side_effect=build_info):
+            results = deployer.deploy()
+
+        self.assertEqual(results[0]["tx_hash"], "0x10")
+        self.assertEqual(results[0]["contract_address"], "0xc")
+        self.assertEqual(results[1]["error"], "nonce too low")
+        self.assertTrue(results[2]["error"].startswith("Blocked"))
+        self.assertIsNone(results[2]["tx_hash"])
+        account.wait_for_transaction.assert_called_once()
+        self.assertEqual(len(store.call_args[0][0]), 1)
+        # The rejected nonce and the queued deployment are used up
+        self.assertEqual(len(account.batches), 2)
+        self.assertEqual(len(account.batches[1]), 2)
+
+    def test_store_closes_connection_on_error(self):
+        """Test that a failed batched insert still closes its connection."""
+        conn = MagicMock()
+        with patch.object(contract_store, "get_connection", return_value=conn), \
+                patch("psycopg2.extras.execute_values", side_effect=psycopg2.Error("down")):
+            with self.assertRaises(RuntimeError):
+                contract_store.store_contracts_info([MagicMock()])
+
+        conn.commit.assert_not_called()
+        conn.cursor.return_value.close.assert_called_once()
+        conn.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
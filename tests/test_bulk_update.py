@@ -0,0 +1,128 @@
+"""
+Unit tests for the bulk message update of the python_backend.
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.api import routes_inbox # pylint: disable=C0413
+from python_backend.services import inbox_contract # pylint: disable=C0413
+from python_backend.services.abi_codec import AbiIndex # pylint: disable=C0413
+from tests.helpers import make_batch_account # pylint: disable=C0413
+
+SET_MESSAGE_ABI = [
+    {"type": "function", "name": "setMessage", "stateMutability": "nonpayable",
+     "inputs": [{"name": "newMessage", "type": "string"}], "outputs": []},
+]
+
+class TestBulkUpdate(unittest.TestCase):
+    """
+    Test cases for bulk_update_messages and the /inbox/update/bulk endpoint.
+    """
+
+    def setUp(self):
+        self.build_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        with open(os.path.join(self.build_dir.name, "InboxABI.json"), "w",
+                  encoding="utf-8") as f:
+            json.dump(SET_MESSAGE_ABI, f)
+        patches = [
+            patch.object(inbox_contract, "get_abi_index",
+                         return_value=AbiIndex(self.build_dir.name)),
+            patch.object(inbox_contract, "track_transaction"),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self.build_dir.cleanup)
+
+    @staticmethod
+    def updates(count, contract_name="Inbox"):
+        """Build `count` updates of distinct contracts."""
+        return [{"contract_name": contract_name, "contract_address": f"0x{i + 1:040x}",
+                 "message": f"hello {i}"} for i in range(count)]
+
+    def test_all_sent(self):
+        """Test that every update gets the next nonce and is tracked."""
+        account = make_batch_account()
+        results = inbox_contract.bulk_update_messages(account, self.updates(3))
+
+        self.assertEqual([r["error"] for r in results], [None] * 3)
+        self.assertEqual([r["tx_hash"] for r in results], ["0x10", "0x11", "0x12"])
+        signed = account.sign_transactions.call_args_list[0][0][0]
+        self.assertEqual([tx["nonce"] for tx in signed], [40, 41, 42])
+        self.assertEqual(len(account.batches), 1)
+        self.assertEqual(inbox_contract.track_transaction.call_count, 3)
+
+    def test_unbuildable_update_keeps_nonces_consecutive(self):
+        """Test that an update that cannot be encoded does not consume a nonce."""
+        account = make_batch_account()
+        updates = self.updates(3)
+        updates[1]["contract_name"] = "Missing"
+        results = inbox_contract.bulk_update_messages(account, updates)
+
+        self.assertIn("Missing", results[1]["error"])
+        signed = account.sign_transactions.call_args_list[0][0][0]
+        self.assertEqual([tx["nonce"] for tx in signed], [40, 41])
+
+    def test_failure_blocks_and_cancels_later_updates(self):
+        """Test that updates after a rejected one are cancelled and reported as blocked."""
+        account = make_batch_account(rejected={1})
+        results = inbox_contract.bulk_update_messages(account, self.updates(4))
+
+        self.assertEqual(results[0]["tx_hash"], "0x10")
+        self.assertEqual(results[1], {"contract_address": f"0x{2:040x}", "tx_hash": None,
+                                      "error": "insufficient funds"})
+        for result in results[2:]:
+            self.assertIsNone(result["tx_hash"])
+            self.assertTrue(result["error"].startswith("Blocked"))
+        inbox_contract.track_transaction.assert_called_once()
+
+        # The gap and the two queued updates are replaced by transfers to self
+        cancels = account.sign_transactions.call_args_list[1][0][0]
+        self.assertEqual([tx["nonce"] for tx in cancels], [41, 42, 43])
+        self.assertTrue(all(tx["to"] == account.account.address and tx["value"] == 0 and
+                            tx["gasPrice"] == 110 for tx in cancels))
+
+    def test_last_failure_needs_no_cancel(self):
+        """Test that nothing is cancelled when no update was queued after the rejected one."""
+        account = make_batch_account(rejected={2})
+        results = inbox_contract.bulk_update_messages(account, self.updates(3))
+
+        self.assertEqual(results[2]["error"], "insufficient funds")
+        self.assertEqual(len(account.batches), 1)
+
+    def test_endpoint(self):
+        """Test that the endpoint reports failure when any update is blocked."""
+        app = FastAPI()
+        app.state.config = {"networks": {"testnet": {"name": "testnet"}}, "accounts": {}}
+        app.include_router(routes_inbox.router, prefix="/inbox")
+        client = TestClient(app)
+        results = [{"contract_address": "0x1", "tx_hash": "0xa", "error": None},
+                   {"contract_address": "0x2", "tx_hash": None, "error": "Blocked: ..."}]
+        payload = {"network": "testnet", "user": "alice", "updates": [
+            {"contract_name": "Inbox", "contract_address": "0x1", "message": "a"},
+            {"contract_name": "Inbox", "contract_address": "0x2", "message": "b"}]}
+
+        with patch.object(routes_inbox, "EthereumAccount"), \
+                patch.object(routes_inbox, "bulk_update_messages",
+                             return_value=results) as bulk:
+            response = client.put("/inbox/update/bulk", json=payload)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), {"success": False, "results": results})
+            self.assertEqual(bulk.call_args[0][1], payload["updates"])
+
+            response = client.put("/inbox/update/bulk", json={**payload, "network": "nowhere"})
+            self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ import toml
 # Add the path to the python_backend explicitly
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
 
+from python_backend.core import config as config_module # pylint: disable=C0413
 from python_backend.core.config import load_config, resolve_env_variables, \
     print_resolved_vars # pylint: disable=C0413
 
@@ -101,12 +102,12 @@ class TestConfig(unittest.TestCase):
 
     @patch("builtins.open", new_callable=mock_open, read_data="[mocked]")
     @patch("toml.load")
-    @patch("python_backend.config.set_logger_level")  # Prevent actual logging changes
+    @patch.object(config_module, "configure_logging")  # Prevent actual logging changes
     def test_load_config(self, mock_set_logger, mock_toml_load, mock_file_open):
         """Test that load_config correctly loads, processes, and resolves env variables."""
         mock_toml_load.return_value = toml.loads(self.mock_toml_data)
 
-        with patch("python_backend.config.print_resolved_vars") as mock_print:
+        with patch.object(config_module, "print_resolved_vars") as mock_print:
             config = load_config("dummy_path")
 
 
@@ -131,7 +132,7 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(resolved, self.expected_resolved_config)
 
 
-    @patch("python_backend.logger_config.LOGGER.info")
+    @patch.object(config_module.LOGGER, "info")
     def test_print_resolved_vars(self, mock_logger):
         """Test that print_resolved_vars correctly obscures sensitive information."""
         print_resolved_vars(self.expected_resolved_config)
@@ -155,9 +156,13 @@ class TestConfig(unittest.TestCase):
         mock_logger.assert_any_call("%s: %s / %s... (hidden)", "charlie", \
                                     "0xCharlieEthereumAddress", "0xccc")
 
+        # The resolved configuration itself, with its keys, is never logged
+        for call in mock_logger.call_args_list:
+            self.assertNotIn("0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa", repr(call))
+
 
     @patch("builtins.open", side_effect=FileNotFoundError)
-    @patch("python_backend.logger_config.LOGGER.warning")  # Prevent unnecessary logging
+    @patch.object(config_module.LOGGER, "warning")  # Prevent unnecessary logging
     def test_load_config_file_not_found(self, mock_logger, _):
         """Test that load_config returns an empty dict when the file is missing."""
 
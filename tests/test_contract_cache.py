@@ -0,0 +1,123 @@
+"""
+Unit tests for the contract cache in the python_backend.
+"""
+import json
+import os
+import sys
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.services.contract_cache import ContractCache # pylint: disable=C0413
+
+NETWORKS = {"sepolia": {"explorer": "https://sepolia.etherscan.io"}}
+
+
+def make_row(contract_id, network="sepolia"):
+    """Build a contracts table row."""
+    return {"id": contract_id, "contract_name": "Inbox", "network": network,
+            "contract_address": f"0x{contract_id:040x}", "deployer_name": "alice",
+            "deployer_address": "0xabc", "deployment_tx_hash": f"0x{contract_id:064x}",
+            "deployment_timestamp": datetime(2024, 1, 1)}
+
+
+class FakeTable:
+    """Serves rows like get_contracts and records the queries."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def __call__(self, after_id=None):
+        self.queries.append(after_id)
+        return [row for row in self.rows if after_id is None or row["id"] > after_id]
+
+
+def notify(op, contract_id=None):
+    """Build a notification payload as sent by the trigger."""
+    return json.dumps({"op": op, "id": contract_id})
+
+
+class TestContractCache(unittest.TestCase):
+    """
+    Test cases for loading and updating the cache from notifications.
+    """
+
+    def setUp(self):
+        """Create a cache over a table of two contracts."""
+        self.table = FakeTable([make_row(1), make_row(2, network="local")])
+        self.cache = ContractCache(NETWORKS, fetch=self.table)
+        self.cache.reload()
+
+    def test_reload_enriches_rows(self):
+        """Test that rows are shaped like the Contract model with explorer URLs."""
+        contracts = self.cache.contracts()
+        self.assertEqual(self.cache.version(), (2, 2))
+        self.assertEqual(contracts[0]["explorer_url"], "https://sepolia.etherscan.io")
+        self.assertIsNone(contracts[1]["explorer_url"])
+        self.assertNotIn("id", contracts[0])
+
+    def test_inserts_are_merged_incrementally(self):
+        """Test appends, out-of-order commits and duplicate notifications."""
+        before = self.cache.contracts()
+        self.table.rows.append(make_row(4))
+        self.cache.apply([notify("INSERT", 4)])
+        self.assertEqual(self.table.queries[-1], 3)
+        self.assertEqual(self.cache.version(), (4, 3))
+        self.assertEqual(len(before), 2)
+
+        # Id 3 commits after id 4
+        self.table.rows.append(make_row(3))
+        self.cache.apply([notify("INSERT", 3), notify("INSERT", 4)])
+        addresses = [c["contract_address"] for c in self.cache.contracts()]
+        self.assertEqual(addresses, [f"0x{n:040x}" for n in (1, 2, 3, 4)])
+
+    def test_other_changes_reload(self):
+        """Test that deletes and unreadable payloads reload the whole table."""
+        del self.table.rows[0]
+        self.cache.apply([notify("INSERT", 2), notify("DELETE", 1)])
+        self.assertEqual(self.table.queries[-1], None)
+        self.assertEqual(self.cache.version(), (2, 1))
+
+        self.cache.apply(["not json"])
+        self.assertEqual(self.table.queries[-1], None)
+
+    def test_verify_reloads_when_a_change_was_missed(self):
+        """Test that the periodic version check reloads only a stale cache."""
+        self.cache.fetch_version = lambda: (2, 2)
+        self.assertFalse(self.cache.verify())
+        self.assertEqual(len(self.table.queries), 1)
+
+        self.table.rows.append(make_row(3))
+        self.cache.fetch_version = lambda: (3, 3)
+        self.assertTrue(self.cache.verify())
+        self.assertEqual(self.cache.version(), (3, 3))
+
+    def test_missing_trigger_keeps_the_cache_off(self):
+        """Test that without the notification trigger the cache never goes live."""
+        conn = MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = None
+        table = FakeTable([make_row(1)])
+        cache = ContractCache(NETWORKS, fetch=table, connect=lambda: conn, reconnect_delay=0.01)
+
+        cache.start()
+        try:
+            time.sleep(0.1)
+            self.assertFalse(cache.live)
+            self.assertEqual(table.queries, [])
+            self.assertIn("pg_trigger", cursor.execute.call_args_list[1][0][0])
+            self.assertGreater(conn.close.call_count, 1)
+        finally:
+            cache.stop()
+
+        cursor.fetchone.return_value = (1,)
+        self.assertTrue(ContractCache.has_trigger(conn))
+
+
+if __name__ == "__main__":
+    unittest.main()
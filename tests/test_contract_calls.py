@@ -0,0 +1,173 @@
+"""
+Unit tests for the abi_codec and contract_calls modules in the python_backend.
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from eth_abi import encode
+from eth_abi.exceptions import DecodingError, EncodingError
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from web3.exceptions import BadFunctionCallOutput, Web3ValidationError
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.services.abi_codec import AbiIndex, ContractAbi, \
+    load_contract_abi # pylint: disable=C0413
+from python_backend.api import routes_contracts # pylint: disable=C0413
+from python_backend.services import contract_calls # pylint: disable=C0413
+from tests.helpers import INBOX_ABI # pylint: disable=C0413
+
+ADDRESS = "0x00000000000000000000000000000000000000aa"
+
+
+class TestContractCalls(unittest.TestCase):
+    """
+    Test cases for the ABI codecs and generic contract calls.
+    """
+
+    def setUp(self):
+        self.abi = ContractAbi(INBOX_ABI)
+
+    def test_selectors_and_encoding(self):
+        """Test that calldata matches the standard selector and ABI encoding."""
+        codec = self.abi.function("setMessage", 1)
+        self.assertEqual(codec.selector.hex(), "368b8772")
+        self.assertEqual(codec.encode_input(["hi"]), codec.selector + encode(["string"], ["hi"]))
+        self.assertIs(self.abi.by_selector[codec.selector], codec)
+        self.assertEqual(codec.decode_input(codec.encode_input(["hi"])[4:]), ("hi",))
+
+    def test_overloads_and_bad_arguments(self):
+        """Test overload resolution by argument count and argument validation."""
+        self.assertEqual(self.abi.function("get", 0).input_types, [])
+        self.assertEqual(self.abi.function("get", 1).input_types, ["bytes32"])
+        with self.assertRaises(ValueError):
+            self.abi.function("missing", 0)
+        with self.assertRaises(ValueError):
+            self.abi.function("doMath", 1).encode_input([1])
+        with self.assertRaises(ValueError):
+            self.abi.function("doMath", 2).encode_input(["x", 2])
+
+    def test_load_contract_abi_is_cached(self):
+        """Test that artifacts are parsed once and rejected outside the build path."""
+        with tempfile.TemporaryDirectory() as build_path:
+            with open(os.path.join(build_path, "InboxABI.json"), "w", encoding="utf-8") as f:
+                json.dump(INBOX_ABI, f)
+            first = load_contract_abi("Inbox", build_path)
+            self.assertIs(load_contract_abi("Inbox", build_path), first)
+            with self.assertRaises(ValueError):
+                load_contract_abi("../Inbox", build_path)
+
+    def test_abi_index_decodes_calldata_and_logs(self):
+        """Test selector and topic lookups across the artifacts of a build directory."""
+        with tempfile.TemporaryDirectory() as build_path:
+            with open(os.path.join(build_path, "InboxABI.json"), "w", encoding="utf-8") as f:
+                json.dump(INBOX_ABI, f)
+            index = AbiIndex(build_path)
+
+            calldata = self.abi.function("doMath", 2).encode_input([2, -3])
+            self.assertEqual(index.decode_calldata(calldata), {
+                "contract": "Inbox", "function": "doMath", "signature": "doMath(int256,int256)",
+                "args": {"a": 2, "b": -3},
+            })
+            with self.assertRaises(ValueError):
+                index.decode_calldata(b"\x00\x00\x00\x00")
+
+            event = next(iter(self.abi.events_by_topic.values()))
+            note_hash = b"\x11" * 32
+            decoded = index.decode_log(
+                [event.topic, bytes(12) + bytes.fromhex(ADDRESS[2:]), note_hash],
+                encode(["string"], ["hello"]),
+            )
+            self.assertEqual(decoded["event"], "MessageChanged")
+            self.assertEqual(decoded["args"],
+                             {"sender": ADDRESS, "note": note_hash, "message": "hello"})
+            self.assertIsNone(index.decode_log([b"\x00" * 32], b""))
+
+    @patch("python_backend.services.contract_calls.load_contract_abi")
+    def test_batch_call(self, mock_load):
+        """Test that reads are sent as one batch and decoded per call."""
+        mock_load.return_value = self.abi
+        w3 = MagicMock()
+        w3.provider.make_batch_request.return_value = [
+            {"jsonrpc": "2.0", "id": 1, "result": "0x" + encode(
+                ["int256", "int256", "int256", "bool"], [5, 1, 6, False]).hex()},
+            {"jsonrpc": "2.0", "id": 2, "error": {"code": 3, "message": "execution reverted"}},
+        ]
+
+        results = contract_calls.batch_call(w3, [
+            {"contract_address": ADDRESS, "contract_name": "Inbox", "function": "doMath",
+             "args": [2, 3]},
+            {"contract_address": ADDRESS, "contract_name": "Inbox", "function": "message",
+             "args": []},
+            {"contract_address": ADDRESS, "contract_name": "Inbox", "function": "missing",
+             "args": []},
+        ])
+
+        self.assertEqual(len(w3.provider.make_batch_request.call_args[0][0]), 2)
+        self.assertEqual(results[0]["result"],
+                         {"sum": 5, "diff": 1, "product": 6, "isZero": False})
+        self.assertEqual(results[1]["error"], "execution reverted")
+        self.assertIn("not found", results[2]["error"])
+
+
+class TestContractRoutes(unittest.TestCase):
+    """
+    Test cases for the status codes of the generic contract routes.
+    """
+
+    def setUp(self):
+        app = FastAPI()
+        app.state.config = {"networks": {"testnet": {"name": "testnet"}}, "accounts": {}}
+        app.include_router(routes_contracts.router, prefix="/contracts")
+        self.client = TestClient(app)
+        self.w3 = MagicMock()
+        p = patch.object(routes_contracts, "get_web3_connector")
+        p.start().return_value.get_web3.return_value = self.w3
+        self.addCleanup(p.stop)
+
+    def call(self, function="message", args=()):
+        """Call a function of the Inbox contract through the route."""
+        return self.client.post(f"/contracts/testnet/{ADDRESS}/call", json={
+            "contract_name": "Inbox", "function": function, "args": list(args)})
+
+    def test_abi_errors_are_client_errors(self):
+        """Test that each encoding or decoding error maps to 422 or 400 instead of 500."""
+        cases = [(Web3ValidationError("bad address"), 422), (EncodingError("too big"), 422),
+                 (BadFunctionCallOutput("no data"), 400), (DecodingError("short"), 400)]
+        for error, status in cases:
+            with self.subTest(error=type(error).__name__), \
+                    patch.object(routes_contracts, "call_function", side_effect=error):
+                response = self.call()
+                self.assertEqual(response.status_code, status)
+                self.assertIn(str(error), response.json()["detail"])
+
+    def test_transact_encoding_error(self):
+        """Test that bad transaction arguments are rejected with 422."""
+        with patch.object(routes_contracts, "EthereumAccount"), \
+                patch.object(routes_contracts, "transact_function",
+                             side_effect=EncodingError("too big")):
+            response = self.client.post(f"/contracts/testnet/{ADDRESS}/transact", json={
+                "contract_name": "Inbox", "function": "setMessage", "user": "alice",
+                "args": ["hi"]})
+        self.assertEqual(response.status_code, 422)
+
+    def test_undecodable_result(self):
+        """Test that empty return data, e.g. from a missing function, is a 400."""
+        self.w3.eth.call.return_value = b""
+        # The routes import the backend modules by their short names
+        app_calls = sys.modules[routes_contracts.call_function.__module__]
+        with patch.object(app_calls, "load_contract_abi",
+                          return_value=ContractAbi(INBOX_ABI)):
+            response = self.call("doMath", [1, 2])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Could not decode", response.json()["detail"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Unit tests for the contract browser queries in the python_backend.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.services import contract_store # pylint: disable=C0413
+from python_backend.services.contract_store import contract_filters # pylint: disable=C0413
+
+
+class TestContractStore(unittest.TestCase):
+    """
+    Test cases for the filter clause and the facet counts.
+    """
+
+    def test_contract_filters(self):
+        """Test exact facet matches, the escaped address search and excluded facets."""
+        self.assertEqual(contract_filters(None), ("", []))
+        where, params = contract_filters({"network": "sepolia", "contract_name": "",
+                                          "deployer_address": "0xAB_%"})
+        self.assertEqual(where, " WHERE network = %s AND deployer_address ILIKE %s")
+        self.assertEqual(params, ["sepolia", "%0xAB\\_\\%%"])
+
+        where, params = contract_filters({"network": "sepolia", "deployer_name": "alice"},
+                                         exclude="network")
+        self.assertEqual(where, " WHERE deployer_name = %s")
+        self.assertEqual(params, ["alice"])
+
+    def test_facets_ignore_their_own_filter(self):
+        """Test that each facet is counted without its own filter."""
+        cur = MagicMock()
+        cur.fetchall.side_effect = [[("sepolia", 3), ("mainnet", 1)], [("Inbox", 3)],
+                                    [("alice", 2), ("bob", 1)]]
+        cur.fetchone.return_value = (3,)
+        conn = MagicMock()
+        conn.cursor.return_value = cur
+
+        with patch.object(contract_store, "get_connection", return_value=conn):
+            facets = contract_store.get_contract_facets({"network": "sepolia"})
+
+        self.assertEqual(facets["network"], [{"value": "sepolia", "count": 3},
+                                             {"value": "mainnet", "count": 1}])
+        self.assertEqual(facets["total"], 3)
+        queries = [call.args for call in cur.execute.call_args_list]
+        self.assertNotIn("WHERE", queries[0][0])
+        self.assertIn("GROUP BY network", queries[0][0])
+        self.assertEqual(queries[1][1], ["sepolia"])
+        conn.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Unit tests for the contract_watcher module in the python_backend.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from eth_abi import encode
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.core.event_bus import EventBus # pylint: disable=C0413
+from python_backend.services import contract_watcher # pylint: disable=C0413
+from python_backend.services.abi_codec import AbiIndex, ContractAbi # pylint: disable=C0413
+from python_backend.services.contract_watcher import ContractWatcher # pylint: disable=C0413
+from tests.helpers import INBOX_ABI, write_inbox_abi # pylint: disable=C0413
+
+CONTRACT = "0x00000000000000000000000000000000000000AA"
+
+
+class TestContractWatcher(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for the ContractWatcher class.
+    """
+
+    def setUp(self):
+        self.bus = EventBus()
+        self.state = {"message": "hello", "count": 1}
+        self.reads = 0
+
+        def read_state():
+            self.reads += 1
+            return dict(self.state)
+
+        self.watcher = ContractWatcher("test", CONTRACT, read_state, self.bus, poll_interval=60)
+
+    async def next_event(self, queue):
+        """Return the next event or fail after a second."""
+        return await asyncio.wait_for(queue.get(), 1)
+
+    async def test_fans_out_state_changes_on_new_heads(self):
+        """Test that one upstream read per head is shared by every client."""
+        first = self.watcher.subscribe()
+        second = self.watcher.subscribe()
+        self.assertEqual(await self.next_event(first), {"event": "state", "data": self.state})
+        self.assertEqual((await self.next_event(second))["data"], self.state)
+
+        self.state["message"] = "updated"
+        self.bus.publish(("new_head", "test"), {"number": 2})
+
+        self.assertEqual((await self.next_event(first))["data"]["message"], "updated")
+        self.assertEqual((await self.next_event(second))["data"]["message"], "updated")
+        self.assertEqual(self.reads, 2)
+
+        # A late client gets the current state straight away
+        late = self.watcher.subscribe()
+        self.assertEqual(late.get_nowait()["data"]["message"], "updated")
+
+        for queue in (first, second, late):
+            self.watcher.unsubscribe(queue)
+
+    async def test_unchanged_state_is_not_resent(self):
+        """Test that a head without a state change sends nothing."""
+        queue = self.watcher.subscribe()
+        await self.next_event(queue)
+
+        self.bus.publish(("new_head", "test"), {"number": 2})
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(queue.get(), 0.2)
+        self.watcher.unsubscribe(queue)
+
+    async def test_forwards_transactions_to_the_contract(self):
+        """Test that only lifecycle events of this contract's transactions are forwarded."""
+        queue = self.watcher.subscribe()
+        await self.next_event(queue)
+
+        self.bus.publish(("tx", "test"), {"status": "pending", "tx_hash": "0x1", "to": "0xother"})
+        self.bus.publish(("tx", "test"), {"status": "mined", "tx_hash": "0x2",
+                                          "to": CONTRACT.lower()})
+
+        event = await self.next_event(queue)
+        self.assertEqual((event["event"], event["data"]["tx_hash"]), ("tx", "0x2"))
+        self.watcher.unsubscribe(queue)
+
+    async def test_forwards_decoded_logs_of_the_contract(self):
+        """Test that this contract's logs are forwarded with their decoded arguments."""
+        queue = self.watcher.subscribe()
+        await self.next_event(queue)
+        topic = "0x" + next(iter(ContractAbi(INBOX_ABI).events_by_topic)).hex()
+        log = {"topics": [topic, "0x" + "00" * 31 + "bb", "0x" + "11" * 32],
+               "data": "0x" + encode(["string"], ["hello"]).hex(), "removed": False}
+
+        with tempfile.TemporaryDirectory() as build_path:
+            write_inbox_abi(build_path)
+            with patch.object(contract_watcher, "get_abi_index",
+                              return_value=AbiIndex(build_path)):
+                self.bus.publish(("log", "test"), {**log, "address": "0xother"})
+                self.bus.publish(("log", "test"), {**log, "address": CONTRACT.lower()})
+                self.bus.publish(("log", "test"), {"address": CONTRACT.lower(),
+                                                   "topics": ["0x" + "00" * 32], "data": "0x"})
+
+        event = await self.next_event(queue)
+        self.assertEqual(event["event"], "log")
+        self.assertEqual(event["data"]["decoded"]["event"], "MessageChanged")
+        self.assertEqual(event["data"]["decoded"]["args"], {
+            "sender": "0x" + "00" * 19 + "bb", "note": "0x" + "11" * 32, "message": "hello"})
+        self.assertIsNone((await self.next_event(queue))["data"]["decoded"])
+        self.watcher.unsubscribe(queue)
+
+    async def test_last_client_stops_watching(self):
+        """Test that the upstream watch stops when the last client leaves."""
+        queue = self.watcher.subscribe()
+        await self.next_event(queue)
+        self.watcher.unsubscribe(queue)
+
+        self.assertEqual(self.watcher.subscriber_count(), 0)
+        self.assertFalse(self.bus.has_subscribers(("new_head", "test")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Unit tests for the gas_cache module in the python_backend.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.services.gas_cache import GasEstimateCache # pylint: disable=C0413
+
+BYTECODE = "0x6080604052"
+ALICE = "0x00000000000000000000000000000000000000A1"
+BOB = "0x00000000000000000000000000000000000000B0"
+
+
+def deployment_data(arg):
+    """Return deployment calldata: the bytecode followed by one encoded uint256 argument."""
+    return BYTECODE + f"{arg:064x}"
+
+
+class TestGasCache(unittest.TestCase):
+    """
+    Test cases for the GasEstimateCache class.
+    """
+
+    def setUp(self):
+        self.now = [0.0]
+        self.w3 = MagicMock()
+        self.w3.eth.estimate_gas.return_value = 100000
+        self.cache = GasEstimateCache(ttl_seconds=60, margin=0.1, max_entries=2,
+                                      clock=lambda: self.now[0])
+
+    def estimate(self, arg=1, sender=ALICE, network="sepolia"):
+        """Estimate a deployment through the cache."""
+        return self.cache.estimate_deployment(self.w3, network, BYTECODE,
+                                              deployment_data(arg), sender)
+
+    def test_margin_and_hit(self):
+        """Test that the margin is added to fresh and cached estimates alike."""
+        self.assertEqual(self.estimate(), 110000)
+        self.assertEqual(self.estimate(), 110000)
+        self.w3.eth.estimate_gas.assert_called_once_with(
+            {"from": ALICE, "data": deployment_data(1)})
+
+    def test_ttl_expiry(self):
+        """Test that an estimate is fetched again once its TTL has passed."""
+        self.estimate()
+        self.now[0] = 59.9
+        self.estimate()
+        self.assertEqual(self.w3.eth.estimate_gas.call_count, 1)
+
+        self.now[0] = 60.0
+        self.w3.eth.estimate_gas.return_value = 200000
+        self.assertEqual(self.estimate(), 220000)
+        self.assertEqual(self.w3.eth.estimate_gas.call_count, 2)
+
+    def test_key_separation(self):
+        """Test that the sender, constructor arguments and network are part of the key."""
+        key = GasEstimateCache.deployment_key("sepolia", BYTECODE, deployment_data(1), ALICE)
+        self.assertEqual(key[2], f"{1:064x}")
+        self.assertEqual(key[3], ALICE.lower())
+        self.assertNotEqual(key, GasEstimateCache.deployment_key(
+            "sepolia", BYTECODE, deployment_data(2), ALICE))
+        self.assertNotEqual(key, GasEstimateCache.deployment_key(
+            "sepolia", BYTECODE, deployment_data(1), BOB))
+        self.assertNotEqual(key, GasEstimateCache.deployment_key(
+            "mainnet", BYTECODE, deployment_data(1), ALICE))
+        self.assertEqual(key, GasEstimateCache.deployment_key(
+            "sepolia", bytes.fromhex(BYTECODE[2:]), deployment_data(1), ALICE.lower()))
+
+        self.estimate(arg=1)
+        self.estimate(arg=2)
+        self.estimate(arg=1, sender=BOB)
+        self.assertEqual(self.w3.eth.estimate_gas.call_count, 3)
+
+    def test_max_entries_eviction(self):
+        """Test that expired entries are evicted first, then the oldest one."""
+        keys = [GasEstimateCache.deployment_key("sepolia", BYTECODE, deployment_data(i), ALICE)
+                for i in range(4)]
+        self.cache.put(keys[0], 1)
+        self.now[0] = 30.0
+        self.cache.put(keys[1], 2)
+
+        # keys[0] has expired, so it goes before the older live keys[1]
+        self.now[0] = 61.0
+        self.cache.put(keys[2], 3)
+        self.assertEqual(self.cache.get(keys[1]), int(2 * 1.1))
+        self.assertEqual(len(self.cache._entries), 2)  # pylint: disable=protected-access
+
+        # Nothing has expired, so the oldest entry goes
+        self.cache.put(keys[3], 4)
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertEqual(self.cache.get(keys[2]), int(3 * 1.1))
+        self.assertEqual(self.cache.get(keys[3]), int(4 * 1.1))
+
+    def test_from_config(self):
+        """Test that the [gas_cache] section configures the cache."""
+        cache = GasEstimateCache.from_config({"gas_cache": {"ttl_seconds": 5, "margin": 0.2}})
+        self.assertEqual((cache.ttl_seconds, cache.margin), (5, 0.2))
+
+
+if __name__ == "__main__":
+    unittest.main()
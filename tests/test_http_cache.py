@@ -0,0 +1,82 @@
+"""
+Unit tests for the conditional GET helpers in the python_backend.
+"""
+import os
+import sys
+import unittest
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.api.http_cache import cached_json, config_response, \
+    config_version # pylint: disable=C0413
+
+
+class TestHttpCache(unittest.TestCase):
+    """
+    Test cases for ETag and Last-Modified handling.
+    """
+
+    def setUp(self):
+        """Create an app with one data route and one configuration route."""
+        self.builds = 0
+        self.version = [3, 3]
+        app = FastAPI()
+        app.state.config_version = config_version({"networks": {"sepolia": {}}})
+        app.state.config_loaded_at = 1_700_000_000.0
+
+        def build():
+            self.builds += 1
+            return {"contracts": list(range(self.version[0]))}
+
+        @app.get("/metadata")
+        def metadata(request: Request):
+            return cached_json(request, self.version, build, last_modified=1_700_000_500.0)
+
+        @app.get("/explorer")
+        def explorer(request: Request, network: str):
+            return config_response(request, lambda: {"network": network}, network)
+
+        self.client = TestClient(app)
+
+    def test_etag_revalidation(self):
+        """Test that a matching ETag returns an empty 304 without building the body."""
+        first = self.client.get("/metadata")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json(), {"contracts": [0, 1, 2]})
+        self.assertEqual(first.headers["cache-control"], "no-cache")
+        etag = first.headers["etag"]
+
+        again = self.client.get("/metadata", headers={"If-None-Match": f'"x", W/{etag}'})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b"")
+        self.assertEqual(again.headers["etag"], etag)
+        self.assertEqual(self.builds, 1)
+
+        self.version[:] = [4, 4]
+        changed = self.client.get("/metadata", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["etag"], etag)
+
+    def test_last_modified_and_config_routes(self):
+        """Test If-Modified-Since and the per-parameter ETags of configuration routes."""
+        first = self.client.get("/metadata")
+        last_modified = first.headers["last-modified"]
+        self.assertEqual(self.client.get("/metadata", headers={
+            "If-Modified-Since": last_modified}).status_code, 304)
+        self.assertEqual(self.client.get("/metadata", headers={
+            "If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}).status_code, 200)
+
+        sepolia = self.client.get("/explorer", params={"network": "sepolia"})
+        mainnet = self.client.get("/explorer", params={"network": "mainnet"})
+        self.assertEqual(sepolia.headers["cache-control"], "public, max-age=300")
+        self.assertNotEqual(sepolia.headers["etag"], mainnet.headers["etag"])
+        self.assertEqual(self.client.get("/explorer", params={"network": "sepolia"}, headers={
+            "If-None-Match": sepolia.headers["etag"]}).status_code, 304)
+
+
+if __name__ == "__main__":
+    unittest.main()
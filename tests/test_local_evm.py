@@ -0,0 +1,210 @@
+"""
+Unit tests for the local_evm module in the python_backend.
+
+Most contracts are small handcrafted runtime bytecodes. `TestInboxArtifact` runs the
+compiled Inbox contract when solc is installed, and compares it with `eth_call` on an
+in-memory chain when eth-tester and py-evm are installed too.
+"""
+import importlib.util
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+from eth_abi import encode
+from web3.exceptions import ContractLogicError
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.core.event_bus import EventBus # pylint: disable=C0413
+from python_backend.services.abi_codec import ContractAbi, FunctionCodec # pylint: disable=C0413
+from python_backend.services.compile_solidity import SOLC_VERSION # pylint: disable=C0413
+from python_backend.services.local_evm import LocalEVM, LocalExecutor, \
+    UnsupportedOperation # pylint: disable=C0413
+
+# Stores the top of the stack at memory 0 and returns that word
+RETURN_TOP = "60005260206000f3"
+
+# add(a, b): CALLDATALOAD(4) + CALLDATALOAD(36)
+ADD_CODE = bytes.fromhex("600435" "602435" "01" + RETURN_TOP)
+# -7 / 2 with SDIV
+SDIV_CODE = bytes.fromhex("6002" "7f" + "ff" * 31 + "f9" "05" + RETURN_TOP)
+# Jumps over an INVALID opcode and returns 1
+JUMP_CODE = bytes.fromhex("600456" "fe" "5b" "6001" + RETURN_TOP)
+# Returns storage slot 0
+SLOAD_CODE = bytes.fromhex("600054" + RETURN_TOP)
+# Reverts without data
+REVERT_CODE = bytes.fromhex("60006000fd")
+# Returns block.timestamp, which is not available locally
+TIMESTAMP_CODE = bytes.fromhex("42" + RETURN_TOP)
+
+ADDRESS = "0x00000000000000000000000000000000000000aa"
+
+INBOX_SOURCE = os.path.join(os.path.dirname(__file__), "../contracts/Inbox.sol")
+INT_MIN = -2 ** 255
+INT_MAX = 2 ** 255 - 1
+
+
+def installed_solc():
+    """Return the solcx module if the project's compiler version is installed, else None."""
+    if importlib.util.find_spec("solcx") is None:
+        return None
+    import solcx  # pylint: disable=import-outside-toplevel
+    installed = {str(version) for version in solcx.get_installed_solc_versions()}
+    return solcx if SOLC_VERSION in installed else None
+
+
+def do_math(a, b):
+    """Solidity 0.8 semantics of Inbox.doMath: checked int256 arithmetic."""
+    results = (a + b, b - a, a * b)
+    if any(not INT_MIN <= value <= INT_MAX for value in results):
+        return None
+    return (*results, a == 0)
+
+
+def function(name, mutability, inputs, output="uint256"):
+    """Build a function codec."""
+    return FunctionCodec({
+        "type": "function", "name": name, "stateMutability": mutability,
+        "inputs": [{"name": f"arg{i}", "type": t} for i, t in enumerate(inputs)],
+        "outputs": [{"name": "", "type": output}],
+    })
+
+
+class TestLocalEVM(unittest.TestCase):
+    """
+    Test cases for the LocalEVM and LocalExecutor classes.
+    """
+
+    def test_arithmetic_and_flow(self):
+        """Test calldata access, signed arithmetic and jumps."""
+        add = function("add", "pure", ["uint256", "uint256"])
+        output = LocalEVM(ADD_CODE).execute(add.encode_input([2, 40]))
+        self.assertEqual(add.decode_output(output), (42,))
+
+        sdiv = function("div", "pure", [], output="int256")
+        self.assertEqual(sdiv.decode_output(LocalEVM(SDIV_CODE).execute(b"")), (-3,))
+        self.assertEqual(int.from_bytes(LocalEVM(JUMP_CODE).execute(b""), "big"), 1)
+
+    def test_revert_and_unsupported(self):
+        """Test that reverts raise like RPC and environment opcodes are refused."""
+        with self.assertRaises(ContractLogicError):
+            LocalEVM(REVERT_CODE).execute(b"")
+        with self.assertRaises(UnsupportedOperation):
+            LocalEVM(TIMESTAMP_CODE).execute(b"")
+        with self.assertRaises(UnsupportedOperation):
+            LocalEVM(SLOAD_CODE).execute(b"")
+        self.assertEqual(int.from_bytes(LocalEVM(SLOAD_CODE).execute(b"", lambda slot: 7),
+                                        "big"), 7)
+
+    def test_executor_runs_pure_functions_locally(self):
+        """Test that pure calls fetch the code once and never use eth_call."""
+        w3 = MagicMock()
+        w3.eth.get_code.return_value = ADD_CODE
+        executor = LocalExecutor("local-pure", w3, enabled=True)
+        add = function("add", "pure", ["uint256", "uint256"])
+
+        self.assertEqual(executor.call(ADDRESS, add, [1, 2]), (3,))
+        self.assertEqual(executor.call(ADDRESS, add, [3, 4]), (7,))
+        w3.eth.get_code.assert_called_once()
+        w3.eth.call.assert_not_called()
+
+    def test_executor_falls_back_to_rpc(self):
+        """Test that unsupported code is called over RPC instead."""
+        w3 = MagicMock()
+        w3.eth.get_code.return_value = TIMESTAMP_CODE
+        w3.eth.call.return_value = encode(["uint256"], [1700000000])
+        executor = LocalExecutor("local-fallback", w3, enabled=True)
+
+        result = executor.call(ADDRESS, function("now", "pure", []), [])
+
+        self.assertEqual(result, (1700000000,))
+        w3.eth.call.assert_called_once()
+
+    def test_executor_caches_storage_until_new_head(self):
+        """Test that view calls reuse storage slots until the next block."""
+        w3 = MagicMock()
+        w3.eth.get_code.return_value = SLOAD_CODE
+        w3.eth.get_storage_at.return_value = (5).to_bytes(32, "big")
+        bus = EventBus()
+        executor = LocalExecutor("local-view", w3, enabled=True, execute_views=True, bus=bus)
+        get = function("get", "view", [])
+
+        self.assertEqual(executor.call(ADDRESS, get, []), (5,))
+        self.assertEqual(executor.call(ADDRESS, get, []), (5,))
+        self.assertEqual(w3.eth.get_storage_at.call_count, 1)
+
+        bus.publish(("new_head", "local-view"), {"number": 2})
+        executor.call(ADDRESS, get, [])
+        self.assertEqual(w3.eth.get_storage_at.call_count, 2)
+        w3.eth.call.assert_not_called()
+
+    def test_executor_disabled_by_default(self):
+        """Test that pure calls go over RPC unless local execution is enabled."""
+        w3 = MagicMock()
+        w3.eth.call.return_value = encode(["uint256"], [3])
+        executor = LocalExecutor("local-disabled", w3)
+
+        self.assertEqual(executor.call(ADDRESS, function("add", "pure", ["uint256", "uint256"]),
+                                       [1, 2]), (3,))
+        w3.eth.get_code.assert_not_called()
+
+
+@unittest.skipIf(installed_solc() is None, f"solc {SOLC_VERSION} is not installed")
+class TestInboxArtifact(unittest.TestCase):
+    """
+    Test cases running the compiled Inbox contract in the LocalEVM.
+    """
+
+    CASES = [(2, 40), (0, 5), (5, 0), (0, 0), (-3, 7), (INT_MAX, 0), (INT_MIN, 0),
+             (INT_MAX, 1), (1, INT_MIN), (INT_MIN, -1), (2 ** 128, 2 ** 128)]
+
+    @classmethod
+    def setUpClass(cls):
+        with open(INBOX_SOURCE, encoding="utf-8") as f:
+            compiled = installed_solc().compile_source(
+                f.read(), output_values=["abi", "bin", "bin-runtime"],
+                solc_version=SOLC_VERSION)
+        _, cls.interface = compiled.popitem()
+        cls.do_math = ContractAbi(cls.interface["abi"]).function("doMath", 2)
+        cls.evm = LocalEVM(bytes.fromhex(cls.interface["bin-runtime"]))
+
+    def run_locally(self, a, b):
+        """Run doMath in the LocalEVM, returning None if it reverts."""
+        try:
+            return self.do_math.decode_output(
+                self.evm.execute(self.do_math.encode_input([a, b])))
+        except ContractLogicError as e:
+            self.assertIn("panic code 0x11", str(e))
+            return None
+
+    def test_do_math_matches_solidity(self):
+        """Test doMath results, including zero and checked overflow, against Solidity."""
+        for a, b in self.CASES:
+            with self.subTest(a=a, b=b):
+                self.assertEqual(self.run_locally(a, b), do_math(a, b))
+
+    @unittest.skipIf(importlib.util.find_spec("eth_tester") is None or
+                     importlib.util.find_spec("eth") is None, "eth-tester/py-evm not installed")
+    def test_do_math_matches_eth_call(self):
+        """Test doMath results against eth_call on an in-memory chain."""
+        from web3 import EthereumTesterProvider, Web3  # pylint: disable=import-outside-toplevel
+        w3 = Web3(EthereumTesterProvider())
+        inbox = w3.eth.contract(abi=self.interface["abi"], bytecode=self.interface["bin"])
+        tx_hash = inbox.constructor("hello").transact({"from": w3.eth.accounts[0]})
+        address = w3.eth.wait_for_transaction_receipt(tx_hash).contractAddress
+        self.assertEqual(bytes(w3.eth.get_code(address)), self.evm.code)
+
+        for a, b in self.CASES:
+            with self.subTest(a=a, b=b):
+                try:
+                    remote = self.do_math.decode_output(w3.eth.call(
+                        {"to": address, "data": self.do_math.encode_input([a, b])}))
+                except ContractLogicError:
+                    remote = None
+                self.assertEqual(self.run_locally(a, b), remote)
+
+
+if __name__ == "__main__":
+    unittest.main()
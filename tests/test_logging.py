@@ -0,0 +1,85 @@
+"""
+Unit tests for the logging pipeline in the python_backend.
+"""
+import io
+import json
+import logging
+import os
+import sys
+import unittest
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.core import logger_config # pylint: disable=C0413
+from python_backend.core.logger_config import JsonFormatter, ModuleLevelFilter, \
+    RateLimitFilter # pylint: disable=C0413
+
+
+def make_record(level=logging.INFO, module="contract_store", line=10, msg="hello"):
+    """Build a log record as if logged from `module` at `line`."""
+    return logging.LogRecord("core.logger_config", level, f"/app/services/{module}.py",
+                             line, msg, (), None)
+
+
+class TestLogging(unittest.TestCase):
+    """
+    Test cases for the logging filters, the JSON formatter and the queue pipeline.
+    """
+
+    def test_module_levels(self):
+        """Test that module levels override the default level."""
+        log_filter = ModuleLevelFilter(logging.INFO, {"contract_store": logging.WARNING,
+                                                      "web3": logging.DEBUG})
+        self.assertFalse(log_filter.filter(make_record(logging.INFO)))
+        self.assertTrue(log_filter.filter(make_record(logging.ERROR)))
+        self.assertTrue(log_filter.filter(make_record(logging.INFO, module="routes_deploy")))
+        self.assertFalse(log_filter.filter(make_record(logging.DEBUG, module="routes_deploy")))
+        library = logging.LogRecord("web3.providers.rpc", logging.DEBUG, "/x/rpc.py", 1,
+                                    "request", (), None)
+        self.assertTrue(log_filter.filter(library))
+
+    def test_rate_limit_per_call_site(self):
+        """Test that a call site over its limit is suppressed until the window ends."""
+        now = [0.0]
+        log_filter = RateLimitFilter(limit=2, window=10, clock=lambda: now[0])
+
+        kept = [log_filter.filter(make_record()) for _ in range(5)]
+        self.assertEqual(kept, [True, True, False, False, False])
+        self.assertTrue(log_filter.filter(make_record(line=11)))
+        self.assertTrue(log_filter.filter(make_record(logging.WARNING)))
+
+        now[0] = 10.0
+        record = make_record()
+        self.assertTrue(log_filter.filter(record))
+        self.assertEqual(record.getMessage(), "hello (3 similar messages suppressed)")
+
+    def test_json_pipeline(self):
+        """Test that configured records reach the stream as JSON through the queue."""
+        stream = io.StringIO()
+        root = logging.getLogger()
+        level = root.level
+        try:
+            logger_config.configure_logging(
+                {"api_server": {"log_level": "info"},
+                 "logging": {"format": "json", "modules": {"test_logging": "warning"}}},
+                stream=stream)
+            logger = logging.getLogger("wildweb3.test")
+            logger.info("skipped by module level")
+            logger.warning("stored %d contracts", 3)
+            logger_config._stop_listener() # pylint: disable=protected-access
+        finally:
+            root.removeHandler(logger_config._HANDLER) # pylint: disable=protected-access
+            root.setLevel(level)
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        messages = [entry["message"] for entry in lines]
+        self.assertIn("stored 3 contracts", messages)
+        self.assertNotIn("skipped by module level", messages)
+        self.assertEqual(lines[-1]["level"], "WARNING")
+        self.assertEqual(lines[-1]["module"], "test_logging")
+        self.assertIsInstance(JsonFormatter().format(make_record()), str)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Unit tests for the main module and the app factory of the python_backend.
+"""
+import importlib.util
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+import api.app # pylint: disable=C0413
+from python_backend import main # pylint: disable=C0413
+
+
+def make_config(workers=1, reload=False):
+    """Build the `[api_server]` part of a configuration."""
+    return {"api_server": {"host": "127.0.0.1", "port": 8040, "log_level": "info",
+                           "reload": reload, "workers": workers}}
+
+
+class TestMain(unittest.TestCase):
+    """
+    Test cases for worker_count, run_webserver and create_app_from_env.
+    """
+
+    def test_worker_count(self):
+        """Test explicit, automatic and out-of-range worker counts."""
+        self.assertEqual(main.worker_count({"api_server": {}}), 1)
+        self.assertEqual(main.worker_count(make_config(4)), 4)
+        self.assertEqual(main.worker_count(make_config("3")), 3)
+        self.assertEqual(main.worker_count(make_config(-2)), 1)
+        with patch.object(main.os, "cpu_count", return_value=6):
+            self.assertEqual(main.worker_count(make_config(0)), 6)
+            self.assertEqual(main.worker_count(make_config("auto")), 6)
+        with patch.object(main.os, "cpu_count", return_value=None):
+            self.assertEqual(main.worker_count(make_config("auto")), 1)
+
+    def test_multiple_workers_use_production_server(self):
+        """Test that several workers run the production server unless reload is on."""
+        with patch.object(main, "run_production_server") as production, \
+                patch.object(main, "uvicorn") as uvicorn, \
+                patch.object(main, "create_app"):
+            main.run_webserver(make_config(3))
+            production.assert_called_once_with(make_config(3), 3)
+
+            main.run_webserver(make_config(3, reload=True))
+            production.assert_called_once()
+            uvicorn.Server.return_value.run.assert_called_once()
+
+    def test_uvicorn_workers_use_the_factory(self):
+        """Test that without gunicorn each worker builds the app from the factory."""
+        with patch.dict(sys.modules, {"gunicorn.app.base": None}), \
+                patch.object(main, "uvicorn") as uvicorn:
+            main.run_production_server(make_config(2), 2)
+
+        target = uvicorn.run.call_args[0][0]
+        self.assertEqual(target, "api.app:create_app_from_env")
+        self.assertTrue(uvicorn.run.call_args[1]["factory"])
+        self.assertEqual(uvicorn.run.call_args[1]["workers"], 2)
+        module, factory = target.split(":")
+        self.assertTrue(callable(getattr(sys.modules[module], factory)))
+
+    @unittest.skipIf(importlib.util.find_spec("gunicorn") is None, "gunicorn is not installed")
+    def test_gunicorn_preloads_the_app(self):
+        """Test that gunicorn serves one app created in the master before forking."""
+        from gunicorn.app.base import BaseApplication  # pylint: disable=import-outside-toplevel
+        with patch.object(BaseApplication, "run", autospec=True) as run, \
+                patch.object(main, "create_app", return_value="app") as create:
+            main.run_production_server(make_config(4), 4)
+
+        create.assert_called_once_with(make_config(4), preload=True)
+        application = run.call_args[0][0]
+        self.assertEqual(application.load(), "app")
+        self.assertTrue(application.cfg.preload_app)
+        self.assertEqual(application.cfg.workers, 4)
+        self.assertEqual(application.cfg.bind, ["127.0.0.1:8040"])
+
+    def test_main_exports_config_path(self):
+        """Test that main names the configuration file for factory-built workers."""
+        with patch.dict(os.environ), patch.object(main, "load_config", return_value={}), \
+                patch.object(main, "run_webserver"):
+            main.main("some/config.toml")
+            self.assertEqual(os.environ[main.CONFIG_ENV_VAR],
+                             os.path.abspath("some/config.toml"))
+
+    def test_create_app_from_env(self):
+        """Test that the factory loads the file named by WILDWEB3_CONFIG."""
+        self.assertEqual(api.app.CONFIG_ENV_VAR, "WILDWEB3_CONFIG")
+        with patch.object(api.app, "load_config", return_value={"loaded": True}) as load, \
+                patch.object(api.app, "create_app", return_value="app") as create:
+            with patch.dict(os.environ, {"WILDWEB3_CONFIG": "/etc/wildweb3.toml"}):
+                self.assertEqual(api.app.create_app_from_env(), "app")
+            load.assert_called_once_with("/etc/wildweb3.toml")
+            create.assert_called_once_with({"loaded": True})
+
+            with patch.dict(os.environ):
+                os.environ.pop("WILDWEB3_CONFIG", None)
+                api.app.create_app_from_env()
+            load.assert_called_with("../data/config.toml")
+
+
+if __name__ == "__main__":
+    unittest.main()
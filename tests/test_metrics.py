@@ -0,0 +1,99 @@
+"""
+Unit tests for the metrics module in the python_backend.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.core.metrics import Counter, Histogram, MetricsRegistry # pylint: disable=C0413
+from python_backend.core import rpc_router # pylint: disable=C0413
+from python_backend.core.rpc_guard import RPCGuard # pylint: disable=C0413
+from python_backend.api.routes_metrics import route_template # pylint: disable=C0413
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    Test cases for the metric types and the RPC instrumentation.
+    """
+
+    def test_render_prometheus_text(self):
+        """Test the exposition format of counters and histograms."""
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("calls_total", "Calls.", ("route",)))
+        histogram = registry.register(Histogram("latency_seconds", "Latency.", (),
+                                                buckets=(0.1, 1.0)))
+        counter.inc(route='/a"b')
+        counter.inc(2, route='/a"b')
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+
+        text = registry.render()
+
+        self.assertIn('calls_total{route="/a\\"b"} 3', text)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 2', text)
+        self.assertIn("latency_seconds_count 2", text)
+        self.assertIn("# TYPE latency_seconds histogram", text)
+        with self.assertRaises(ValueError):
+            counter.inc(network="x")
+        with self.assertRaises(ValueError):
+            registry.register(Counter("calls_total", "Again."))
+
+    def test_guarded_provider_records_rpc_calls(self):
+        """Test that RPC calls are counted per method and outcome."""
+        provider = MagicMock()
+        provider.make_request.side_effect = [
+            {"jsonrpc": "2.0", "id": 1, "result": "0x1"},
+            {"jsonrpc": "2.0", "id": 2, "error": {"code": -32000, "message": "nope"}},
+            ConnectionError("down"),
+        ]
+        guarded = rpc_router.GuardedProvider(provider, RPCGuard("metrics-net"))
+
+        guarded.make_request("eth_blockNumber", [])
+        guarded.make_request("eth_call", [])
+        with self.assertRaises(ConnectionError):
+            guarded.make_request("eth_call", [])
+
+        requests = rpc_router.RPC_REQUESTS
+        self.assertEqual(requests.value(network="metrics-net", method="eth_blockNumber",
+                                        outcome="ok"), 1)
+        self.assertEqual(requests.value(network="metrics-net", method="eth_call",
+                                        outcome="error"), 1)
+        self.assertEqual(requests.value(network="metrics-net", method="eth_call",
+                                        outcome="failed"), 1)
+        self.assertEqual(rpc_router.RPC_REQUEST_SECONDS.count(network="metrics-net",
+                                                              method="eth_call"), 2)
+
+    def test_route_template(self):
+        """Test that requests are labelled with the matched route, not their path."""
+        router = APIRouter()
+        router.add_api_route("/{network}/{name}", lambda network, name: None)
+        router.add_api_route("/files/{path:path}", lambda path: None)
+        app = FastAPI()
+        app.include_router(router, prefix="/inbox")
+        templates = []
+
+        @app.middleware("http")
+        async def record(request: Request, call_next):
+            response = await call_next(request)
+            templates.append(route_template(request))
+            return response
+
+        client = TestClient(app)
+        client.get("/inbox/inbox/network")
+        client.get("/inbox/files/a/b.txt")
+        client.get("/nowhere")
+        self.assertEqual(templates, ["/inbox/{network}/{name}", "/inbox/files/{path}",
+                                     "unmatched"])
+
+
+if __name__ == "__main__":
+    unittest.main()
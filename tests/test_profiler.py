@@ -0,0 +1,133 @@
+"""
+Unit tests for the profiler module in the python_backend.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.core.profiler import ProfileStore, StackSampler, \
+    to_collapsed # pylint: disable=C0413
+from python_backend.api import routes_admin # pylint: disable=C0413
+from python_backend.api.routes_admin import router as admin_router # pylint: disable=C0413
+
+
+def busy_loop(stop: threading.Event) -> None:
+    """Keep a thread on the CPU until stopped."""
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestProfiler(unittest.TestCase):
+    """
+    Test cases for the stack sampler and the profile store.
+    """
+
+    def test_sampler_captures_busy_thread(self):
+        """Test that a running thread is sampled and waiting threads are skipped."""
+        stop = threading.Event()
+        busy = threading.Thread(target=busy_loop, args=(stop,), name="busy-worker")
+        idle = threading.Thread(target=stop.wait, name="idle-worker")
+        busy.start()
+        idle.start()
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        time.sleep(0.1)
+        counts = sampler.stop()
+        stop.set()
+        busy.join()
+        idle.join()
+
+        self.assertFalse(sampler.running)
+        self.assertGreater(sampler.samples, 0)
+        busy_stacks = [s for s in counts if s.startswith("busy-worker;")]
+        self.assertTrue(busy_stacks)
+        self.assertTrue(any("busy_loop (test_profiler.py:" in s for s in busy_stacks))
+        self.assertFalse(any(s.startswith("idle-worker;") for s in counts))
+
+    def test_store_keeps_recent_profiles(self):
+        """Test the collapsed output, the profiling slot and the profile files."""
+        counts = Counter({"main;a;b": 2, "main;a": 5})
+        self.assertEqual(to_collapsed(counts), "main;a 5\nmain;a;b 2\n")
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            store = ProfileStore(max_profiles=2, output_dir=output_dir)
+            self.assertTrue(store.try_begin())
+            self.assertFalse(store.try_begin())
+            store.end()
+
+            first = store.add("GET", "/networks", 12.5, counts)
+            second = store.add("GET", "/users", 3.0, Counter())
+            third = store.add("POST", "/deploy/sepolia", 80.0, Counter({"main": 1}))
+
+            self.assertIsNone(store.get(first.profile_id))
+            self.assertIs(store.get(third.profile_id), third)
+            self.assertEqual([p["id"] for p in store.list()],
+                             [third.profile_id, second.profile_id])
+            with open(os.path.join(output_dir, f"{first.profile_id}.collapsed"),
+                      encoding="utf-8") as f:
+                self.assertEqual(f.read(), to_collapsed(counts))
+
+    def test_admin_routes_require_token(self):
+        """Test that the admin routes need profiling enabled and the configured token."""
+        app = FastAPI()
+        app.include_router(admin_router, prefix="/admin")
+        client = TestClient(app)
+
+        app.state.config = {"profiling": {"enabled": False, "admin_token": "secret"}}
+        self.assertEqual(client.get("/admin/profiles").status_code, 404)
+
+        for token in (None, "", "${PROFILING_ADMIN_TOKEN}"):
+            app.state.config = {"profiling": {"enabled": True, "admin_token": token}}
+            response = client.get("/admin/profiles", headers={"X-Admin-Token": token or ""})
+            self.assertEqual(response.status_code, 403)
+
+        app.state.config = {"profiling": {"enabled": True, "admin_token": "secret"}}
+        self.assertEqual(client.get("/admin/profiles").status_code, 403)
+        self.assertEqual(client.get("/admin/profiles",
+                                    headers={"X-Admin-Token": "wrong"}).status_code, 403)
+        response = client.get("/admin/profiles", headers={"X-Admin-Token": "secret"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["pid"], os.getpid())
+
+    def test_sampler_stops_off_the_event_loop(self):
+        """Test that a profiled request joins the sampler thread outside the event loop."""
+        app = FastAPI()
+        app.state.config = {"profiling": {"enabled": True, "interval_ms": 1}}
+        app.middleware("http")(routes_admin.profile_requests)
+        threads = {}
+
+        @app.get("/ping")
+        async def ping():
+            threads["loop"] = threading.get_ident()
+            return {"ok": True}
+
+        # The app imports the backend modules by their short names
+        sampler_class = routes_admin.StackSampler
+        stop = sampler_class.stop
+
+        def recording_stop(sampler):
+            threads["stop"] = threading.get_ident()
+            return stop(sampler)
+
+        with patch.object(routes_admin, "_PROFILE_STORE", ProfileStore(5)), \
+                patch.object(sampler_class, "stop", recording_stop):
+            response = TestClient(app).get("/ping", headers={"X-Profile": "1"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("X-Profile-Id", response.headers)
+        self.assertNotEqual(threads["stop"], threads["loop"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Unit tests for the rpc_guard module in the python_backend.
+"""
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.core.rpc_guard import Bulkhead, BulkheadFullError, CircuitBreaker, \
+    CircuitOpenError, RPCGuard # pylint: disable=C0413
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRPCGuard(unittest.TestCase):
+    """
+    Test cases for the CircuitBreaker, Bulkhead and RPCGuard classes.
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker("testnet", failure_threshold=3, reset_timeout=10,
+                                      clock=self.clock)
+
+    def open_breaker(self):
+        """Fail enough calls to open the circuit."""
+        for _ in range(3):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the circuit and successes reset the count."""
+        for _ in range(2):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+        self.breaker.record_success()
+        self.assertEqual((self.breaker.state, self.breaker.failures), (CircuitBreaker.CLOSED, 0))
+
+        self.open_breaker()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.clock.now = 9.9
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_half_open_probe_closes(self):
+        """Test that one probe is let through after the timeout and closes the circuit."""
+        self.open_breaker()
+        self.clock.now = 10.0
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        # Only one probe at a time
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.before_call()
+
+    def test_half_open_probe_reopens(self):
+        """Test that a failed probe opens the circuit for another full timeout."""
+        self.open_breaker()
+        self.clock.now = 10.0
+        self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.opened_at, 10.0)
+
+        self.clock.now = 19.9
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.clock.now = 20.0
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+
+    def test_cancelled_probe(self):
+        """Test that a probe that never ran lets another caller probe."""
+        self.open_breaker()
+        self.clock.now = 10.0
+        self.breaker.before_call()
+        self.breaker.cancel_probe()
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+
+    def test_bulkhead_saturation(self):
+        """Test that callers queue up to the limit and give up after the queue timeout."""
+        bulkhead = Bulkhead("testnet", max_in_flight=1, max_queue=1, queue_timeout=0.2)
+        bulkhead.acquire()
+        self.assertEqual(bulkhead.in_flight, 1)
+
+        errors = []
+
+        def queued():
+            try:
+                bulkhead.acquire()
+            except BulkheadFullError as e:
+                errors.append(e)
+        waiter = threading.Thread(target=queued)
+        waiter.start()
+        deadline = time.monotonic() + 1
+        while bulkhead.waiting == 0 and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+        with self.assertRaisesRegex(BulkheadFullError, "too many queued"):
+            bulkhead.acquire()
+        waiter.join()
+        self.assertIn("timed out", str(errors[0]))
+        self.assertEqual((bulkhead.in_flight, bulkhead.waiting), (1, 0))
+
+        bulkhead.release()
+        bulkhead.acquire()
+        self.assertEqual(bulkhead.in_flight, 1)
+
+    def test_queued_caller_gets_released_slot(self):
+        """Test that a queued caller proceeds as soon as a slot is released."""
+        bulkhead = Bulkhead("testnet", max_in_flight=1, max_queue=1, queue_timeout=5)
+        bulkhead.acquire()
+        waiter = threading.Thread(target=bulkhead.acquire)
+        waiter.start()
+        bulkhead.release()
+        waiter.join(timeout=2)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(bulkhead.in_flight, 1)
+
+    def test_guard_counts_connection_errors_only(self):
+        """Test that only OSErrors count as failures, and a full bulkhead frees the probe."""
+        guard = RPCGuard("testnet", max_in_flight=1, max_queue=0, queue_timeout=0.01)
+        guard.breaker = self.breaker
+
+        def fail(error):
+            raise error
+
+        with self.assertRaises(ValueError):
+            guard.call(fail, ValueError("execution reverted"))
+        self.assertEqual(self.breaker.failures, 0)
+        for _ in range(3):
+            with self.assertRaises(OSError):
+                guard.call(fail, TimeoutError("timed out"))
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(guard.bulkhead.in_flight, 0)
+
+        self.clock.now = 10.0
+        guard.bulkhead.acquire()
+        with self.assertRaises(BulkheadFullError):
+            guard.call(lambda: "0x1")
+        guard.bulkhead.release()
+        self.assertEqual(guard.call(lambda: "0x1"), "0x1")
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
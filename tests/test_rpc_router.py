@@ -0,0 +1,190 @@
+"""
+Unit tests for the rpc_router module in the python_backend.
+
+The endpoints are local stub JSON-RPC servers running in background threads.
+"""
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.core.rpc_router import FailoverHTTPProvider # pylint: disable=C0413
+
+
+class StubRPCServer:
+    """A JSON-RPC server that answers every request with a fixed result after a delay."""
+
+    def __init__(self, result, delay=0.0):
+        self.calls = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Answer JSON-RPC requests with the stub result."""
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                """Handle a single or batch JSON-RPC request."""
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.calls += 1
+                time.sleep(delay)
+                requests = body if isinstance(body, list) else [body]
+                responses = [{"jsonrpc": "2.0", "id": r["id"], "result": result} for r in requests]
+                payload = json.dumps(responses if isinstance(body, list) else responses[0])
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(payload.encode())
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        """Shut the server down."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def dead_url():
+    """Return the URL of a local port with nothing listening on it."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+class TestRpcRouter(unittest.TestCase):
+    """
+    Test cases for the FailoverHTTPProvider class.
+    """
+
+    def setUp(self):
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.stop()
+
+    def stub(self, result, delay=0.0):
+        """Start a stub server that is stopped after the test."""
+        server = StubRPCServer(result, delay)
+        self.servers.append(server)
+        return server
+
+    def test_failover_to_healthy_endpoint(self):
+        """Test that a request fails over when the preferred endpoint is down."""
+        healthy = self.stub("0x1")
+        provider = FailoverHTTPProvider([{"url": dead_url(), "weight": 10},
+                                         {"url": healthy.url}], request_timeout=2)
+
+        response = provider.make_request("eth_blockNumber", [])
+
+        self.assertEqual(response["result"], "0x1")
+        self.assertEqual(healthy.calls, 1)
+        # The dead endpoint is now cooling down and ranked last
+        self.assertEqual(provider.ranked_endpoints()[0].url, healthy.url)
+
+    def test_all_endpoints_down(self):
+        """Test that a ConnectionError is raised when no endpoint answers."""
+        provider = FailoverHTTPProvider([{"url": dead_url()}, {"url": dead_url()}],
+                                        request_timeout=2)
+        with self.assertRaises(ConnectionError):
+            provider.make_request("eth_blockNumber", [])
+
+    def test_routes_to_lowest_latency(self):
+        """Test that the faster endpoint is preferred once latencies are known."""
+        slow = self.stub("0xslow", delay=0.2)
+        fast = self.stub("0xfast")
+        provider = FailoverHTTPProvider([{"url": slow.url}, {"url": fast.url}])
+        provider.endpoints[0].record_success(0.2)
+        provider.endpoints[1].record_success(0.01)
+
+        for _ in range(3):
+            self.assertEqual(provider.make_request("eth_chainId", [])["result"], "0xfast")
+        self.assertEqual(slow.calls, 0)
+
+    def test_weight_scales_preference(self):
+        """Test that a heavier weight can outrank a slightly faster endpoint."""
+        provider = FailoverHTTPProvider([{"url": dead_url(), "weight": 1},
+                                         {"url": dead_url(), "weight": 5}])
+        provider.endpoints[0].record_success(0.05)
+        provider.endpoints[1].record_success(0.1)
+        self.assertIs(provider.ranked_endpoints()[0], provider.endpoints[1])
+
+    def test_failed_endpoint_recovers_rank(self):
+        """Test that the error penalty decays with time, without further requests."""
+        provider = FailoverHTTPProvider([{"url": dead_url()}, {"url": dead_url()}])
+        flaky, steady = provider.endpoints
+        flaky.record_success(0.05, now=0.0)
+        steady.record_success(0.08, now=0.0)
+        for _ in range(3):
+            flaky.record_failure(now=1.0)
+        flaky.cooldown_until = 0.0
+
+        self.assertGreater(flaky.score(now=1.0), steady.score(now=1.0))
+        self.assertAlmostEqual(flaky.decayed_error_rate(31.0), flaky.error_rate / 2)
+        self.assertLess(flaky.score(now=300.0), steady.score(now=300.0))
+
+    def test_hedges_slow_reads(self):
+        """Test that a slow read is hedged to the second endpoint."""
+        slow = self.stub("0xslow", delay=1.0)
+        fast = self.stub("0xfast")
+        provider = FailoverHTTPProvider([{"url": slow.url}, {"url": fast.url}],
+                                        hedge_after_ms=50)
+
+        start = time.monotonic()
+        response = provider.make_request("eth_call", [{}, "latest"])
+
+        self.assertEqual(response["result"], "0xfast")
+        self.assertLess(time.monotonic() - start, 0.9)
+
+    def test_concurrent_reads_are_not_hedged_by_queueing(self):
+        """Test that reads up to the bulkhead limit start at once instead of queueing."""
+        first = self.stub("0x1", delay=0.25)
+        second = self.stub("0x2", delay=0.25)
+        provider = FailoverHTTPProvider([{"url": first.url}, {"url": second.url}],
+                                        hedge_after_ms=400, max_in_flight=16)
+
+        threads = [threading.Thread(target=provider.make_request,
+                                    args=("eth_call", [{}, "latest"])) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(first.calls + second.calls, 16)
+
+    def test_writes_are_not_hedged(self):
+        """Test that transactions are only sent to one endpoint."""
+        slow = self.stub("0xhash", delay=0.2)
+        other = self.stub("0xother")
+        provider = FailoverHTTPProvider([{"url": slow.url}, {"url": other.url}],
+                                        hedge_after_ms=10)
+
+        response = provider.make_request("eth_sendRawTransaction", ["0x00"])
+
+        self.assertEqual(response["result"], "0xhash")
+        self.assertEqual(other.calls, 0)
+
+    def test_batch_request_failover(self):
+        """Test that batch requests fail over as a whole."""
+        healthy = self.stub("0x1")
+        provider = FailoverHTTPProvider([{"url": dead_url()}, {"url": healthy.url}],
+                                        request_timeout=2)
+
+        responses = provider.make_batch_request([("eth_blockNumber", []), ("eth_chainId", [])])
+
+        self.assertEqual([r["result"] for r in responses], ["0x1", "0x1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
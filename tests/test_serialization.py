@@ -0,0 +1,78 @@
+"""
+Unit tests for the response serialization and compression in the python_backend.
+"""
+import json
+import os
+import sys
+import unittest
+from datetime import datetime
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.api import serialization # pylint: disable=C0413
+from python_backend.api.serialization import FastJSONResponse, add_compression, \
+    dumps_json, negotiated_response # pylint: disable=C0413
+
+
+class TestSerialization(unittest.TestCase):
+    """
+    Test cases for the JSON encoder, content negotiation and compression.
+    """
+
+    def setUp(self):
+        """Create an app with a large response, a small one and an event stream."""
+        app = FastAPI(default_response_class=FastJSONResponse)
+        add_compression(app, {"compression": {"brotli": False, "minimum_size": 500}})
+
+        @app.get("/rows")
+        def rows(request: Request):
+            return negotiated_response(request, {"rows": [{"id": n, "name": "Inbox"}
+                                                          for n in range(200)]})
+
+        @app.get("/small")
+        def small():
+            return {"ok": True}
+
+        @app.get("/stream")
+        def stream():
+            return StreamingResponse(iter(["data: x\n\n" * 200]),
+                                     media_type="text/event-stream")
+
+        self.client = TestClient(app)
+
+    def test_dumps_json(self):
+        """Test datetimes, bytes and integers beyond 64 bits."""
+        content = {"ts": datetime(2024, 5, 1, 12, 30, 0, 250000), "data": b"\x01\xff",
+                   "balance": 2 ** 200}
+        self.assertEqual(json.loads(dumps_json(content)), {
+            "ts": "2024-05-01T12:30:00.250000", "data": "0x01ff", "balance": 2 ** 200})
+
+    def test_compression_threshold(self):
+        """Test that only large, non-streaming responses are compressed."""
+        rows = self.client.get("/rows", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(rows.headers.get("content-encoding"), "gzip")
+        self.assertEqual(len(rows.json()["rows"]), 200)
+        self.assertIn("Accept", rows.headers["vary"])
+
+        small = self.client.get("/small", headers={"Accept-Encoding": "gzip"})
+        self.assertIsNone(small.headers.get("content-encoding"))
+        self.assertEqual(small.json(), {"ok": True})
+
+        stream = self.client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        self.assertIsNone(stream.headers.get("content-encoding"))
+
+    @unittest.skipIf(serialization.msgpack is None, "msgpack is not installed")
+    def test_msgpack_negotiation(self):
+        """Test that clients accepting MessagePack get it."""
+        response = self.client.get("/rows", headers={"Accept": "application/msgpack"})
+        self.assertEqual(response.headers["content-type"], "application/msgpack")
+        self.assertEqual(len(serialization.msgpack.unpackb(response.content)["rows"]), 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
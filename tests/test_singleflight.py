@@ -0,0 +1,96 @@
+"""
+Unit tests for the singleflight module in the python_backend.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.services.singleflight import SingleFlight # pylint: disable=C0413
+
+
+class TestSingleFlight(unittest.TestCase):
+    """
+    Test cases for the synchronous path of the SingleFlight class.
+    """
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that identical concurrent calls run the function once."""
+        flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def slow_read():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return "hello"
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            leader = pool.submit(flight.do, "key", slow_read)
+            started.wait()
+            followers = [pool.submit(flight.do, "key", slow_read) for _ in range(7)]
+            results = [leader.result()] + [f.result() for f in followers]
+
+        self.assertEqual(results, ["hello"] * 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_different_keys_are_not_coalesced(self):
+        """Test that calls with different keys run independently."""
+        flight = SingleFlight()
+        self.assertEqual(flight.do("a", lambda: 1), 1)
+        self.assertEqual(flight.do("b", lambda: 2), 2)
+
+    def test_errors_are_shared(self):
+        """Test that waiting callers receive the leader's exception."""
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def failing_read():
+            started.set()
+            time.sleep(0.1)
+            raise ValueError("node error")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flight.do, "key", failing_read)
+            started.wait()
+            follower = pool.submit(flight.do, "key", failing_read)
+            for future in (leader, follower):
+                with self.assertRaises(ValueError):
+                    future.result()
+
+        # A failed call is not cached
+        self.assertEqual(flight.do("key", lambda: "ok"), "ok")
+
+
+class TestSingleFlightAsync(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for the asyncio path of the SingleFlight class.
+    """
+
+    async def test_concurrent_awaits_share_one_execution(self):
+        """Test that identical concurrent awaits run the coroutine once."""
+        flight = SingleFlight()
+        calls = []
+
+        async def slow_read():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 42
+
+        results = await asyncio.gather(*(flight.do_async("key", slow_read) for _ in range(5)))
+
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.in_flight(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Unit tests for the lazy imports and readiness checks in the python_backend.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.core.lazy_import import is_loaded, lazy_import, load # pylint: disable=C0413
+from python_backend.api.routes_health import CachedCheck # pylint: disable=C0413
+
+
+class TestStartup(unittest.TestCase):
+    """
+    Test cases for lazy_import and CachedCheck.
+    """
+
+    def test_lazy_import_defers_execution(self):
+        """Test that a lazy module only runs its code on first attribute access."""
+        name = "xml.dom.minicompat"
+        sys.modules.pop(name, None)
+        module = lazy_import(name)
+
+        self.assertFalse(is_loaded(name))
+        self.assertIs(lazy_import(name), module)
+        self.assertTrue(callable(module.NodeList))
+        self.assertTrue(is_loaded(name))
+        self.assertIs(load(name), module)
+
+        with self.assertRaises(ModuleNotFoundError):
+            lazy_import("wildweb3_missing_module")
+
+    def test_cached_check(self):
+        """Test that results are reused within the TTL and failures are reported."""
+        now = [0.0]
+        check = MagicMock(return_value=True)
+        cached = CachedCheck(check, ttl=5.0, clock=lambda: now[0])
+
+        self.assertTrue(cached())
+        self.assertTrue(cached())
+        check.assert_called_once()
+
+        now[0] = 6.0
+        check.side_effect = RuntimeError("database is down")
+        self.assertFalse(cached())
+        self.assertEqual(check.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Unit tests for the tracing module in the python_backend.
+"""
+import os
+import sys
+import threading
+import unittest
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.core.tracing import NOOP_SPAN, OTLPHttpExporter, SpanContext, \
+    SpanExporter, Tracer # pylint: disable=C0413
+
+
+class MemoryExporter(SpanExporter):
+    """Keeps exported spans in a list."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+class TestTracing(unittest.TestCase):
+    """
+    Test cases for spans, sampling and exporters.
+    """
+
+    def test_nested_spans_and_links(self):
+        """Test parent/child relations, error status and links from another thread."""
+        exporter = MemoryExporter()
+        tracer = Tracer(exporters=[exporter])
+        remote = SpanContext.from_traceparent("00-" + "ab" * 16 + "-" + "cd" * 8 + "-01")
+
+        with tracer.start_span("request", parent=remote) as root:
+            with self.assertRaises(ValueError):
+                with tracer.start_span("rpc eth_call"):
+                    raise ValueError("reverted")
+            origin = root.context
+
+        def confirm():
+            with tracer.start_span("tx.confirm", links=[origin]):
+                pass
+
+        thread = threading.Thread(target=confirm)
+        thread.start()
+        thread.join()
+        tracer.shutdown()
+
+        spans = {span.name: span for span in exporter.spans}
+        self.assertEqual(spans["request"].context.trace_id, "ab" * 16)
+        self.assertEqual(spans["request"].parent_id, "cd" * 8)
+        self.assertEqual(spans["rpc eth_call"].parent_id, spans["request"].context.span_id)
+        self.assertEqual(spans["rpc eth_call"].status, "error")
+        self.assertIsNone(spans["tx.confirm"].parent_id)
+        self.assertNotEqual(spans["tx.confirm"].context.trace_id, "ab" * 16)
+        self.assertEqual(spans["tx.confirm"].links[0].span_id, origin.span_id)
+
+    def test_sampling_and_disabled_tracer(self):
+        """Test that unsampled traces and disabled tracers record nothing."""
+        self.assertIs(Tracer().create_span("x"), NOOP_SPAN)
+
+        exporter = MemoryExporter()
+        tracer = Tracer(exporters=[exporter], sample_ratio=0.0)
+        with tracer.start_span("request") as root:
+            with tracer.start_span("child") as child:
+                self.assertFalse(child.is_recording)
+                self.assertEqual(child.context.trace_id, root.context.trace_id)
+        tracer.shutdown()
+        self.assertEqual(exporter.spans, [])
+        self.assertIsNone(SpanContext.from_traceparent("00-xyz-01"))
+
+    def test_otlp_encoding(self):
+        """Test the OTLP/HTTP JSON payload of a span."""
+        tracer = Tracer(exporters=[MemoryExporter()])
+        span = tracer.create_span("db get_contracts", attributes={"rows": 3, "ok": True})
+        span.end_ns = span.start_ns + 1000
+
+        payload = OTLPHttpExporter("http://collector", "wildweb3").encode([span])
+        resource_spans = payload["resourceSpans"][0]
+        encoded = resource_spans["scopeSpans"][0]["spans"][0]
+        self.assertEqual(resource_spans["resource"]["attributes"][0]["value"],
+                         {"stringValue": "wildweb3"})
+        self.assertEqual(encoded["traceId"], span.context.trace_id)
+        self.assertEqual(encoded["endTimeUnixNano"], str(span.start_ns + 1000))
+        self.assertIn({"key": "rows", "value": {"intValue": "3"}}, encoded["attributes"])
+        self.assertIn({"key": "ok", "value": {"boolValue": True}}, encoded["attributes"])
+        self.assertNotIn("parentSpanId", encoded)
+        tracer.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+"""
+Unit tests for the tx_replacement module in the python_backend.
+"""
+import functools
+import tempfile
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.services import deploy_contract, tx_replacement # pylint: disable=C0413
+from python_backend.services.abi_codec import AbiIndex, ContractAbi # pylint: disable=C0413
+from python_backend.services.ethereum_account import EthereumAccount # pylint: disable=C0413
+from python_backend.services.tx_replacement import ReplacementPolicy, TransactionReplacer, \
+    TransactionTracker, sanitize_transaction # pylint: disable=C0413
+from tests.helpers import INBOX_ABI, make_receipt_account, \
+    write_inbox_abi # pylint: disable=C0413
+
+
+class FakeClock:
+    """A clock that advances every time the replacer sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        """Advance the clock instead of sleeping."""
+        self.now += seconds
+
+
+class TestTxReplacement(unittest.TestCase):
+    """
+    Test cases for the ReplacementPolicy and TransactionReplacer classes.
+    """
+
+    def setUp(self):
+        self.transaction = {"nonce": 7, "gas": 21000, "gasPrice": 100, "to": "0x00", "value": 0}
+        self.clock = FakeClock()
+
+    def make_replacer(self, account, replace=True, **policy_kwargs):
+        """Build a replacer that uses the fake clock."""
+        policy_kwargs.setdefault("target_inclusion_seconds", 40)
+        policy_kwargs.setdefault("poll_interval_seconds", 10)
+        return TransactionReplacer(account, self.transaction, "0xhash0",
+                                   ReplacementPolicy(**policy_kwargs), replace,
+                                   sleep=self.clock.sleep, clock=self.clock)
+
+    def test_sanitize_transaction(self):
+        """Test that node-only fields are stripped and input is mapped to data."""
+        raw = {"nonce": 1, "gasPrice": 5, "input": "0xabcd", "hash": "0x1", "blockNumber": None,
+               "v": 27, "r": 1, "s": 2, "from": "0xme"}
+        self.assertEqual(sanitize_transaction(raw), {"nonce": 1, "gasPrice": 5, "data": "0xabcd"})
+
+    def test_curves(self):
+        """Test the named and explicit escalation curves."""
+        linear = ReplacementPolicy(curve="linear", bump_factor=1.2)
+        self.assertAlmostEqual(linear.multiplier(3), 1.6)
+        self.assertAlmostEqual(ReplacementPolicy(bump_factor=1.5).multiplier(2), 2.25)
+        explicit = ReplacementPolicy(curve=[1.2, 2.0])
+        self.assertEqual(explicit.multiplier(1), 1.2)
+        self.assertEqual(explicit.multiplier(5), 2.0)
+        with self.assertRaises(ValueError):
+            ReplacementPolicy(curve="quadratic")
+        with self.assertRaises(ValueError):
+            ReplacementPolicy(curve=[])
+        with self.assertRaises(ValueError):
+            ReplacementPolicy(curve=[1.2, 0])
+
+    def test_fee_cap(self):
+        """Test that the tighter of the per-gas and total fee caps wins."""
+        policy = ReplacementPolicy(max_fee_per_gas_gwei=10, max_total_fee_eth=0.0001)
+        self.assertEqual(policy.fee_cap(21000), int(0.0001 * 10**18) // 21000)
+        self.assertIsNone(ReplacementPolicy().fee_cap(21000))
+
+    def test_mined_without_replacement(self):
+        """Test that a transaction mined quickly is never replaced."""
+        account = make_receipt_account(mined_hash="0xhash0")
+        receipt = self.make_replacer(account).wait_for_receipt()
+        self.assertEqual(receipt["hash"], "0xhash0")
+        account.send_transaction.assert_not_called()
+
+    def test_events_carry_the_decoded_call(self):
+        """Test that lifecycle events name the function called and its arguments."""
+        events = []
+        unsubscribe = tx_replacement.EVENT_BUS.subscribe(("tx", "testnet"), events.append)
+        self.addCleanup(unsubscribe)
+        self.transaction["data"] = "0x" + ContractAbi(INBOX_ABI).function(
+            "setMessage", 1).encode_input(["hi"]).hex()
+
+        with tempfile.TemporaryDirectory() as build_path:
+            write_inbox_abi(build_path)
+            with patch.object(tx_replacement, "get_abi_index",
+                              return_value=AbiIndex(build_path)):
+                self.make_replacer(make_receipt_account(mined_hash="0xhash0")).wait_for_receipt()
+                transfer = TransactionReplacer(make_receipt_account(), {"to": "0x01"}, "0x1")
+
+        self.assertEqual(events[-1]["status"], "mined")
+        self.assertEqual(events[-1]["call"], {
+            "contract": "Inbox", "function": "setMessage", "signature": "setMessage(string)",
+            "args": {"newMessage": "hi"},
+        })
+        self.assertIsNone(transfer.call)
+
+    def test_replacement_detected_when_mined(self):
+        """Test that fees escalate and a mined replacement hash is detected."""
+        account = make_receipt_account(mined_hash="0xhash2", mined_after=4)
+        replacer = self.make_replacer(account, max_replacements=4, bump_factor=1.5)
+        receipt = replacer.wait_for_receipt()
+
+        self.assertEqual(receipt["hash"], "0xhash2")
+        self.assertEqual(replacer.tx_hashes[:3], ["0xhash0", "0xhash1", "0xhash2"])
+        self.assertEqual([tx["gasPrice"] for tx in account.sent[:2]], [150, 225])
+        self.assertTrue(all(tx["nonce"] == 7 for tx in account.sent))
+
+    def test_fee_cap_stops_escalation(self):
+        """Test that no replacement exceeds the fee cap."""
+        account = make_receipt_account()
+        replacer = self.make_replacer(account, max_fee_per_gas_gwei=130 / 10**9,
+                                      timeout_seconds=100)
+        with self.assertRaises(TimeoutError):
+            replacer.wait_for_receipt()
+
+        self.assertEqual([tx["gasPrice"] for tx in account.sent], [112, 126])
+
+    def test_eip1559_fees_escalate(self):
+        """Test that both EIP-1559 fee fields are bumped."""
+        self.transaction = {"nonce": 1, "gas": 21000, "maxFeePerGas": 200,
+                            "maxPriorityFeePerGas": 10, "type": 2}
+        account = make_receipt_account(mined_hash="0xhash1", mined_after=3, gas_price=50)
+        self.make_replacer(account).wait_for_receipt()
+
+        self.assertEqual(account.sent[0]["maxFeePerGas"], 225)
+        self.assertEqual(account.sent[0]["maxPriorityFeePerGas"], 11)
+
+    def test_capped_priority_fee_stops_escalation(self):
+        """Test that no underpriced replacement is sent when the cap blocks the priority bump."""
+        self.transaction = {"nonce": 1, "gas": 21000, "maxFeePerGas": 100,
+                            "maxPriorityFeePerGas": 100, "type": 2}
+        account = make_receipt_account(gas_price=50)
+        replacer = self.make_replacer(account, max_fee_per_gas_gwei=105 / 10**9,
+                                      timeout_seconds=100)
+        with self.assertRaises(TimeoutError):
+            replacer.wait_for_receipt()
+
+        account.send_transaction.assert_not_called()
+        self.assertIsNone(replacer._escalated_fees(1))  # pylint: disable=protected-access
+
+    def test_watching_replacer_never_resigns(self):
+        """Test that a stuck transaction is not re-signed when replacement is off."""
+        account = make_receipt_account(mined_hash="0xhash0", mined_after=6)
+        receipt = self.make_replacer(account, replace=False).wait_for_receipt()
+
+        self.assertEqual(receipt["hash"], "0xhash0")
+        account.sign_transaction.assert_not_called()
+
+    def test_stuck_deploy_is_replaced_by_default(self):
+        """Test that waiting for a deployment replaces it under the default policy."""
+        account = make_receipt_account(mined_hash="0xhash1", mined_after=2)
+        account.config["replacement"] = {"target_inclusion_seconds": 0.02, "max_replacements": 1,
+                                         "poll_interval_seconds": 0.01,
+                                         "replace_tracked": False}
+        account.wait_for_transaction = functools.partial(EthereumAccount.wait_for_transaction,
+                                                         account)
+        deployer = deploy_contract.ContractDeployer.__new__(deploy_contract.ContractDeployer)
+        deployer.eth_account = account
+
+        receipt = deployer.wait_for_transaction(self.transaction, "0xhash0")
+
+        self.assertEqual(receipt["hash"], "0xhash1")
+        self.assertEqual(len(account.sent), 1)
+
+    def test_tracked_transactions_are_watched_unless_configured(self):
+        """Test that background tracking only replaces with `replace_tracked` or per call."""
+        account = make_receipt_account()
+        with patch.object(tx_replacement, "TRACKER") as tracker:
+            tx_replacement.track_transaction(account, self.transaction, "0xhash0")
+            tx_replacement.track_transaction(account, self.transaction, "0xhash0", replace=True)
+            account.config["replacement"] = {"replace_tracked": True}
+            tx_replacement.track_transaction(account, self.transaction, "0xhash0")
+
+        self.assertEqual([c[0][0].replace for c in tracker.track.call_args_list],
+                         [False, True, True])
+
+    def test_tracker_polls_all_transactions_from_one_loop(self):
+        """Test that the tracker resolves several transactions without a thread per hash."""
+        tracker = TransactionTracker(clock=self.clock)
+        quick = make_receipt_account(mined_hash="0xhash0", mined_after=1)
+        stuck = make_receipt_account()
+        futures = [tracker.track(self.make_replacer(account, replace=False,
+                                                    timeout_seconds=30), start=False)
+                   for account in (quick, stuck)]
+
+        tracker.poll_once()
+        self.assertEqual(len(tracker), 2)
+        for _ in range(5):
+            self.clock.sleep(10)
+            tracker.poll_once()
+
+        self.assertEqual(futures[0].result(timeout=0)["hash"], "0xhash0")
+        with self.assertRaises(TimeoutError):
+            futures[1].result(timeout=0)
+        self.assertEqual(len(tracker), 0)
+        stuck.send_transaction.assert_not_called()
+
+    def test_tracker_thread(self):
+        """Test that the background thread wakes up for a newly tracked transaction."""
+        tracker = TransactionTracker()
+        account = make_receipt_account(mined_hash="0xhash0")
+        replacer = TransactionReplacer(account, self.transaction, "0xhash0",
+                                       ReplacementPolicy(poll_interval_seconds=0.01))
+        self.assertEqual(tracker.track(replacer).result(timeout=5)["hash"], "0xhash0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,239 @@
+"""
+Unit tests for the ws_subscriber and event_bus modules in the python_backend.
+
+The node is a local stub WebSocket JSON-RPC server running in a background thread.
+"""
+import asyncio
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import unittest
+
+from websockets.asyncio.server import serve
+
+# Add the path to the python_backend explicitly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../python_backend')))
+
+from python_backend.core.event_bus import EventBus # pylint: disable=C0413
+from python_backend.core.ws_subscriber import BlockSubscriber # pylint: disable=C0413
+
+CONTRACT = "0x00000000000000000000000000000000000000aa"
+
+
+def block(number, forked=()):
+    """Return a JSON-RPC block header; blocks numbered in `forked` are on a fork."""
+    def block_hash(n):
+        return f"0x{n + (0xf000 if n in forked else 0):064x}"
+    return {"number": hex(number), "hash": block_hash(number),
+            "parentHash": block_hash(number - 1), "timestamp": hex(1000 + number)}
+
+
+class StubNode:
+    """A WebSocket JSON-RPC node that serves blocks up to `head` and pushes new heads."""
+
+    def __init__(self, head):
+        self.head = head
+        self.forked = set()
+        self.connections = set()
+        self.connected = threading.Event()
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        async def handler(ws):
+            self.connections.add(ws)
+            try:
+                async for raw in ws:
+                    request = json.loads(raw)
+                    await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"],
+                                              "result": self.answer(request)}))
+            finally:
+                self.connections.discard(ws)
+
+        async def main():
+            self.server = await serve(handler, "127.0.0.1", 0)
+            self.url = f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+            ready.set()
+            await self.server.wait_closed()
+
+        threading.Thread(target=self.loop.run_until_complete, args=(main(),), daemon=True).start()
+        ready.wait(5)
+
+    def answer(self, request):
+        """Return the result of a JSON-RPC request."""
+        method, params = request["method"], request["params"]
+        if method == "eth_subscribe":
+            if params[0] == "logs":
+                self.connected.set()
+            return "0xlogs" if params[0] == "logs" else "0xheads"
+        if method == "eth_blockNumber":
+            return hex(self.head)
+        if method == "eth_getBlockByNumber":
+            return block(int(params[0], 16), self.forked)
+        if method == "eth_getLogs":
+            return [{"address": CONTRACT, "blockNumber": params[0]["toBlock"],
+                     "transactionHash": "0x01", "logIndex": "0x0", "topics": [], "data": "0x"}]
+        return None
+
+    def push_head(self, number):
+        """Mine a block and notify every connection."""
+        self.head = number
+        message = json.dumps({"jsonrpc": "2.0", "method": "eth_subscription",
+                              "params": {"subscription": "0xheads",
+                                         "result": block(number, self.forked)}})
+
+        async def send():
+            for ws in list(self.connections):
+                await ws.send(message)
+
+        asyncio.run_coroutine_threadsafe(send(), self.loop).result(5)
+
+    def drop(self):
+        """Close every connection."""
+        self.connected.clear()
+
+        async def close():
+            for ws in list(self.connections):
+                await ws.close()
+
+        asyncio.run_coroutine_threadsafe(close(), self.loop).result(5)
+
+    def stop(self):
+        """Shut the server down."""
+        self.loop.call_soon_threadsafe(self.server.close)
+
+
+class TestEventBus(unittest.TestCase):
+    """
+    Test cases for the EventBus class.
+    """
+
+    def test_publish_and_unsubscribe(self):
+        """Test that events reach subscribers until they unsubscribe."""
+        bus = EventBus()
+        events = []
+        unsubscribe = bus.subscribe(("new_head", "test"), events.append)
+
+        self.assertEqual(bus.publish(("new_head", "test"), 1), 1)
+        self.assertEqual(bus.publish(("new_head", "other"), 2), 0)
+        unsubscribe()
+        bus.publish(("new_head", "test"), 3)
+
+        self.assertEqual(events, [1])
+        self.assertFalse(bus.has_subscribers(("new_head", "test")))
+
+    def test_failing_subscriber_does_not_stop_others(self):
+        """Test that an exception in one callback does not affect the others."""
+        bus = EventBus()
+        events = []
+        bus.subscribe("topic", lambda event: 1 / 0)
+        bus.subscribe("topic", events.append)
+
+        bus.publish("topic", "event")
+
+        self.assertEqual(events, ["event"])
+
+
+class TestBlockSubscriber(unittest.TestCase):
+    """
+    Test cases for the BlockSubscriber class.
+    """
+
+    def setUp(self):
+        self.node = StubNode(head=10)
+        self.bus = EventBus()
+        self.heads = queue.Queue()
+        self.logs = queue.Queue()
+        self.bus.subscribe(("new_head", "test"), self.heads.put)
+        self.bus.subscribe(("log", "test"), self.logs.put)
+        self.reorgs = queue.Queue()
+        self.bus.subscribe(("reorg", "test"), self.reorgs.put)
+        self.subscriber = BlockSubscriber("test", self.node.url, self.bus,
+                                          reconnect_delay=0.05, request_timeout=2)
+        self.subscriber.track_contract(CONTRACT)
+        self.subscriber.start()
+        self.assertTrue(self.node.connected.wait(5))
+
+    def tearDown(self):
+        self.subscriber.stop()
+        self.node.stop()
+
+    def test_publishes_new_heads(self):
+        """Test that pushed heads are published on the bus."""
+        self.node.push_head(11)
+
+        head = self.heads.get(timeout=5)
+        self.assertEqual((head["number"], head["timestamp"], head["backfilled"]),
+                         (11, 1011, False))
+
+    def test_backfills_after_reconnect(self):
+        """Test that blocks mined while disconnected are backfilled in order."""
+        self.node.push_head(11)
+        self.assertEqual(self.heads.get(timeout=5)["number"], 11)
+
+        self.node.drop()
+        self.node.head = 14
+        self.assertTrue(self.node.connected.wait(5))
+
+        backfilled = [self.heads.get(timeout=5) for _ in range(3)]
+        self.assertEqual([h["number"] for h in backfilled], [12, 13, 14])
+        self.assertTrue(all(h["backfilled"] for h in backfilled))
+        log = self.logs.get(timeout=5)
+        self.assertEqual((log["address"], log["block_number"]), (CONTRACT, 14))
+
+        self.node.push_head(15)
+        self.assertEqual(self.heads.get(timeout=5)["number"], 15)
+
+    def test_reorg_replacing_the_head(self):
+        """Test that a new block at the same height publishes a reorg and the new head."""
+        self.node.push_head(11)
+        self.assertEqual(self.heads.get(timeout=5)["number"], 11)
+        # The same block notified again is neither a reorg nor a new head
+        self.node.push_head(11)
+
+        self.node.forked = {11}
+        self.node.push_head(11)
+        reorg = self.reorgs.get(timeout=5)
+        self.assertEqual((reorg["common_ancestor"], reorg["depth"], reorg["new_head"]),
+                         (10, 1, 11))
+        self.assertEqual(reorg["removed"], [block(11)["hash"]])
+        self.assertEqual(self.heads.get(timeout=5)["hash"], block(11, {11})["hash"])
+
+    def test_reorg_detected_by_parent_hash(self):
+        """Test that a head on a fork is preceded by the fork's canonical blocks."""
+        for number in (11, 12):
+            self.node.push_head(number)
+            self.assertEqual(self.heads.get(timeout=5)["number"], number)
+
+        self.node.forked = {11, 12, 13}
+        self.node.push_head(13)
+        reorg = self.reorgs.get(timeout=5)
+        self.assertEqual((reorg["common_ancestor"], reorg["depth"]), (10, 2))
+
+        heads = [self.heads.get(timeout=5) for _ in range(3)]
+        self.assertEqual([h["number"] for h in heads], [11, 12, 13])
+        self.assertEqual([h["backfilled"] for h in heads], [True, True, False])
+        self.assertEqual(heads[0]["hash"], block(11, {11})["hash"])
+
+    def test_track_contract_from_another_thread(self):
+        """Test that contracts tracked from request threads are subscribed."""
+        others = [f"0x{i:040x}" for i in range(1, 21)]
+        threads = [threading.Thread(target=self.subscriber.track_contract, args=(address,))
+                   for address in others]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        deadline = time.monotonic() + 5
+        while len(self.subscriber._logs_addresses) < 21 and \
+                time.monotonic() < deadline:  # pylint: disable=protected-access
+            time.sleep(0.01)
+        self.assertEqual(self.subscriber._logs_addresses,  # pylint: disable=protected-access
+                         sorted([CONTRACT, *others]))
+
+
+if __name__ == "__main__":
+    unittest.main()